@@ -41,4 +41,4 @@ class AbsentMemberAdmin(ModelAdminMixin, admin.ModelAdmin):
     list_filter = (
         'report_datetime',
         'household_member__household_structure__survey_schedule',
-        'household_member__household_structure__household__plot__map_area')
+        'household_member__map_area')
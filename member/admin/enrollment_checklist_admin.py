@@ -58,7 +58,7 @@ class EnrollmentChecklistAdmin(ModelAdminMixin, FieldsetsModelAdminMixin, admin.
         'report_datetime',
         'gender', 'is_eligible',
         'household_member__household_structure__survey_schedule',
-        'household_member__household_structure__household__plot__map_area')
+        'household_member__map_area')
 
     radio_fields = {
         'has_identity': admin.VERTICAL,
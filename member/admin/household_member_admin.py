@@ -1,4 +1,8 @@
+from uuid import UUID
+
 from django.contrib import admin
+from django.db.models import BooleanField, Case, Q, Value, When
+from django.utils.text import slugify
 
 from edc_base.fieldsets import Fieldset
 from edc_base.modeladmin_mixins import TabularInlineMixin, audit_fieldset_tuple
@@ -7,6 +11,7 @@ from survey.admin import survey_schedule_fields, survey_schedule_fieldset_tuple
 from survey.site_surveys import site_surveys
 
 from ..admin_site import member_admin
+from ..choices import RELATIONS
 from ..forms import HouseholdMemberForm
 from ..models import HouseholdMember
 from .modeladmin_mixins import ModelAdminMixin, FieldsetsModelAdminMixin
@@ -38,7 +43,7 @@ class HouseholdMemberAdmin(ModelAdminMixin, FieldsetsModelAdminMixin,
                            admin.ModelAdmin):
     form = HouseholdMemberForm
 
-    list_select_related = ('household_structure', )
+    list_select_related = ('household_structure__household__plot', )
     list_per_page = 15
 
     conditional_fieldsets = {
@@ -102,16 +107,8 @@ class HouseholdMemberAdmin(ModelAdminMixin, FieldsetsModelAdminMixin,
         'created',
         'hostname_created')
 
-    search_fields = [
-        'first_name',
-        'initials',
-        'household_structure__id',
-        'household_structure__household__household_identifier',
-        'household_structure__household__id',
-        'household_structure__household__plot__plot_identifier',
-        'household_structure__household__plot__id',
-        'relation',
-        'id']
+    # see get_search_results
+    search_fields = ('slug', )
 
     list_filter = (
         'household_structure__survey_schedule',
@@ -131,7 +128,57 @@ class HouseholdMemberAdmin(ModelAdminMixin, FieldsetsModelAdminMixin,
         'hostname_created',
         'user_created',
         'visit_attempts',
-        'household_structure__household__plot__map_area')
+        'map_area')
+
+    def get_queryset(self, request):
+        """Selects the relations used by `__str__` and list_display
+        and annotates `reported` so the changelist runs a constant
+        number of queries.
+        """
+        return super().get_queryset(request).select_related(
+            'household_structure__household__plot').annotate(
+                is_reported=Case(
+                    When(Q(refused=True) | Q(undecided=True) | Q(absent=True),
+                         then=Value(True)),
+                    default=Value(False), output_field=BooleanField()))
+
+    def reported(self, obj):
+        try:
+            return obj.is_reported
+        except AttributeError:
+            return obj.reported
+    reported.boolean = True
+    reported.admin_order_field = 'is_reported'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Searches using indexed lookups only.
+
+        A term matches the start of the search slug (household
+        identifier first, see `get_search_slug_fields`), the
+        subject identifier, plot identifier, initials or relation.
+        A uuid term matches the internal identifier or the id of
+        the member, household structure, household or plot.
+        """
+        relations = {value.lower(): value for value, _ in RELATIONS}
+        for term in search_term.split():
+            q = (Q(slug__startswith=slugify(term))
+                 | Q(subject_identifier=term)
+                 | Q(plot_identifier=term)
+                 | Q(initials=term.upper()))
+            if term.lower() in relations:
+                q |= Q(relation=relations.get(term.lower()))
+            try:
+                pk = UUID(term)
+            except ValueError:
+                pass
+            else:
+                q |= (Q(internal_identifier=pk)
+                      | Q(id=pk)
+                      | Q(household_structure_id=pk)
+                      | Q(household_structure__household_id=pk)
+                      | Q(household_structure__household__plot_id=pk))
+            queryset = queryset.filter(q)
+        return queryset, False
 
     def get_readonly_fields(self, request, obj=None):
         return (super().get_readonly_fields(request, obj=obj)
@@ -38,7 +38,7 @@ class HtcMemberAdmin(ModelAdminMixin, admin.ModelAdmin):
         'report_datetime',
         'offered', 'accepted', 'referred',
         'household_member__household_structure__survey_schedule',
-        'household_member__household_structure__household__plot__map_area')
+        'household_member__map_area')
 
     def get_readonly_fields(self, request, obj=None):
         readonly_fields = super(
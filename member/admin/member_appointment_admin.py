@@ -48,6 +48,6 @@ class MemberAppointmentAdmin(ModelAdminMixin, admin.ModelAdmin):
     search_fields = (
         'household_member__first_name',
         'household_member__household_structure__pk',
-        'household_member__household_structure__household__household_identifier',
-        'household_member__household_structure__household__plot__plot_identifier',
+        'household_member__household_identifier',
+        'household_member__plot_identifier',
     )
@@ -15,7 +15,10 @@ from household.models import HouseholdStructure
 from survey import S
 from survey.admin import survey_schedule_fields
 
+from ..enumeration_state import enumeration_state_cache
 from ..models import HouseholdMember
+from ..todays_log_entry import todays_log_entry_cache
+from ..unit_of_work import unit_of_work
 from survey.site_surveys import site_surveys
 
 
@@ -69,6 +72,25 @@ class ModelAdminMixin(ModelAdminInstitutionMixin, ModelAdminFormInstructionsMixi
         return (super().get_readonly_fields(request, obj=obj)
                 + survey_schedule_fields)
 
+    def changeform_view(self, request, *args, **kwargs):
+        """Coalesces the saves of the member signals of a POST in
+        one unit of work.
+        """
+        with todays_log_entry_cache(), enumeration_state_cache():
+            if request.method == 'POST':
+                with unit_of_work():
+                    return super().changeform_view(request, *args, **kwargs)
+            return super().changeform_view(request, *args, **kwargs)
+
+    def delete_view(self, request, *args, **kwargs):
+        """As `changeform_view`, the confirmation page is a GET.
+        """
+        with todays_log_entry_cache(), enumeration_state_cache():
+            if request.method == 'POST':
+                with unit_of_work():
+                    return super().delete_view(request, *args, **kwargs)
+            return super().delete_view(request, *args, **kwargs)
+
 
 class FieldsetsModelAdminMixin(BaseFieldsetsModelAdminMixin):
 
@@ -44,7 +44,7 @@ class MovedMemberAdmin(ModelAdminMixin, admin.ModelAdmin):
     list_filter = (
         'report_datetime',
         'household_member__household_structure__survey_schedule',
-        'household_member__household_structure__household__plot__map_area')
+        'household_member__map_area')
 
     radio_fields = {
         "moved_household": admin.VERTICAL,
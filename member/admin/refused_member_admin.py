@@ -38,4 +38,4 @@ class RefusedMemberAdmin(ModelAdminMixin, admin.ModelAdmin):
         'report_datetime',
         'reason',
         'household_member__household_structure__survey_schedule',
-        'household_member__household_structure__household__plot__map_area')
+        'household_member__map_area')
@@ -25,7 +25,7 @@ class RefusedMemberHistoryAdmin(ModelAdminMixin, admin.ModelAdmin):
         'household_member__household_structure__household__household_identifier']
 
     list_filter = (
-        'reason', 'household_member__household_structure__household__plot__map_area')
+        'reason', 'household_member__map_area')
 
     instructions = []
 
@@ -0,0 +1,19 @@
+from plot.utils import get_anonymous_plot
+
+_cache = {}
+
+
+def get_anonymous_plot_id():
+    """Returns the pk of the anonymous plot, or None, querying
+    the plot table only once per process.
+
+    The cached value is cleared by the Plot post_save and
+    post_delete signals, see `clear_anonymous_plot_cache`.
+    """
+    if 'pk' not in _cache:
+        _cache['pk'] = getattr(get_anonymous_plot(), 'pk', None)
+    return _cache['pk']
+
+
+def clear_anonymous_plot_cache():
+    _cache.pop('pk', None)
@@ -5,22 +5,38 @@ from django.conf import settings
 class AppConfig(DjangoApponfig):
     name = 'member'
     admin_site_name = 'member_admin'
+    # if True, member signals save the household member after the
+    # atomic update so that history and sync transactions are created.
+    emit_household_member_updates = False
 
     def ready(self):
         from member.signals import (
             absent_member_on_post_delete,
             absent_member_on_post_save,
+            consent_on_post_delete,
+            consent_on_post_save,
             deceased_member_on_post_delete,
             deceased_member_on_post_save,
+            enrollment_checklist_on_post_delete,
             enrollment_checklist_on_post_save,
             enrollment_loss_on_post_delete,
             enrollment_loss_on_post_save,
+            household_head_eligibility_on_post_delete,
             household_head_eligibility_on_post_save,
+            household_log_entry_on_post_delete,
+            household_log_entry_on_post_save,
+            household_member_on_post_delete,
             household_member_on_post_save,
+            htc_member_on_post_delete,
+            htc_member_on_post_save,
             moved_member_on_post_delete,
             moved_member_on_post_save,
+            plot_on_post_delete,
+            plot_on_post_save,
             refused_member_on_post_delete,
             refused_member_on_post_save,
+            representative_eligibility_on_post_delete,
+            representative_eligibility_on_post_save,
             undecided_member_on_post_delete,
             undecided_member_on_post_save
         )
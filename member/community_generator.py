@@ -0,0 +1,291 @@
+import random
+import string
+
+from itertools import product
+from uuid import uuid4
+
+import arrow
+
+from dateutil.relativedelta import relativedelta
+from django.apps import apps as django_apps
+from django.db import transaction
+from faker import Faker
+
+from edc_base.utils import get_utcnow
+from edc_constants.constants import ALIVE, FEMALE, MALE, NOT_APPLICABLE, YES
+from edc_registration.models import RegisteredSubject
+from edc_search.search_slug import SearchSlug
+from household.choices import NEXT_APPOINTMENT_SOURCE
+from household.constants import ELIGIBLE_REPRESENTATIVE_PRESENT
+
+from .choices import REASONS_ABSENT
+from .constants import ABLE_TO_PARTICIPATE, HEAD_OF_HOUSEHOLD
+from .eligibile_member_helper import EligibileMemberHelper
+from .enrollment_eligibility import EnrollmentEligibility
+from .participation_status import update_participations
+from .utils import chunks, modified_options
+
+fake = Faker()
+
+
+class CommunityGenerator:
+    """Populates household structures with synthetic members for
+    load testing and benchmarks using bulk_create.
+
+    For each household structure, adds today's log entry and the
+    representative eligibility if missing, a head of household with
+    HoH eligibility, `members_per_household` members with their
+    RegisteredSubject, enrollment checklists for members present
+    and absentee entries for a fraction of members.
+
+    Derived fields otherwise set by save() and the signals (member
+    eligibility, identifiers, search slug, survey schedule,
+    checklist eligibility, visit attempts, participation, household
+    structure enumerated) are set explicitly. History and sync
+    transactions are not created.
+
+    Plots, households and household structures belong to the plot
+    and household apps and are expected to exist, see
+    `MemberTestHelper.make_community`. They are not bulk created:
+    Plot.save allocates the plot identifier, the plot post_save
+    signal creates the households and the household post_save
+    signal creates a household structure and household log per
+    survey schedule. bulk_create calls neither save() nor the
+    signals, so bulk created rows would have no identifiers and
+    no structures or logs.
+    """
+
+    chunk_size = 1000
+
+    def __init__(self, household_structures=None, members_per_household=None,
+                 absent_ratio=None, report_datetime=None, seed=None):
+        self.household_structures = household_structures
+        self.members_per_household = members_per_household or 5
+        self.absent_ratio = 0.1 if absent_ratio is None else absent_ratio
+        self.report_datetime = report_datetime or get_utcnow()
+        self.report_date = arrow.Arrow.fromdatetime(
+            self.report_datetime, self.report_datetime.tzinfo).to('UTC').date()
+        self.random = random.Random(seed)
+        self.counts = {}
+
+    def generate(self):
+        """Generates the community and returns a dictionary of
+        {model label: number created}.
+        """
+        household_structures = list(self.household_structures.select_related(
+            'household__plot', 'householdlog'))
+        with transaction.atomic():
+            self.create_household_log_entries(household_structures)
+            self.create_representative_eligibility(household_structures)
+            household_members = self.create_household_members(household_structures)
+            self.create_registered_subjects(household_members)
+            self.create_household_head_eligibility(household_members)
+            self.create_member_entries(household_members)
+            HouseholdStructure = django_apps.get_model(
+                'household', 'householdstructure')
+            HouseholdStructure.objects.filter(
+                pk__in=[obj.pk for obj in household_structures],
+                enumerated=False).update(
+                    enumerated=True, enumerated_datetime=self.report_datetime,
+                    **modified_options())
+            HouseholdMember = django_apps.get_model('member', 'householdmember')
+            update_participations(HouseholdMember.objects.filter(
+                pk__in=[obj.pk for obj in household_members]))
+        return self.counts
+
+    def bulk_create(self, model_cls, objs):
+        for chunk in chunks(objs, self.chunk_size):
+            model_cls.objects.bulk_create(chunk)
+        self.counts[model_cls._meta.label_lower] = (
+            self.counts.get(model_cls._meta.label_lower, 0) + len(objs))
+
+    def create_household_log_entries(self, household_structures):
+        HouseholdLogEntry = django_apps.get_model('household', 'householdlogentry')
+        logged = set(HouseholdLogEntry.objects.filter(
+            household_log__household_structure__in=household_structures,
+            report_datetime__date=self.report_date).values_list(
+                'household_log_id', flat=True))
+        self.bulk_create(HouseholdLogEntry, [
+            HouseholdLogEntry(
+                household_log=obj.householdlog,
+                report_datetime=self.report_datetime,
+                household_status=ELIGIBLE_REPRESENTATIVE_PRESENT)
+            for obj in household_structures if obj.householdlog.pk not in logged])
+
+    def create_representative_eligibility(self, household_structures):
+        RepresentativeEligibility = django_apps.get_model(
+            'member', 'representativeeligibility')
+        represented = set(RepresentativeEligibility.objects.filter(
+            household_structure__in=household_structures).values_list(
+                'household_structure_id', flat=True))
+        self.bulk_create(RepresentativeEligibility, [
+            RepresentativeEligibility(
+                household_structure=obj,
+                survey_schedule=obj.survey_schedule,
+                report_datetime=self.report_datetime,
+                aged_over_18=YES,
+                household_residency=YES,
+                verbal_script=YES)
+            for obj in household_structures if obj.pk not in represented])
+
+    def create_household_members(self, household_structures):
+        """Bulk creates the members, with (first_name, initials)
+        unique per household structure as required by
+        `unique_together`, including existing members.
+        """
+        HouseholdMember = django_apps.get_model('member', 'householdmember')
+        names = {}
+        for household_structure_id, first_name, initials in HouseholdMember.objects.filter(
+                household_structure__in=household_structures).values_list(
+                    'household_structure_id', 'first_name', 'initials'):
+            names.setdefault(household_structure_id, set()).add((first_name, initials))
+        household_members = []
+        for household_structure in household_structures:
+            used = names.setdefault(household_structure.pk, set())
+            for index in range(self.members_per_household):
+                household_members.append(self.new_household_member(
+                    HouseholdMember, household_structure,
+                    relation=HEAD_OF_HOUSEHOLD if index == 0 else 'cousin',
+                    used=used))
+        self.bulk_create(HouseholdMember, household_members)
+        return household_members
+
+    def new_first_name(self, gender):
+        if gender == MALE:
+            return fake.first_name_male().upper()
+        return fake.first_name_female().upper()
+
+    def new_initials(self, first_name, used):
+        """Returns random initials for the first name or, if that
+        pair is in `used`, the first unused of the two and then three
+        letter initials starting with the first name's initial, and
+        adds the pair to `used`.
+        """
+        initials = first_name[0] + self.random.choice(string.ascii_uppercase)
+        if (first_name, initials) in used:
+            candidates = (
+                first_name[0] + ''.join(letters)
+                for size in [1, 2]
+                for letters in product(string.ascii_uppercase, repeat=size))
+            initials = next(
+                candidate for candidate in candidates
+                if (first_name, candidate) not in used)
+        used.add((first_name, initials))
+        return initials
+
+    def new_household_member(self, model_cls, household_structure, relation=None,
+                             used=None):
+        gender = self.random.choice([MALE, FEMALE])
+        first_name = self.new_first_name(gender)
+        initials = self.new_initials(first_name, set() if used is None else used)
+        subject_identifier_as_pk = uuid4()
+        obj = model_cls(
+            id=uuid4(),
+            household_structure=household_structure,
+            household_identifier=household_structure.household.household_identifier,
+            plot_identifier=household_structure.household.plot.plot_identifier,
+            map_area=household_structure.household.plot.map_area,
+            survey_schedule=household_structure.survey_schedule,
+            report_datetime=self.report_datetime,
+            internal_identifier=uuid4(),
+            subject_identifier_as_pk=subject_identifier_as_pk,
+            subject_identifier=subject_identifier_as_pk.hex,
+            subject_identifier_aka=subject_identifier_as_pk.hex,
+            first_name=first_name,
+            initials=initials,
+            gender=gender,
+            age_in_years=self.random.randint(18, 64),
+            survival_status=ALIVE,
+            study_resident=YES,
+            inability_to_participate=ABLE_TO_PARTICIPATE,
+            present_today=YES,
+            relation=relation,
+            eligible_hoh=relation == HEAD_OF_HOUSEHOLD)
+        obj.eligible_member = EligibileMemberHelper(
+            previously_consented=False, **obj.__dict__).is_eligible_member
+        obj.slug = SearchSlug(obj=obj, fields=obj.get_search_slug_fields()).slug
+        obj.absent = (
+            relation != HEAD_OF_HOUSEHOLD and self.random.random() < self.absent_ratio)
+        obj.visit_attempts = 1 if obj.absent else 0
+        return obj
+
+    def create_registered_subjects(self, household_members):
+        self.bulk_create(RegisteredSubject, [
+            RegisteredSubject(
+                subject_identifier=obj.subject_identifier,
+                registration_identifier=obj.internal_identifier.hex,
+                first_name=obj.first_name,
+                initials=obj.initials,
+                gender=obj.gender)
+            for obj in household_members])
+
+    def create_household_head_eligibility(self, household_members):
+        HouseholdHeadEligibility = django_apps.get_model(
+            'member', 'householdheadeligibility')
+        self.bulk_create(HouseholdHeadEligibility, [
+            HouseholdHeadEligibility(
+                household_member=obj,
+                survey_schedule=obj.survey_schedule,
+                report_datetime=self.report_datetime,
+                aged_over_18=YES,
+                household_residency=YES,
+                verbal_script=YES)
+            for obj in household_members if obj.relation == HEAD_OF_HOUSEHOLD])
+
+    def create_member_entries(self, household_members):
+        """Creates absentee entries for absent members and enrollment
+        checklists for the other eligible members.
+        """
+        AbsentMember = django_apps.get_model('member', 'absentmember')
+        EnrollmentChecklist = django_apps.get_model('member', 'enrollmentchecklist')
+        HouseholdMember = django_apps.get_model('member', 'householdmember')
+        absent_members = []
+        enrollment_checklists = []
+        for obj in household_members:
+            if obj.absent:
+                absent_members.append(AbsentMember(
+                    household_member=obj,
+                    survey_schedule=obj.survey_schedule,
+                    report_datetime=self.report_datetime,
+                    report_date=self.report_date,
+                    reason=REASONS_ABSENT[0][0],
+                    next_appt_datetime=self.report_datetime + relativedelta(days=1),
+                    next_appt_datetime_source=NEXT_APPOINTMENT_SOURCE[0][0]))
+            elif obj.eligible_member:
+                enrollment_checklists.append(self.new_enrollment_checklist(
+                    EnrollmentChecklist, obj))
+        self.bulk_create(AbsentMember, absent_members)
+        self.bulk_create(EnrollmentChecklist, enrollment_checklists)
+        # members are adults and pass all criteria, so no enrollment loss
+        pks = [obj.household_member.pk for obj in enrollment_checklists
+               if obj.is_eligible]
+        for chunk in chunks(pks, self.chunk_size):
+            HouseholdMember.objects.filter(pk__in=chunk).update(
+                eligible_subject=True, enrollment_checklist_completed=True,
+                **modified_options())
+
+    def new_enrollment_checklist(self, model_cls, household_member):
+        obj = model_cls(
+            household_member=household_member,
+            survey_schedule=household_member.survey_schedule,
+            report_datetime=self.report_datetime,
+            initials=household_member.initials,
+            gender=household_member.gender,
+            dob=(self.report_datetime - relativedelta(
+                years=household_member.age_in_years, days=1)).date(),
+            age_in_years=household_member.age_in_years,
+            part_time_resident=YES,
+            household_residency=YES,
+            has_identity=YES,
+            citizen=YES,
+            literacy=YES,
+            guardian=NOT_APPLICABLE,
+            confirm_participation=NOT_APPLICABLE)
+        eligibility = EnrollmentEligibility(
+            cloned=household_member.cloned,
+            member_age_in_years=household_member.age_in_years,
+            **obj.__dict__)
+        obj.is_eligible = eligibility.is_eligible
+        obj.loss_reason = eligibility.loss_reason
+        obj.non_citizen = eligibility.non_citizen
+        return obj
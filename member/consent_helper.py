@@ -0,0 +1,142 @@
+from bisect import bisect_right
+
+from edc_consent.site_consents import site_consents
+
+from .anonymous_plot import get_anonymous_plot_id
+from .utils import chunks
+
+# the value of HouseholdMember._consent before the consent is looked up
+NOT_RESOLVED = object()
+
+_cache = {'generation': 0}
+
+
+def get_consent_generation():
+    """Returns the generation of resolved consents, see
+    `clear_consent_cache`.
+    """
+    return _cache['generation']
+
+
+def clear_consent_cache():
+    """Marks the consents resolved on household member instances,
+    including None, as stale so they are looked up again.
+
+    Called by the consent post_save and post_delete signals.
+    """
+    _cache['generation'] += 1
+
+
+class ConsentPeriodIndex:
+    """A process-wide index of the registered consent objects,
+    sorted by start datetime per consent group.
+
+    `get_consent` finds the consent valid for a report_datetime
+    with a binary search and counts it as a hit. Otherwise, e.g.
+    outside of all periods or for a group with overlapping periods,
+    it counts a miss and defers to `site_consents.get_consent`.
+
+    The index is built on first use and rebuilt if the registry
+    changes.
+    """
+
+    def __init__(self, site_consents=None):
+        self.site_consents = site_consents
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    def clear(self):
+        self._index = None
+        self._registry_key = None
+
+    @property
+    def registry_key(self):
+        registry = self.site_consents.registry
+        return (id(registry), len(registry))
+
+    @property
+    def index(self):
+        """Returns a dictionary of {consent_group: (starts, consents)}
+        or {consent_group: None} if the group's periods overlap.
+        """
+        if self._index is None or self._registry_key != self.registry_key:
+            self._registry_key = self.registry_key
+            registry = self.site_consents.registry
+            consents_by_group = {}
+            for consent in (registry.values() if hasattr(registry, 'values') else registry):
+                consents_by_group.setdefault(consent.group, []).append(consent)
+            self._index = {}
+            for consent_group, consents in consents_by_group.items():
+                consents.sort(key=lambda c: c.start)
+                if any(consents[i].end >= consents[i + 1].start
+                       for i in range(len(consents) - 1)):
+                    self._index[consent_group] = None
+                else:
+                    self._index[consent_group] = (
+                        [c.start for c in consents], consents)
+        return self._index
+
+    def get_consent(self, report_datetime=None, consent_group=None):
+        """Returns the consent object valid for the report_datetime
+        or raises ConsentDoesNotExist.
+        """
+        periods = self.index.get(consent_group)
+        if periods:
+            starts, consents = periods
+            i = bisect_right(starts, report_datetime) - 1
+            if i >= 0 and consents[i].start <= report_datetime <= consents[i].end:
+                self.hits += 1
+                return consents[i]
+        self.misses += 1
+        return self.site_consents.get_consent(
+            report_datetime=report_datetime, consent_group=consent_group)
+
+
+consent_period_index = ConsentPeriodIndex(site_consents=site_consents)
+
+
+def get_consent_models(site_consents=site_consents):
+    """Returns the set of consent model classes registered with
+    site_consents.
+    """
+    registry = site_consents.registry
+    return {consent.model for consent in (
+        registry.values() if hasattr(registry, 'values') else registry)}
+
+
+def attach_consents(household_members, chunk_size=None):
+    """Looks up and sets the consent of each household member
+    not yet resolved, or resolved before a consent was saved, and
+    returns the list of household members.
+
+    Each member's consent model and version is taken from the
+    anonymous or default consent group valid at its
+    report_datetime; each consent model is then queried once per
+    version (chunked). Members should be fetched with
+    select_related('household_structure__household').
+    """
+    household_members = list(household_members)
+    anonymous_plot_id = get_anonymous_plot_id() if household_members else None
+    members_by_consent = {}
+    generation = get_consent_generation()
+    for obj in household_members:
+        if obj._consent is not NOT_RESOLVED and obj._consent_generation == generation:
+            continue
+        obj._consent = None
+        obj._consent_generation = generation
+        if not obj.eligible_subject:
+            continue
+        consent_object = obj.get_consent_object(
+            anonymous=obj.household_structure.household.plot_id == anonymous_plot_id)
+        if consent_object:
+            members_by_consent.setdefault(
+                (consent_object.model, consent_object.version), {}).setdefault(
+                    obj.subject_identifier, []).append(obj)
+    for (model_cls, version), members_by_identifier in members_by_consent.items():
+        for chunk in chunks(list(members_by_identifier), chunk_size or 500):
+            for consent in model_cls.objects.filter(
+                    version=version, subject_identifier__in=chunk):
+                for obj in members_by_identifier.get(consent.subject_identifier):
+                    obj._consent = consent
+    return household_members
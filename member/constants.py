@@ -20,3 +20,15 @@ REFUSED = 'REFUSED'
 REFUSED_HTC = 'REFUSED_HTC'
 UNDECIDED = 'UNDECIDED'
 MOVED = 'MOVED'
+
+# HouseholdMember fields updated by the member signals, see
+# update_household_member. If only these change, save() writes only
+# these and the audit fields.
+HOUSEHOLD_MEMBER_FLAG_FIELDS = [
+    'visit_attempts', 'absent', 'undecided', 'refused', 'moved',
+    'eligible_hoh', 'eligible_subject', 'enrollment_checklist_completed',
+    'enrollment_loss_completed', 'participation', 'participation_final']
+
+AUDIT_FIELDS = [
+    'modified', 'user_modified', 'hostname_modified', 'device_modified',
+    'revision']
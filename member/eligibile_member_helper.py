@@ -1,20 +1,109 @@
+import threading
+
+from contextlib import contextmanager
+
 from edc_constants.constants import YES, NO, ALIVE, CONSENTED, NOT_APPLICABLE
 from edc_registration.models import RegisteredSubject
 
 from .constants import ABLE_TO_PARTICIPATE
+from .utils import chunks
+
+_local = threading.local()
+
+
+class PreviouslyConsentedCache:
+    """A batch-scoped cache of the "previously consented" state
+    of subject identifiers based on RegisteredSubject.
+
+    Identifiers passed to `load` are resolved in one query per
+    chunk; any other identifier is resolved on first use and then
+    remembered.
+    """
+
+    chunk_size = 500
+
+    def __init__(self, subject_identifiers=None):
+        self.resolved = {}
+        if subject_identifiers:
+            self.load(subject_identifiers)
+
+    def load(self, subject_identifiers):
+        subject_identifiers = [
+            s for s in set(subject_identifiers) if s and s not in self.resolved]
+        for chunk in chunks(subject_identifiers, self.chunk_size):
+            for subject_identifier in chunk:
+                self.resolved[subject_identifier] = False
+            for subject_identifier in RegisteredSubject.objects.filter(
+                    subject_identifier__in=chunk,
+                    registration_status=CONSENTED).values_list(
+                        'subject_identifier', flat=True):
+                self.resolved[subject_identifier] = True
+
+    def is_consented(self, subject_identifier):
+        if subject_identifier not in self.resolved:
+            self.load([subject_identifier])
+        return self.resolved.get(subject_identifier, False)
+
+
+@contextmanager
+def previously_consented_cache(subject_identifiers=None):
+    """A context manager that makes a PreviouslyConsentedCache
+    available to every EligibileMemberHelper in this thread,
+    e.g. while cloning or importing members in bulk.
+
+        with previously_consented_cache(subject_identifiers):
+            for household_member in household_members:
+                household_member.save()
+    """
+    cache = PreviouslyConsentedCache(subject_identifiers=subject_identifiers)
+    previous = getattr(_local, 'cache', None)
+    _local.cache = cache
+    try:
+        yield cache
+    finally:
+        _local.cache = previous
+
+
+def get_previously_consented_cache():
+    """Returns the active PreviouslyConsentedCache or None.
+    """
+    return getattr(_local, 'cache', None)
 
 
 class EligibileMemberHelper:
 
     def __init__(self, cloned=None, study_resident=None, survival_status=None,
                  subject_identifier=None, inability_to_participate=None,
-                 age_in_years=None, **kwargs):
+                 age_in_years=None, previously_consented=None,
+                 previously_consented_cache=None, **kwargs):
         self.subject_identifier = subject_identifier
         self.cloned = cloned
         self.study_resident = study_resident
         self.survival_status = survival_status
         self.inability_to_participate = inability_to_participate
         self.age_in_years = age_in_years
+        self._previously_consented = previously_consented
+        self.previously_consented_cache = previously_consented_cache
+
+    @property
+    def previously_consented(self):
+        """Returns True if the RegisteredSubject for this subject
+        identifier is consented.
+
+        Uses, in order, the pre-resolved value, the given cache,
+        the active batch cache and, finally, a single query.
+        """
+        if self._previously_consented is None:
+            cache = (self.previously_consented_cache
+                     or get_previously_consented_cache())
+            if cache:
+                self._previously_consented = cache.is_consented(
+                    self.subject_identifier)
+            else:
+                self._previously_consented = RegisteredSubject.objects.filter(
+                    subject_identifier=self.subject_identifier,
+                    registration_status=CONSENTED).exists()
+        return self._previously_consented
 
     @property
     def is_eligible_member(self):
@@ -24,6 +113,9 @@ class EligibileMemberHelper:
         Note: once a member is enrolled to the study their residency
         is no longer a factor to determine eligibility for subsequent
         enrollments.
+
+        Note: previous consent is only looked up if the member is
+        older than 64.
         """
         if self.survival_status != ALIVE:
             return False
@@ -31,19 +123,8 @@ class EligibileMemberHelper:
             (not self.cloned and self.study_resident == YES)
             or (self.cloned and self.study_resident in [YES, NO, NOT_APPLICABLE])
         )
-
-        previously_consented = False
-        try:
-            registered_subject = RegisteredSubject.objects.get(
-                subject_identifier=self.subject_identifier)
-        except RegisteredSubject.DoesNotExist:
-            pass
-        else:
-            if registered_subject.registration_status == CONSENTED:
-                previously_consented = True
-
         return (
             self.age_in_years >= 16
-            and (self.age_in_years <= 64 or previously_consented)
             and is_study_resident
-            and self.inability_to_participate in [ABLE_TO_PARTICIPATE, NOT_APPLICABLE])
+            and self.inability_to_participate in [ABLE_TO_PARTICIPATE, NOT_APPLICABLE]
+            and (self.age_in_years <= 64 or self.previously_consented))
@@ -0,0 +1,178 @@
+from django.apps import apps as django_apps
+from django.db import transaction
+
+from edc_constants.constants import NO, YES
+
+from .age_helper import AgeHelper
+from .constants import BLOCK_PARTICIPATION
+from .participation_status import update_participations
+from .utils import chunks, modified_options
+
+
+class EnrollmentEligibility:
+    """Evaluates the enrollment checklist eligibility rules.
+
+    Takes the checklist field values and the household member's
+    `cloned` and `age_in_years`, e.g. from a model instance or
+    from one row of `queryset.values()`.
+    """
+
+    age_helper_cls = AgeHelper
+
+    def __init__(self, cloned=None, member_age_in_years=None,
+                 has_identity=None, household_residency=None,
+                 part_time_resident=None, citizen=None, legal_marriage=None,
+                 marriage_certificate=None, literacy=None, guardian=None,
+                 confirm_participation=None, **kwargs):
+        self.non_citizen = False
+        loss_reason = []
+        if has_identity == NO:
+            loss_reason.append('No valid identity.')
+        if household_residency == NO and not cloned:
+            loss_reason.append('Failed household residency requirement')
+        if part_time_resident == NO and not cloned:
+            loss_reason.append(
+                'Does not spend 3 or more nights per month in the community.')
+        if citizen == NO and legal_marriage == NO:
+            loss_reason.append('Not a citizen and not married to a citizen.')
+            self.non_citizen = True
+        if (citizen == NO and legal_marriage == YES
+                and marriage_certificate == NO):
+            loss_reason.append(
+                'Not a citizen, married to a citizen but does not '
+                'have a marriage certificate.')
+            self.non_citizen = True
+        if literacy == NO:
+            loss_reason.append('Illiterate with no literate witness.')
+        age_helper = self.age_helper_cls(age_in_years=member_age_in_years)
+        if age_helper.is_minor and guardian != YES:
+            loss_reason.append('Minor without guardian available.')
+        if confirm_participation == BLOCK_PARTICIPATION:
+            loss_reason.append('Already enrolled.')
+        self.is_eligible = False if loss_reason else True
+        self.loss_reason = '|'.join(loss_reason) if loss_reason else None
+
+
+class EnrollmentChecklistEvaluator:
+    """Re-evaluates eligibility for a queryset of enrollment
+    checklists and applies the results in bulk.
+
+    Writes EnrollmentChecklist, EnrollmentLoss and HouseholdMember
+    with one statement per distinct set of values (chunked) instead
+    of saving each checklist, e.g. for data conversions or after a
+    protocol change.
+
+    Works for EnrollmentChecklist and EnrollmentChecklistAnonymous
+    querysets. Rule and result fields the checklist model does not
+    have are skipped, e.g. the anonymous checklist has no
+    `loss_reason`.
+
+    Rows from a DataFrame may be evaluated with `evaluate` by
+    passing `df.to_dict('records')`.
+    """
+
+    eligibility_cls = EnrollmentEligibility
+    chunk_size = 500
+    rule_fields = [
+        'has_identity', 'household_residency', 'part_time_resident',
+        'citizen', 'legal_marriage', 'marriage_certificate', 'literacy',
+        'guardian', 'confirm_participation']
+
+    result_fields = ['is_eligible', 'loss_reason', 'non_citizen']
+
+    def __init__(self, enrollment_checklists, dry_run=None):
+        self.enrollment_checklists = enrollment_checklists
+        self.dry_run = dry_run
+        field_names = [
+            f.name for f in enrollment_checklists.model._meta.get_fields()]
+        self.rule_fields = [f for f in self.rule_fields if f in field_names]
+        self.result_fields = [f for f in self.result_fields if f in field_names]
+        self.changed = 0
+        self.eligible = 0
+        self.ineligible = 0
+
+    def evaluate(self, rows):
+        """Returns a list of (row, EnrollmentEligibility).
+        """
+        return [(row, self.eligibility_cls(
+            cloned=row.get('household_member__cloned'),
+            member_age_in_years=row.get('household_member__age_in_years'),
+            **{f: row.get(f) for f in self.rule_fields})) for row in rows]
+
+    def run(self):
+        """Evaluates and applies all checklists and returns self.
+        """
+        rows = self.enrollment_checklists.values(
+            'id', 'household_member_id', 'report_datetime',
+            'household_member__cloned', 'household_member__age_in_years',
+            'household_member__survey_schedule',
+            *self.result_fields, *self.rule_fields)
+        for chunk in chunks(rows, self.chunk_size):
+            results = self.evaluate(chunk)
+            if not self.dry_run:
+                self.apply(results)
+        return self
+
+    def apply(self, results):
+        HouseholdMember = django_apps.get_model('member', 'householdmember')
+        checklist_changes = {}
+        eligible = []
+        ineligible = {}
+        for row, eligibility in results:
+            result = dict(
+                is_eligible=eligibility.is_eligible,
+                loss_reason=eligibility.loss_reason,
+                non_citizen=row.get('non_citizen') or eligibility.non_citizen)
+            values = tuple(result.get(f) for f in self.result_fields)
+            if values != tuple(row.get(f) for f in self.result_fields):
+                checklist_changes.setdefault(values, []).append(row.get('id'))
+            if eligibility.is_eligible:
+                eligible.append(row.get('household_member_id'))
+            else:
+                ineligible[row.get('household_member_id')] = (row, eligibility)
+        with transaction.atomic():
+            for values, pks in checklist_changes.items():
+                self.enrollment_checklists.model.objects.filter(pk__in=pks).update(
+                    **dict(zip(self.result_fields, values)), **modified_options())
+                self.changed += len(pks)
+            self.apply_enrollment_losses(eligible, ineligible)
+            HouseholdMember.objects.filter(pk__in=eligible).update(
+                eligible_subject=True, enrollment_checklist_completed=True,
+                enrollment_loss_completed=False, **modified_options())
+            HouseholdMember.objects.filter(pk__in=list(ineligible)).update(
+                eligible_subject=False, enrollment_checklist_completed=True,
+                enrollment_loss_completed=True, **modified_options())
+            update_participations(
+                HouseholdMember.objects.filter(pk__in=eligible + list(ineligible)))
+        self.eligible += len(eligible)
+        self.ineligible += len(ineligible)
+
+    def apply_enrollment_losses(self, eligible, ineligible):
+        """Deletes EnrollmentLoss for eligible members, updates
+        changed ones and bulk creates missing ones.
+
+        The delete sends post_delete per row, so history records the
+        deletion for the sync exporter. The receiver clears
+        `enrollment_loss_completed`, as does the update in `apply`.
+        """
+        EnrollmentLoss = django_apps.get_model('member', 'enrollmentloss')
+        EnrollmentLoss.objects.filter(household_member_id__in=eligible).delete()
+        existing = {
+            obj.get('household_member_id'): obj for obj in EnrollmentLoss.objects.filter(
+                household_member_id__in=list(ineligible)).values(
+                    'id', 'household_member_id', 'report_datetime', 'reason')}
+        enrollment_losses = []
+        for household_member_id, (row, eligibility) in ineligible.items():
+            obj = existing.get(household_member_id)
+            if not obj:
+                enrollment_losses.append(EnrollmentLoss(
+                    household_member_id=household_member_id,
+                    report_datetime=row.get('report_datetime'),
+                    reason=eligibility.loss_reason,
+                    survey_schedule=row.get('household_member__survey_schedule')))
+            elif (obj.get('report_datetime'), obj.get('reason')) != (
+                    row.get('report_datetime'), eligibility.loss_reason):
+                EnrollmentLoss.objects.filter(pk=obj.get('id')).update(
+                    report_datetime=row.get('report_datetime'),
+                    reason=eligibility.loss_reason, **modified_options())
+        EnrollmentLoss.objects.bulk_create(enrollment_losses)
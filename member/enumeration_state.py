@@ -0,0 +1,91 @@
+import threading
+
+from contextlib import contextmanager
+
+from django.apps import apps as django_apps
+from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+
+from .constants import HEAD_OF_HOUSEHOLD
+
+_local = threading.local()
+
+
+class EnumerationState:
+    """The enumeration state of a household structure, i.e. is
+    the representative eligibility completed, who is the head of
+    household and is the HoH eligibility completed.
+
+    Computed in one query.
+    """
+
+    def __init__(self, household_structure_id=None):
+        HouseholdStructure = django_apps.get_model(
+            'household', 'householdstructure')
+        RepresentativeEligibility = django_apps.get_model(
+            'member', 'representativeeligibility')
+        HouseholdMember = django_apps.get_model('member', 'householdmember')
+        HouseholdHeadEligibility = django_apps.get_model(
+            'member', 'householdheadeligibility')
+        hoh_members = HouseholdMember.objects.filter(
+            household_structure=OuterRef('pk'), relation=HEAD_OF_HOUSEHOLD)
+        values = HouseholdStructure.objects.filter(
+            pk=household_structure_id).annotate(
+                representative_eligibility=Exists(
+                    RepresentativeEligibility.objects.filter(
+                        household_structure=OuterRef('pk'))),
+                hoh_id=Subquery(hoh_members.order_by().values('pk')[:1]),
+                hoh_count=Subquery(
+                    hoh_members.order_by().values('household_structure').annotate(
+                        count=Count('pk')).values('count'),
+                    output_field=IntegerField()),
+                hoh_eligibility=Exists(
+                    HouseholdHeadEligibility.objects.filter(
+                        household_member__household_structure=OuterRef('pk'),
+                        household_member__relation=HEAD_OF_HOUSEHOLD))).values(
+                            'representative_eligibility', 'hoh_id', 'hoh_count',
+                            'hoh_eligibility').first() or {}
+        self.household_structure_id = household_structure_id
+        self.representative_eligibility = bool(
+            values.get('representative_eligibility'))
+        # like a get(), None if there is no HoH or more than one
+        self.hoh_id = values.get('hoh_id') if values.get('hoh_count') == 1 else None
+        self.hoh_eligibility = bool(self.hoh_id and values.get('hoh_eligibility'))
+
+
+@contextmanager
+def enumeration_state_cache():
+    """A context manager that caches EnumerationState per household
+    structure in this thread, e.g. for a request or a transaction
+    that enumerates many members.
+
+    If already active, the outer cache is used. Cached states are
+    cleared by the post_save and post_delete signals of
+    HouseholdMember, RepresentativeEligibility and
+    HouseholdHeadEligibility.
+    """
+    if getattr(_local, 'cache', None) is not None:
+        yield _local.cache
+    else:
+        _local.cache = {}
+        try:
+            yield _local.cache
+        finally:
+            _local.cache = None
+
+
+def get_enumeration_state(household_structure_id):
+    """Returns the EnumerationState, cached if within
+    `enumeration_state_cache`.
+    """
+    cache = getattr(_local, 'cache', None)
+    if cache is None:
+        return EnumerationState(household_structure_id)
+    if household_structure_id not in cache:
+        cache[household_structure_id] = EnumerationState(household_structure_id)
+    return cache[household_structure_id]
+
+
+def clear_enumeration_state(household_structure_id):
+    cache = getattr(_local, 'cache', None)
+    if cache:
+        cache.pop(household_structure_id, None)
@@ -7,11 +7,27 @@ from django.utils.timezone import get_default_timezone
 from edc_base.modelform_mixins import CommonCleanModelFormMixin
 from edc_base.modelform_validators import FormValidatorMixin
 from household.exceptions import HouseholdLogRequired
-from household.utils import todays_log_entry_or_raise
+
+from ..enumeration_state import enumeration_state_cache
+from ..todays_log_entry import todays_log_entry_cache, todays_log_entry_or_raise
+from ..unit_of_work import unit_of_work
 
 
 class MemberFormMixin(FormValidatorMixin, CommonCleanModelFormMixin, forms.ModelForm):
 
+    def full_clean(self):
+        # one log entry and enumeration state lookup for the form and
+        # the model's common_clean
+        with todays_log_entry_cache(), enumeration_state_cache():
+            super().full_clean()
+
+    def save(self, commit=True):
+        if not commit:
+            return super().save(commit=commit)
+        # one save per member touched by the signals
+        with unit_of_work():
+            return super().save(commit=commit)
+
     def clean(self):
         cleaned_data = super().clean()
         try:
@@ -3,13 +3,21 @@ from django import forms
 from edc_base.modelform_validators import FormValidatorMixin
 from member_form_validators.form_validators import HouseholdMemberFormValidator
 
+from ..enumeration_state import enumeration_state_cache
 from ..models import HouseholdMember
+from ..todays_log_entry import todays_log_entry_cache
 
 
 class HouseholdMemberForm (FormValidatorMixin, forms.ModelForm):
 
     form_validator_cls = HouseholdMemberFormValidator
 
+    def full_clean(self):
+        # one enumeration state lookup for the form validator and
+        # the model's common_clean
+        with todays_log_entry_cache(), enumeration_state_cache():
+            super().full_clean()
+
     #     details_change_reason = forms.ChoiceField(
     #         label='If YES, please specify the reason',
     #         widget=forms.TextInput(attrs={'size': 30}),
@@ -1,5 +1,6 @@
+import arrow
+
 from django import forms
-from django.db.models import Max
 from django.forms import ValidationError
 
 from edc_base.utils import get_utcnow
@@ -7,43 +8,28 @@ from edc_base.utils import get_utcnow
 from household.models import HouseholdLogEntry
 from household.constants import REFUSED_ENUMERATION, ELIGIBLE_REPRESENTATIVE_ABSENT
 from household.constants import NO_HOUSEHOLD_INFORMANT
-from household.utils import todays_log_entry_or_raise
 
+from ..enumeration_state import enumeration_state_cache
 from ..exceptions import EnumerationRepresentativeError
 from ..models import RepresentativeEligibility
+from ..todays_log_entry import todays_log_entry_cache, todays_log_entry_or_raise
 
 
 class RepresentativeEligibilityForm(forms.ModelForm):
 
+    def full_clean(self):
+        # one log entry lookup for all validate_* methods
+        with todays_log_entry_cache(), enumeration_state_cache():
+            super().full_clean()
+
     def clean(self):
         cleaned_data = super().clean()
-        household_structure = cleaned_data.get('household_structure')
-
+        self.household_log_entries = None
+        self._todays_household_log_entry = None
         self.validate_refused_enumeration()
         self.validate_eligible_participant_absent()
         self.validate_eligible_if_no_household_participant()
-
-        try:
-            report_datetime = HouseholdLogEntry.objects.filter(
-                household_log__household_structure=household_structure).aggregate(
-                    Max('report_datetime')).get('report_datetime__max')
-            if HouseholdLogEntry.objects.get(
-                    household_log__household_structure=household_structure,
-                    household_status='no_household_informant',
-                    report_datetime=report_datetime):
-                raise ValidationError(
-                    'You cannot save representative eligibility, '
-                    'no household informant.')
-
-            HouseholdLogEntry.objects.get(
-                household_log__household_structure=household_structure,
-                report_datetime=report_datetime,
-                household_status=ELIGIBLE_REPRESENTATIVE_ABSENT)
-            raise ValidationError(
-                'The eligible household representative is absent. '
-                'See Household Log.')
-        except HouseholdLogEntry.DoesNotExist:
-            pass
+        self.validate_last_household_log_entry()
         try:
             instance = self._meta.model(id=self.instance.id, **cleaned_data)
             instance.common_clean()
@@ -51,12 +37,55 @@ class RepresentativeEligibilityForm(forms.ModelForm):
             raise forms.ValidationError(str(e))
         return cleaned_data
 
+    def get_household_log_entries(self):
+        """Returns the household structure's log entries ordered
+        by report_datetime, fetched once for all validations.
+        """
+        if self.household_log_entries is None:
+            self.household_log_entries = list(HouseholdLogEntry.objects.filter(
+                household_log__household_structure=self.cleaned_data.get(
+                    'household_structure')).order_by('report_datetime'))
+        return self.household_log_entries
+
+    @property
+    def todays_household_log_entry(self):
+        """Returns today's household log entry or raises HouseholdLogRequired.
+        """
+        if not self._todays_household_log_entry:
+            today = get_utcnow().date()
+            household_log_entries = [
+                obj for obj in self.get_household_log_entries()
+                if arrow.Arrow.fromdatetime(
+                    obj.report_datetime, obj.report_datetime.tzinfo).to('UTC').date() == today]
+            if household_log_entries:
+                self._todays_household_log_entry = household_log_entries[-1]
+            else:
+                self._todays_household_log_entry = todays_log_entry_or_raise(
+                    household_structure=self.cleaned_data.get('household_structure'),
+                    report_datetime=get_utcnow())
+        return self._todays_household_log_entry
+
+    def validate_last_household_log_entry(self):
+        cleaned_data = self.cleaned_data
+        household_log_entries = self.get_household_log_entries()
+        if household_log_entries:
+            report_datetime = household_log_entries[-1].report_datetime
+            household_statuses = [
+                obj.household_status for obj in household_log_entries
+                if obj.report_datetime == report_datetime]
+            if NO_HOUSEHOLD_INFORMANT in household_statuses:
+                raise ValidationError(
+                    'You cannot save representative eligibility, '
+                    'no household informant.')
+            if ELIGIBLE_REPRESENTATIVE_ABSENT in household_statuses:
+                raise ValidationError(
+                    'The eligible household representative is absent. '
+                    'See Household Log.')
+        return cleaned_data
+
     def validate_eligible_participant_absent(self):
         cleaned_data = self.cleaned_data
-        household_structure = cleaned_data.get('household_structure')
-        household_log_entry = todays_log_entry_or_raise(
-            household_structure=household_structure,
-            report_datetime=get_utcnow())
+        household_log_entry = self.todays_household_log_entry
         if household_log_entry.household_status == ELIGIBLE_REPRESENTATIVE_ABSENT:
             raise forms.ValidationError('Household log entry for today shows '
                                         'household status as absent '
@@ -66,10 +95,7 @@ class RepresentativeEligibilityForm(forms.ModelForm):
 
     def validate_eligible_if_no_household_participant(self):
         cleaned_data = self.cleaned_data
-        household_structure = cleaned_data.get('household_structure')
-        household_log_entry = todays_log_entry_or_raise(
-            household_structure=household_structure,
-            report_datetime=get_utcnow())
+        household_log_entry = self.todays_household_log_entry
         if household_log_entry.household_status == NO_HOUSEHOLD_INFORMANT:
             raise forms.ValidationError('Household log entry for today shows '
                                         'household status as no household informant '
@@ -79,10 +105,7 @@ class RepresentativeEligibilityForm(forms.ModelForm):
 
     def validate_refused_enumeration(self):
         cleaned_data = self.cleaned_data
-        household_structure = cleaned_data.get('household_structure')
-        household_log_entry = todays_log_entry_or_raise(
-            household_structure=household_structure,
-            report_datetime=get_utcnow())
+        household_log_entry = self.todays_household_log_entry
         if household_log_entry.household_status == REFUSED_ENUMERATION:
             raise forms.ValidationError('Household log entry for today shows '
                                         'household status as refused '
@@ -1,20 +1,37 @@
+import time
+
 from datetime import datetime
+from django.apps import apps as django_apps
 from django.core.management.base import BaseCommand
+from django.db.models import ProtectedError
 
 from edc_map.models import InnerContainer
 from edc_sync.models import OutgoingTransaction
 from ...models import (
-    HouseholdMember, HouseholdHeadEligibility, EnrollmentChecklist,
+    HouseholdMember, HouseholdHeadEligibility, EnrollmentChecklist, EnrollmentLoss,
     AbsentMember, DeceasedMember, HtcMember, MovedMember, RefusedMember, UndecidedMember)
-from bcpp_subject.models import Appointment, SubjectVisit, SubjectConsent
+from ...unit_of_work import unit_of_work
+from ...utils import chunks
 from household.exceptions import HouseholdLogRequired
 from django.core.exceptions import ValidationError
 from django.conf import settings
 
+subject_consent_model = 'bcpp_subject.subjectconsent'
 
-def delete_household_members(
-        map_area=None, survey_schedule=None, consent_version=None):
-    plot_identifiers = None
+# models deleted, in order, before the household member
+member_dependent_models = [
+    HouseholdHeadEligibility, AbsentMember, DeceasedMember, MovedMember,
+    HtcMember, RefusedMember, UndecidedMember, EnrollmentLoss,
+    EnrollmentChecklist]
+subject_dependent_models = ['bcpp_subject.appointment', 'bcpp_subject.subjectvisit']
+
+
+def get_dependent_models():
+    return member_dependent_models + [
+        django_apps.get_model(model) for model in subject_dependent_models]
+
+
+def get_cloned_household_members(map_area=None, survey_schedule=None):
     try:
         inner_container = InnerContainer.objects.get(
             device_id=settings.DEVICE_ID, map_area=map_area)
@@ -22,11 +39,103 @@ def delete_household_members(
         raise ValidationError("There are no plots sectioned for this machine.")
     else:
         plot_identifiers = inner_container.identifier_labels
-
-    household_members = HouseholdMember.objects.filter(
-        household_structure__household__plot__map_area=map_area,
-        household_structure__household__plot__plot_identifier__in=plot_identifiers,
+    return HouseholdMember.objects.filter(
+        map_area=map_area,
+        plot_identifier__in=plot_identifiers,
         survey_schedule=survey_schedule, cloned=True)
+
+
+def get_household_members_to_delete(map_area=None, survey_schedule=None,
+                                    consent_version=None, chunk_size=None):
+    """Returns a tuple of (consented, pks) where pks are the cloned,
+    unconsented household members.
+
+    The consented members are found with two set queries per chunk.
+    """
+    SubjectConsent = django_apps.get_model(subject_consent_model)
+    chunk_size = chunk_size or 500
+    household_members = dict(get_cloned_household_members(
+        map_area=map_area, survey_schedule=survey_schedule).values_list(
+            'pk', 'subject_identifier'))
+    consented = set()
+    for chunk in chunks(household_members, chunk_size):
+        consented.update(SubjectConsent.objects.filter(
+            version=consent_version, household_member_id__in=chunk).values_list(
+                'household_member_id', flat=True))
+    consented_identifiers = set()
+    for chunk in chunks(set(household_members.values()), chunk_size):
+        consented_identifiers.update(SubjectConsent.objects.filter(
+            version=consent_version, subject_identifier__in=chunk).values_list(
+                'subject_identifier', flat=True))
+    pks = [pk for pk, subject_identifier in household_members.items()
+           if pk not in consented and subject_identifier not in consented_identifiers]
+    return len(household_members) - len(pks), pks
+
+
+def delete_chunk(pks, dependent_models):
+    """Deletes the household members and their dependent reports in
+    one unit of work and returns the number of members deleted.
+
+    As in `delete_household_members`, a member is not deleted if an
+    AbsentMember remains.
+    """
+    with unit_of_work():
+        for model_cls in dependent_models:
+            model_cls.objects.filter(household_member_id__in=pks).delete()
+        absent = set(AbsentMember.objects.filter(
+            household_member_id__in=pks).values_list('household_member_id', flat=True))
+        pks = [pk for pk in pks if pk not in absent]
+        HouseholdMember.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def bulk_delete_household_members(pks, chunk_size=None, dry_run=None,
+                                  stdout=None, dependent_models=None):
+    """Deletes the household members and their dependent reports and
+    returns a tuple of (deleted, failed).
+
+    Each dependent model is deleted with one `__in` delete per chunk
+    and each chunk is deleted in its own unit of work, so the member
+    signals are coalesced. If a chunk fails, its members are deleted
+    one by one and a member that fails is skipped and listed in
+    `failed`.
+    """
+    chunk_size = chunk_size or 500
+    dependent_models = (
+        get_dependent_models() if dependent_models is None else dependent_models)
+    if stdout:
+        stdout.write(f'to delete: {len(pks)}.')
+    if dry_run:
+        return 0, []
+    deleted = 0
+    failed = []
+    start = time.perf_counter()
+    for chunk in chunks(pks, chunk_size):
+        try:
+            deleted += delete_chunk(chunk, dependent_models)
+        except (HouseholdLogRequired, ProtectedError, TypeError):
+            for pk in chunk:
+                try:
+                    deleted += delete_chunk([pk], dependent_models)
+                except (HouseholdLogRequired, ProtectedError, TypeError) as e:
+                    failed.append(pk)
+                    if stdout:
+                        stdout.write(f'Failed to delete {pk}. Got {e}')
+        if stdout:
+            elapsed = time.perf_counter() - start
+            stdout.write(
+                f'Deleted {deleted} out of {len(pks)} members. '
+                f'{deleted / elapsed if elapsed else 0:.1f} members/s.')
+    return deleted, failed
+
+
+def delete_household_members(
+        map_area=None, survey_schedule=None, consent_version=None):
+    SubjectConsent = django_apps.get_model(subject_consent_model)
+    Appointment, SubjectVisit = [
+        django_apps.get_model(model) for model in subject_dependent_models]
+    household_members = get_cloned_household_members(
+        map_area=map_area, survey_schedule=survey_schedule)
     count = 0
     not_household_members = []
     consented = 0
@@ -97,14 +206,38 @@ class Command(BaseCommand):
             'survey_schedule', type=str, help='survey_schedule')
         parser.add_argument(
             'consent_version', type=str, help='consent_version')
+        parser.add_argument(
+            '--bulk', action='store_true', dest='bulk', default=False,
+            help='delete in chunks with one delete per model per chunk')
+        parser.add_argument(
+            '--chunk_size', type=int, default=500,
+            help='members per chunk/transaction in bulk mode')
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help='bulk mode only. Report what would be deleted')
 
     def handle(self, *args, **options):
         map_area = options['map_area']
         survey_schedule = options['survey_schedule']
         consent_version = options['consent_version']
 
-        delete_household_members(
-            map_area=map_area, survey_schedule=survey_schedule,
-            consent_version=consent_version)
+        if options['bulk'] or options['dry_run']:
+            consented, pks = get_household_members_to_delete(
+                map_area=map_area, survey_schedule=survey_schedule,
+                consent_version=consent_version,
+                chunk_size=options['chunk_size'])
+            self.stdout.write(f'consented: {consented}.')
+            deleted, failed = bulk_delete_household_members(
+                pks, chunk_size=options['chunk_size'],
+                dry_run=options['dry_run'], stdout=self.stdout)
+            if options['dry_run']:
+                return
+            if failed:
+                self.stdout.write(self.style.WARNING(
+                    f'Failed to delete {len(failed)} members.'))
+        else:
+            delete_household_members(
+                map_area=map_area, survey_schedule=survey_schedule,
+                consent_version=consent_version)
         ignore_delete_transactions()
         self.stdout.write(self.style.SUCCESS('Succefully deleted members.'))
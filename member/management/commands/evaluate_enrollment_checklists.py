@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from ...enrollment_eligibility import EnrollmentChecklistEvaluator
+from ...models import EnrollmentChecklist, EnrollmentChecklistAnonymous
+
+
+class Command(BaseCommand):
+
+    help = 'Re-evaluate enrollment checklist eligibility in bulk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--map_area', type=str, default=None, help='map_area')
+        parser.add_argument(
+            '--survey_schedule', type=str, default=None,
+            help='survey_schedule field value')
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help='evaluate without updating')
+
+    def handle(self, *args, **options):
+        eligible = ineligible = changed = 0
+        for model in [EnrollmentChecklist, EnrollmentChecklistAnonymous]:
+            enrollment_checklists = model.objects.all()
+            if options['map_area']:
+                enrollment_checklists = enrollment_checklists.filter(
+                    household_member__map_area=options['map_area'])
+            if options['survey_schedule']:
+                enrollment_checklists = enrollment_checklists.filter(
+                    survey_schedule=options['survey_schedule'])
+            evaluator = EnrollmentChecklistEvaluator(
+                enrollment_checklists, dry_run=options['dry_run']).run()
+            eligible += evaluator.eligible
+            ineligible += evaluator.ineligible
+            changed += evaluator.changed
+        self.stdout.write(self.style.SUCCESS(
+            f'Evaluated {eligible + ineligible} checklists. '
+            f'Eligible {eligible}, ineligible {ineligible}, '
+            f'changed {changed}.'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from ...sync_exporter import MemberSyncExporter
+
+
+class Command(BaseCommand):
+
+    help = ('Export member data changed since the last export to a '
+            'compressed file, e.g. for offline transfer from a tablet.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='file to write, gzip compressed')
+        parser.add_argument(
+            '--map_area', type=str, default=None, help='map_area')
+        parser.add_argument(
+            '--batch_size', type=int, default=500, help='rows per batch')
+        parser.add_argument(
+            '--checkpoint', type=str, default=None, dest='checkpoint_path',
+            help=('file to read the high-water marks from and write them to. '
+                  'If not given, all rows are exported'))
+
+    def handle(self, *args, **options):
+        exporter = MemberSyncExporter(
+            map_area=options['map_area'], batch_size=options['batch_size'])
+        exporter.read_cursors(options['checkpoint_path'])
+        exported = exporter.export_to_file(options['path'])
+        exporter.write_cursors(options['checkpoint_path'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {exported} rows to {options["path"]}.'))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from household.models import HouseholdStructure
+
+from ...community_generator import CommunityGenerator
+
+
+class Command(BaseCommand):
+
+    help = ('Populate the household structures of a map area that have '
+            'no members with synthetic members for load testing.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('map_area', type=str, help='map_area')
+        parser.add_argument(
+            'survey_schedule', type=str, help='survey_schedule field value')
+        parser.add_argument(
+            '--members_per_household', type=int, default=5,
+            help='members per household')
+        parser.add_argument(
+            '--absent_ratio', type=float, default=0.1,
+            help='fraction of members reported absent')
+        parser.add_argument(
+            '--seed', type=int, default=None, help='random seed')
+
+    def handle(self, *args, **options):
+        household_structures = HouseholdStructure.objects.filter(
+            household__plot__map_area=options['map_area'],
+            survey_schedule=options['survey_schedule'],
+            enumerated=False)
+        start = time.time()
+        counts = CommunityGenerator(
+            household_structures=household_structures,
+            members_per_household=options['members_per_household'],
+            absent_ratio=options['absent_ratio'],
+            seed=options['seed']).generate()
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated community in {time.time() - start:.1f}s.'))
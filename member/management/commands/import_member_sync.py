@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from ...sync_exporter import import_sync_file
+
+
+class Command(BaseCommand):
+
+    help = 'Import member data from a file written by export_member_sync.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='file written by export_member_sync')
+
+    def handle(self, *args, **options):
+        imported = import_sync_file(options['path'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} rows from {options["path"]}.'))
@@ -1,30 +1,214 @@
+import csv
+import json
+import os
+
 from edc_base.utils import get_utcnow
 from django.apps import apps as django_apps
 from django.core.management.base import BaseCommand
+from django.db.models import F
 
 from edc_constants.constants import YES
 from household.constants import ELIGIBLE_REPRESENTATIVE_PRESENT
-from household.models import HouseholdLogEntry, HouseholdStructure
+from household.models import HouseholdLogEntry
 from member.models import HouseholdMember, RepresentativeEligibility
-from django.core.exceptions import ValidationError
+from member.participation_status import update_participations
+from member.unit_of_work import unit_of_work
+from member.utils import modified_options
+
+SURVEY_SCHEDULES = {
+    'T1': 'bcpp-survey.bcpp-year-2',
+    'T2': 'bcpp-survey.bcpp-year-3'}
+
+# HouseholdMember updates otherwise done by the post_save signal
+# of each model, applied in bulk after bulk_create.
+MEMBER_UPDATES = {
+    'member.movedmember': dict(moved=True),
+    'member.deceasedmember': dict()}
+
+EXCLUDED_FIELDS = ['subject_identifier', 'time_point', 'created', 'revision']
+
+
+def read_rows(file_path=None, skip=None):
+    """Yields one dictionary per CSV row, ignoring the first three
+    columns, without reading the whole file into memory.
+    """
+    with open(file_path, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        fields = [field.strip() for field in next(reader)][3:]
+        for index, line in enumerate(reader):
+            if skip and index < skip:
+                continue
+            yield dict(zip(fields, [value.strip() for value in line[3:]]))
 
 
 def data_dict(file_path=None):
-    data_list = []
-    with open(file_path) as csvfile:
-        lines = csvfile.readlines()
-        fields = lines[0]
-        fields = fields.strip()
-        fields = fields.split(',')
-        fields = fields[3:]
-        lines.pop(0)
-        for line in lines:
-            line = line.strip()
-            line = line.split(',')
-            line = line[3:]
-            data = dict(zip(fields, line))
-            data_list.append(data)
-    return data_list
+    return list(read_rows(file_path=file_path))
+
+
+def batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class MemberDataImporter:
+    """Imports member data rows in batches.
+
+    For each batch, members, existing target rows, today's log
+    entries and representative eligibility are resolved with one
+    query each and target rows are created with bulk_create.
+    Progress is written to `checkpoint_path`, if given, after each
+    batch so that an interrupted import can resume.
+    """
+
+    survey_schedules = SURVEY_SCHEDULES
+
+    def __init__(self, model_cls=None, batch_size=None, checkpoint_path=None,
+                 use_bulk_create=None, stdout=None, style=None):
+        self.model_cls = model_cls
+        self.batch_size = batch_size or 500
+        self.checkpoint_path = checkpoint_path
+        self.member_updates = MEMBER_UPDATES.get(model_cls._meta.label_lower)
+        self.use_bulk_create = (
+            use_bulk_create is not False and self.member_updates is not None)
+        self.stdout = stdout
+        self.style = style
+        self.created = 0
+        self.processed = 0
+
+    def import_file(self, file_path):
+        self.processed = self.read_checkpoint(file_path)
+        for batch in batches(
+                read_rows(file_path=file_path, skip=self.processed), self.batch_size):
+            self.import_batch(batch)
+            self.processed += len(batch)
+            self.write_checkpoint(file_path)
+            self.write(f'Processed {self.processed} rows. Created {self.created}.')
+        return self.created
+
+    def get_household_members(self, batch):
+        """Returns a dictionary of {(subject_identifier, time_point):
+        household_member}.
+        """
+        household_members = {}
+        subject_identifiers = [row.get('subject_identifier') for row in batch]
+        for household_member in HouseholdMember.objects.filter(
+                subject_identifier__in=subject_identifiers).select_related(
+                    'household_structure__householdlog'):
+            for time_point, survey_schedule in self.survey_schedules.items():
+                if survey_schedule.lower() in household_member.survey_schedule.lower():
+                    household_members[
+                        (household_member.subject_identifier, time_point)] = household_member
+        return household_members
+
+    def import_batch(self, batch):
+        household_members = self.get_household_members(batch)
+        existing = set(self.model_cls.objects.filter(
+            household_member__in=list(household_members.values())).values_list(
+                'household_member_id', flat=True))
+        to_create = []
+        for row in batch:
+            subject_identifier = row.get('subject_identifier')
+            household_member = household_members.get(
+                (subject_identifier, row.get('time_point')))
+            if not household_member:
+                self.write(
+                    'Household Member for the subject identifier '
+                    f'{subject_identifier} may be missing. Check if the member is imported',
+                    style='WARNING')
+            elif household_member.pk in existing:
+                self.write(f'Already exists {household_member}.', style='WARNING')
+            else:
+                existing.add(household_member.pk)
+                to_create.append((household_member, {
+                    k: v for k, v in row.items() if k not in EXCLUDED_FIELDS}))
+        if not to_create:
+            return
+        self.prepare_household_structures(
+            [household_member for household_member, _ in to_create])
+        report_datetime = get_utcnow()
+        # our values override any of the same name in the row
+        create_options = [
+            dict(data, household_member=household_member,
+                 report_datetime=report_datetime,
+                 survey_schedule=household_member.survey_schedule)
+            for household_member, data in to_create]
+        if self.use_bulk_create:
+            self.model_cls.objects.bulk_create([
+                self.model_cls(**options) for options in create_options])
+            pks = [household_member.pk for household_member, _ in to_create]
+            HouseholdMember.objects.filter(pk__in=pks).update(
+                visit_attempts=F('visit_attempts') + 1,
+                **self.member_updates, **modified_options())
+            update_participations(HouseholdMember.objects.filter(pk__in=pks))
+        else:
+            with unit_of_work():
+                for options in create_options:
+                    self.model_cls.objects.create(**options)
+        self.created += len(to_create)
+
+    def prepare_household_structures(self, household_members):
+        """Adds today's log entry and the representative eligibility
+        to household structures that do not have them.
+        """
+        household_structures = {
+            household_member.household_structure_id: household_member.household_structure
+            for household_member in household_members}
+        household_logs = {
+            household_structure.householdlog.pk: household_structure
+            for household_structure in household_structures.values()}
+        logged = set(HouseholdLogEntry.objects.filter(
+            report_datetime__date=get_utcnow().date(),
+            household_log_id__in=list(household_logs),
+            household_status=ELIGIBLE_REPRESENTATIVE_PRESENT).values_list(
+                'household_log_id', flat=True))
+        for household_log_id, household_structure in household_logs.items():
+            if household_log_id not in logged:
+                HouseholdLogEntry.objects.create(
+                    report_datetime=get_utcnow(),
+                    household_log=household_structure.householdlog,
+                    household_status=ELIGIBLE_REPRESENTATIVE_PRESENT)
+        represented = set(RepresentativeEligibility.objects.filter(
+            household_structure_id__in=list(household_structures)).values_list(
+                'household_structure_id', flat=True))
+        for pk, household_structure in household_structures.items():
+            if pk not in represented:
+                RepresentativeEligibility.objects.create(
+                    household_structure=household_structure,
+                    report_datetime=get_utcnow(),
+                    aged_over_18=YES,
+                    household_residency=YES,
+                    verbal_script=YES)
+
+    def read_checkpoint(self, file_path):
+        """Returns the number of rows already processed for this
+        file or 0.
+        """
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('file_path') == os.path.abspath(file_path):
+                return checkpoint.get('processed', 0)
+        return 0
+
+    def write_checkpoint(self, file_path):
+        if self.checkpoint_path:
+            with open(self.checkpoint_path, 'w') as f:
+                json.dump(dict(
+                    file_path=os.path.abspath(file_path),
+                    model=self.model_cls._meta.label_lower,
+                    processed=self.processed), f)
+
+    def write(self, message, style=None):
+        if self.stdout:
+            if self.style:
+                message = getattr(self.style, style or 'SUCCESS')(message)
+            self.stdout.write(message)
 
 
 class Command(BaseCommand):
@@ -35,77 +219,30 @@ class Command(BaseCommand):
         parser.add_argument('file_path', type=str, help='file_path')
         parser.add_argument(
             'model_label_lower', type=str, help='model_label_lower')
+        parser.add_argument(
+            '--batch_size', type=int, default=500, help='rows per batch')
+        parser.add_argument(
+            '--checkpoint', type=str, default=None, dest='checkpoint_path',
+            help='file to record progress in and resume from')
+        parser.add_argument(
+            '--no-bulk-create', action='store_false', dest='use_bulk_create',
+            default=True,
+            help=('create rows one by one through save() so that history '
+                  'and sync transactions are created'))
 
     def handle(self, *args, **options):
         file_path = options['file_path']
         model_label_lower = options['model_label_lower']
-        data_list = data_dict(file_path=file_path)
         app_label, model_name = model_label_lower.split('.')
         model_cls = django_apps.get_model(app_label, model_name)
-        created_members = 0
-        survey_schedule = None
-        total_to_create = len(data_list)
         self.stdout.write(
-            self.style.WARNING(f'Total to create {total_to_create} for model {model_cls}.'))
-        for data in data_list:
-            if data.get('time_point') == 'T2':
-                survey_schedule = 'bcpp-survey.bcpp-year-3'
-            elif data.get('time_point') == 'T1':
-                survey_schedule = 'bcpp-survey.bcpp-year-2'
-            subject_identifier = data.get('subject_identifier')
-            try:
-                household_member = HouseholdMember.objects.get(
-                    subject_identifier=subject_identifier,
-                    survey_schedule__icontains=survey_schedule)
-            except HouseholdMember.DoesNotExist:
-                print(
-                    'Household Member for the subject identifier '
-                    f'{subject_identifier} may be missing. Check if the member is imported')
-            else:
-                try:
-                    model_cls.objects.get(household_member=household_member)
-                except model_cls.DoesNotExist:
-                    data.update(
-                        report_datetime=get_utcnow(),
-                        household_member=household_member)
-                    del data['subject_identifier']
-                    del data['time_point']
-                    del data['created']
-                    del data['revision']
-                    try:
-                        household_structure = HouseholdStructure.objects.get(
-                            id=household_member.household_structure.id)
-                    except HouseholdStructure.DoesNotExist:
-                        raise ValidationError(
-                            f'Missing household structure for member {household_member}')
-                    else:
-                        try:
-                            HouseholdLogEntry.objects.get(
-                                report_datetime__date=get_utcnow().date(),
-                                household_log=household_structure.householdlog,
-                                household_status=ELIGIBLE_REPRESENTATIVE_PRESENT)
-                        except:
-                            HouseholdLogEntry.objects.create(
-                                report_datetime=get_utcnow(),
-                                household_log=household_structure.householdlog,
-                                household_status=ELIGIBLE_REPRESENTATIVE_PRESENT)
-                    try:
-                        RepresentativeEligibility.objects.get(
-                            household_structure=household_structure)
-                    except RepresentativeEligibility.DoesNotExist:
-                        RepresentativeEligibility.objects.create(
-                            household_structure=household_structure,
-                            report_datetime=get_utcnow(),
-                            aged_over_18=YES,
-                            household_residency=YES,
-                            verbal_script=YES)
-                    obj = model_cls.objects.create(**data)
-                    obj.save_base(raw=True)
-                    obj = model_cls.objects.get(id=obj.id)
-                    self.stdout.write(
-                        self.style.SUCCESS(f'Successfully created {obj} member data.'))
-                    created_members += 1
-                else:
-                    self.stdout.write(self.style.WARNING(f'Already exists {household_member}.'))
+            self.style.WARNING(f'Importing {file_path} for model {model_cls}.'))
+        importer = MemberDataImporter(
+            model_cls=model_cls,
+            batch_size=options['batch_size'],
+            checkpoint_path=options['checkpoint_path'],
+            use_bulk_create=options['use_bulk_create'],
+            stdout=self.stdout, style=self.style)
+        created_members = importer.import_file(file_path)
         self.stdout.write(
             self.style.SUCCESS(f'Successfully created {created_members} member data.'))
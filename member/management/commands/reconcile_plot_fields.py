@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from ...models import HouseholdMember
+from ...plot_fields import reconcile_plot_fields
+
+
+class Command(BaseCommand):
+
+    help = ('Backfill or reconcile the plot_identifier and map_area '
+            'denormalised on household members.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--map_area', type=str, default=None, help='map_area of the plot')
+        parser.add_argument(
+            '--chunk_size', type=int, default=500, help='chunk_size')
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help='report the number of members to update without updating')
+
+    def handle(self, *args, **options):
+        household_members = HouseholdMember.objects.all()
+        if options['map_area']:
+            household_members = household_members.filter(
+                household_structure__household__plot__map_area=options['map_area'])
+        checked, updated = reconcile_plot_fields(
+            household_members, chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} members. '
+            f'{"Would update" if options["dry_run"] else "Updated"} {updated}.'))
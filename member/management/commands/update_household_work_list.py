@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from household.models import HouseholdStructure
+
+from ...update_household_work_list import (
+    HouseholdWorkListUpdater, update_household_work_list)
+
+
+class Command(BaseCommand):
+
+    help = 'Update the household work list for a label.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--label', type=str, help='label to group, e.g. T1 prep')
+        parser.add_argument(
+            '--map_area', type=str, default=None, help='map_area')
+        parser.add_argument(
+            '--survey_schedule', type=str, default=None,
+            help='survey_schedule field value')
+        parser.add_argument(
+            '--benchmark', action='store_true', dest='benchmark', default=False,
+            help=('compare the queries and time of the per-structure and '
+                  'set-based updates and roll both back'))
+
+    def handle(self, *args, **options):
+        household_structures = HouseholdStructure.objects.all()
+        if options['map_area']:
+            household_structures = household_structures.filter(
+                household__plot__map_area=options['map_area'])
+        if options['survey_schedule']:
+            household_structures = household_structures.filter(
+                survey_schedule=options['survey_schedule'])
+        if options['benchmark']:
+            for path, (queries, seconds) in self.benchmark(
+                    options['label'], household_structures).items():
+                self.stdout.write(f'{path}: {queries} queries, {seconds:.3f}s')
+        else:
+            created, updated = HouseholdWorkListUpdater(
+                label=options['label'],
+                household_structures=household_structures,
+                progress_callback=lambda done, total: self.stdout.write(
+                    f'{done}/{total}', ending='\r')).update()
+            self.stdout.write(self.style.SUCCESS(
+                f'\nCreated {created}, updated {updated} work lists.'))
+
+    def benchmark(self, label, household_structures):
+        """Returns a dictionary of {path: (queries, seconds)} for
+        each path, each run in a transaction that is rolled back.
+        """
+        household_structures = list(household_structures)
+
+        def per_structure():
+            for household_structure in household_structures:
+                update_household_work_list(
+                    label=label, household_structure=household_structure)
+
+        def set_based():
+            HouseholdWorkListUpdater(
+                label=label, household_structures=household_structures).update()
+
+        results = {}
+        for path, func in [('per_structure', per_structure), ('set_based', set_based)]:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    func()
+                    results[path] = (
+                        len(context.captured_queries), time.perf_counter() - start)
+                transaction.set_rollback(True)
+        return results
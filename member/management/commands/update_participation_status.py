@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from ...models import HouseholdMember
+from ...participation_status import update_participations
+
+
+def update_participation_status(map_area=None, survey_schedule=None,
+                                chunk_size=None, dry_run=None):
+    """Backfills or reconciles the persisted participation status
+    of household members and returns a tuple of (checked, updated).
+    """
+    household_members = HouseholdMember.objects.all()
+    if map_area:
+        household_members = household_members.filter(map_area=map_area)
+    if survey_schedule:
+        household_members = household_members.filter(
+            survey_schedule=survey_schedule)
+    return update_participations(
+        household_members, chunk_size=chunk_size, dry_run=dry_run)
+
+
+class Command(BaseCommand):
+
+    help = 'Backfill or reconcile the persisted participation status of members.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--map_area', type=str, default=None, help='map_area')
+        parser.add_argument(
+            '--survey_schedule', type=str, default=None,
+            help='survey_schedule field value')
+        parser.add_argument(
+            '--chunk_size', type=int, default=500, help='chunk_size')
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help='report the number of members to update without updating')
+
+    def handle(self, *args, **options):
+        checked, updated = update_participation_status(
+            map_area=options['map_area'],
+            survey_schedule=options['survey_schedule'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} members. '
+            f'{"Would update" if options["dry_run"] else "Updated"} {updated}.'))
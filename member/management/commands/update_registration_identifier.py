@@ -1,10 +1,16 @@
+import time
+
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.db.models.signals import post_save
 
 from edc_map.models import InnerContainer
 from edc_registration.models import RegisteredSubject
 
 from ...models import HouseholdMember
+from ...utils import chunks, modified_options
 
 
 def to_string(value):
@@ -19,15 +25,69 @@ def to_string(value):
     return value
 
 
+def get_registration_identifiers(map_area=None, plot_identifiers=None):
+    """Returns a dictionary of {subject_identifier: registration_identifier}
+    for the household members in the map area's plots.
+    """
+    household_members = HouseholdMember.objects.filter(
+        map_area=map_area, plot_identifier__in=plot_identifiers)
+    return {
+        subject_identifier: to_string(internal_identifier)
+        for subject_identifier, internal_identifier in household_members.values_list(
+            'subject_identifier', 'internal_identifier')}
+
+
+def update_registration_identifiers(registration_identifiers, chunk_size=None,
+                                    emit_sync=None):
+    """Sets the registration identifier on RegisteredSubjects that
+    do not have one and returns the number updated.
+
+    Each chunk is selected with one query and updated with one
+    UPDATE statement. If `emit_sync` is True, post_save is sent for
+    each updated instance so that edc_sync and history still see
+    the change.
+    """
+    updated = 0
+    for chunk in chunks(list(registration_identifiers), chunk_size or 500):
+        with transaction.atomic():
+            pks = dict(RegisteredSubject.objects.select_for_update().filter(
+                subject_identifier__in=chunk,
+                registration_identifier__isnull=True).values_list(
+                    'pk', 'subject_identifier'))
+            if not pks:
+                continue
+            RegisteredSubject.objects.filter(pk__in=list(pks)).update(
+                registration_identifier=Case(
+                    *[When(pk=pk, then=Value(
+                        registration_identifiers[subject_identifier]))
+                      for pk, subject_identifier in pks.items()],
+                    output_field=CharField()),
+                **modified_options())
+            if emit_sync:
+                for obj in RegisteredSubject.objects.filter(pk__in=list(pks)):
+                    post_save.send(
+                        sender=RegisteredSubject, instance=obj, created=False,
+                        raw=False, using=obj._state.db,
+                        update_fields=frozenset(
+                            ['registration_identifier', 'modified', 'hostname_modified']))
+        updated += len(pks)
+    return updated
+
+
 class Command(BaseCommand):
 
     help = 'Update registration identifiers.'
 
     def add_arguments(self, parser):
         parser.add_argument('map_area', type=str, help='map_area')
+        parser.add_argument(
+            '--chunk_size', type=int, default=500, help='subjects per query')
+        parser.add_argument(
+            '--emit-sync', action='store_true', dest='emit_sync', default=False,
+            help='send post_save for each updated subject so that sync '
+                 'transactions are created')
 
     def handle(self, *args, **options):
-        count = 0
         map_area = options['map_area']
         try:
             inner_container = InnerContainer.objects.get(
@@ -35,27 +95,17 @@ class Command(BaseCommand):
         except InnerContainer.DoesNotExist:
             pass
         else:
-            plot_identifiers = inner_container.identifier_labels
-            household_members = HouseholdMember.objects.filter(
-                household_structure__household__plot__map_area=map_area,
-                household_structure__household__plot__plot_identifier__in=plot_identifiers)
-            subject_identifier_internal_identifier = {}
-            for household_member in household_members:
-                subject_identifier_internal_identifier[
-                    household_member.subject_identifier] = household_member.internal_identifier
-            for subject_identifier, internal_identifier in subject_identifier_internal_identifier.items():
-                try:
-                    registered_subject = RegisteredSubject.objects.get(
-                        subject_identifier=subject_identifier, registration_identifier__isnull=True)
-                except RegisteredSubject.DoesNotExist:
-                    pass
-                else:
-                    registration_value = to_string(internal_identifier)
-                    registered_subject.registration_identifier = registration_value
-                    registered_subject.save()
-                    count += 1
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'{count} {registered_subject.first_name} registration identifier Updated machine {settings.DEVICE_ID}'))
+            start = time.time()
+            registration_identifiers = get_registration_identifiers(
+                map_area=map_area,
+                plot_identifiers=inner_container.identifier_labels)
+            count = update_registration_identifiers(
+                registration_identifiers,
+                chunk_size=options['chunk_size'],
+                emit_sync=options['emit_sync'])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{count} registration identifiers updated on machine '
+                    f'{settings.DEVICE_ID} in {time.time() - start:.1f}s.'))
             self.stdout.write(
                 self.style.SUCCESS('Successfully update registration identifiers members.'))
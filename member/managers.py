@@ -1,19 +1,73 @@
 from django.db import models
+from django.db.models.query import ModelIterable
+
+from .consent_helper import attach_consents
+from .natural_key_index import get_indexed_pk, is_indexed
+
+
+class HouseholdMemberQuerySet(models.QuerySet):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._with_consents = False
+
+    def with_consents(self):
+        """Returns a queryset that sets the consent of each member
+        when evaluated, with one query per consent model and version.
+        """
+        clone = self.select_related('household_structure__household')
+        clone._with_consents = True
+        return clone
+
+    def _clone(self, *args, **kwargs):
+        clone = super()._clone(*args, **kwargs)
+        clone._with_consents = self._with_consents
+        return clone
+
+    def _fetch_all(self):
+        fetch = self._result_cache is None
+        super()._fetch_all()
+        if fetch and self._with_consents and self._iterable_class is ModelIterable:
+            attach_consents(self._result_cache)
 
 
 class HouseholdMemberManager(models.Manager):
 
+    def get_queryset(self):
+        return HouseholdMemberQuerySet(self.model, using=self._db)
+
+    def with_consents(self):
+        return self.get_queryset().with_consents()
+
     def get_by_natural_key(self,
                            internal_identifier,
                            survey_schedule,
                            household_identifier,
                            plot_identifier):
-        return self.get(
-            internal_identifier=internal_identifier,
-            household_structure__survey_schedule=survey_schedule,
-            household_identifier=household_identifier,
-            household_structure__household__plot__plot_identifier=plot_identifier
-        )
+        natural_key = (
+            internal_identifier, survey_schedule, household_identifier, plot_identifier)
+        pk = get_indexed_pk(natural_key)
+        if pk:
+            return self.get(pk=pk)
+        if is_indexed(natural_key):
+            raise self.model.DoesNotExist(
+                f'{self.model._meta.object_name} matching query does not exist.')
+        try:
+            return self.get(
+                internal_identifier=internal_identifier,
+                survey_schedule=survey_schedule,
+                household_identifier=household_identifier,
+                plot_identifier=plot_identifier)
+        except self.model.DoesNotExist:
+            # only members whose plot_identifier is not yet backfilled,
+            # see reconcile_plot_fields
+            return self.get(
+                internal_identifier=internal_identifier,
+                plot_identifier__isnull=True,
+                household_structure__survey_schedule=survey_schedule,
+                household_identifier=household_identifier,
+                household_structure__household__plot__plot_identifier=plot_identifier
+            )
 
 
 class MemberEntryManager(models.Manager):
@@ -23,16 +77,34 @@ class MemberEntryManager(models.Manager):
                            survey_schedule,
                            household_identifier,
                            plot_identifier):
-
-        options = {
-            'report_datetime': report_datetime,
-            'household_member__internal_identifier':
-            internal_identifier,
-            'household_member__household_structure__survey_schedule':
-            survey_schedule,
-            'household_member__household_structure__household__household_identifier':
-            household_identifier,
-            'household_member__household_structure__household__plot__plot_identifier':
-            plot_identifier
-        }
-        return self.get(**options)
+        natural_key = (
+            internal_identifier, survey_schedule, household_identifier, plot_identifier)
+        pk = get_indexed_pk(natural_key)
+        if pk:
+            return self.get(report_datetime=report_datetime, household_member_id=pk)
+        if is_indexed(natural_key):
+            raise self.model.DoesNotExist(
+                f'{self.model._meta.object_name} matching query does not exist.')
+        try:
+            return self.get(
+                report_datetime=report_datetime,
+                household_member__internal_identifier=internal_identifier,
+                household_member__survey_schedule=survey_schedule,
+                household_member__household_identifier=household_identifier,
+                household_member__plot_identifier=plot_identifier)
+        except self.model.DoesNotExist:
+            # only members whose plot_identifier is not yet backfilled,
+            # see reconcile_plot_fields
+            options = {
+                'report_datetime': report_datetime,
+                'household_member__internal_identifier':
+                internal_identifier,
+                'household_member__plot_identifier__isnull': True,
+                'household_member__household_structure__survey_schedule':
+                survey_schedule,
+                'household_member__household_structure__household__household_identifier':
+                household_identifier,
+                'household_member__household_structure__household__plot__plot_identifier':
+                plot_identifier
+            }
+            return self.get(**options)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-18 09:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0007_auto_20170425_2057'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalhouseholdmember',
+            name='participation',
+            field=models.CharField(db_index=True, default='available', editable=False, help_text='updated by the member signals, the persisted value of participation_status', max_length=25),
+        ),
+        migrations.AddField(
+            model_name='historicalhouseholdmember',
+            name='participation_final',
+            field=models.BooleanField(db_index=True, default=False, editable=False, help_text='updated by the member signals, the persisted value of participation_status.final'),
+        ),
+        migrations.AddField(
+            model_name='householdmember',
+            name='participation',
+            field=models.CharField(db_index=True, default='available', editable=False, help_text='updated by the member signals, the persisted value of participation_status', max_length=25),
+        ),
+        migrations.AddField(
+            model_name='householdmember',
+            name='participation_final',
+            field=models.BooleanField(db_index=True, default=False, editable=False, help_text='updated by the member signals, the persisted value of participation_status.final'),
+        ),
+    ]
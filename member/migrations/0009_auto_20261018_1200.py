@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-18 12:00
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0008_auto_20261018_0900'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='householdmember',
+            index_together=set([
+                ('internal_identifier', 'subject_identifier', 'created'),
+                ('household_structure', 'relation'),
+                ('subject_identifier', 'survey_schedule'),
+                ('survey_schedule', 'cloned')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='memberappointment',
+            index_together=set([('label', 'appt_status', 'appt_date')]),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-18 15:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def backfill_plot_fields(apps, schema_editor):
+    """Copies plot_identifier and map_area from the plot to the
+    existing members with one update per (plot_identifier, map_area)
+    pair and chunk, see reconcile_plot_fields.
+
+    `modified` is not changed since every machine runs this
+    migration itself.
+    """
+    HouseholdMember = apps.get_model('member', 'householdmember')
+    changes = {}
+    for pk, *values in HouseholdMember.objects.filter(
+            plot_identifier__isnull=True).order_by().values_list(
+                'pk', 'household_structure__household__plot__plot_identifier',
+                'household_structure__household__plot__map_area').iterator():
+        changes.setdefault(tuple(values), []).append(pk)
+    for (plot_identifier, map_area), pks in changes.items():
+        for index in range(0, len(pks), 500):
+            HouseholdMember.objects.filter(pk__in=pks[index:index + 500]).update(
+                plot_identifier=plot_identifier, map_area=map_area)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0009_auto_20261018_1200'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalhouseholdmember',
+            name='map_area',
+            field=models.CharField(db_index=True, editable=False, help_text='updated on save from plot', max_length=25, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalhouseholdmember',
+            name='plot_identifier',
+            field=models.CharField(db_index=True, editable=False, help_text='updated on save from plot', max_length=25, null=True),
+        ),
+        migrations.AddField(
+            model_name='householdmember',
+            name='map_area',
+            field=models.CharField(db_index=True, editable=False, help_text='updated on save from plot', max_length=25, null=True),
+        ),
+        migrations.AddField(
+            model_name='householdmember',
+            name='plot_identifier',
+            field=models.CharField(db_index=True, editable=False, help_text='updated on save from plot', max_length=25, null=True),
+        ),
+        migrations.RunPython(backfill_plot_fields, migrations.RunPython.noop),
+    ]
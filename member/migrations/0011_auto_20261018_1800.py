@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-18 18:00
+from __future__ import unicode_literals
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('member', '0010_auto_20261018_1500'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historicalhouseholdmember',
+            name='initials',
+            field=models.CharField(db_index=True, max_length=3, validators=[django.core.validators.MinLengthValidator(2), django.core.validators.MaxLengthValidator(3), django.core.validators.RegexValidator('^[A-Z]{1,3}$', 'Must be Only CAPS and 2 or 3 letters. No spaces or numbers allowed.')], verbose_name='Initials'),
+        ),
+        migrations.AlterField(
+            model_name='historicalhouseholdmember',
+            name='relation',
+            field=models.CharField(choices=[('head', 'HEAD of HOUSEHOLD'), ('aunt', 'Aunt'), ('brother', 'Brother'), ('brother-in-law', 'Brother in-law'), ('cousin', 'Cousin'), ('daughter', 'Daughter'), ('daughter-in-law', 'Daughter-in-law'), ('employee', 'Employee'), ('family_friend', 'Family friend'), ('father', 'Father'), ('father-in-law', 'Father-in-law'), ('friend', 'Friend'), ('granddaughter', 'Granddaughter'), ('grandfather', 'Grandfather'), ('grandmother', 'Grandmother'), ('grandson', 'Grandson'), ('great-granddaughter', 'Great-Granddaughter'), ('great-grandfather', 'Great-Grandfather'), ('great-grandmother', 'Great-Grandmother'), ('great-grandson', 'Great-Grandson'), ('helper', 'Helper'), ('housemaid', 'Housemaid'), ('housemate', 'Housemate'), ('husband', 'Husband'), ('mother', 'Mother'), ('mother-in-law', 'Mother-in-law'), ('nephew', 'Nephew'), ('niece', 'Niece'), ('partner', 'Partner'), ('sister', 'Sister'), ('sister-in-law', 'Sister-in-law'), ('son', 'Son'), ('son-in-law', 'Son-in-law'), ('uncle', 'Uncle'), ('wife', 'Wife'), ('unknown', 'UNKNOWN'), ('N/A', 'Not Applicable')], db_index=True, help_text='Relation to head of household', max_length=35, null=True, verbose_name='Relation to head of household'),
+        ),
+        migrations.AlterField(
+            model_name='householdmember',
+            name='initials',
+            field=models.CharField(db_index=True, max_length=3, validators=[django.core.validators.MinLengthValidator(2), django.core.validators.MaxLengthValidator(3), django.core.validators.RegexValidator('^[A-Z]{1,3}$', 'Must be Only CAPS and 2 or 3 letters. No spaces or numbers allowed.')], verbose_name='Initials'),
+        ),
+        migrations.AlterField(
+            model_name='householdmember',
+            name='relation',
+            field=models.CharField(choices=[('head', 'HEAD of HOUSEHOLD'), ('aunt', 'Aunt'), ('brother', 'Brother'), ('brother-in-law', 'Brother in-law'), ('cousin', 'Cousin'), ('daughter', 'Daughter'), ('daughter-in-law', 'Daughter-in-law'), ('employee', 'Employee'), ('family_friend', 'Family friend'), ('father', 'Father'), ('father-in-law', 'Father-in-law'), ('friend', 'Friend'), ('granddaughter', 'Granddaughter'), ('grandfather', 'Grandfather'), ('grandmother', 'Grandmother'), ('grandson', 'Grandson'), ('great-granddaughter', 'Great-Granddaughter'), ('great-grandfather', 'Great-Grandfather'), ('great-grandmother', 'Great-Grandmother'), ('great-grandson', 'Great-Grandson'), ('helper', 'Helper'), ('housemaid', 'Housemaid'), ('housemate', 'Housemate'), ('husband', 'Husband'), ('mother', 'Mother'), ('mother-in-law', 'Mother-in-law'), ('nephew', 'Nephew'), ('niece', 'Niece'), ('partner', 'Partner'), ('sister', 'Sister'), ('sister-in-law', 'Sister-in-law'), ('son', 'Son'), ('son-in-law', 'Son-in-law'), ('uncle', 'Uncle'), ('wife', 'Wife'), ('unknown', 'UNKNOWN'), ('N/A', 'Not Applicable')], db_index=True, help_text='Relation to head of household', max_length=35, null=True, verbose_name='Relation to head of household'),
+        ),
+    ]
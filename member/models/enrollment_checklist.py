@@ -7,11 +7,10 @@ from edc_base.model_managers import HistoricalRecords
 from edc_base.model_mixins import BaseUuidModel
 from edc_base.utils import age
 from edc_constants.choices import GENDER, YES_NO, YES_NO_NA
-from edc_constants.constants import NOT_APPLICABLE, NO, YES
+from edc_constants.constants import NOT_APPLICABLE
 
-from ..age_helper import AgeHelper
 from ..choices import BLOCK_CONTINUE
-from ..constants import BLOCK_PARTICIPATION
+from ..enrollment_eligibility import EnrollmentEligibility
 from ..exceptions import MemberEnrollmentError
 from ..managers import MemberEntryManager
 from .model_mixins import HouseholdMemberModelMixin
@@ -19,7 +18,7 @@ from .model_mixins import HouseholdMemberModelMixin
 
 class EnrollmentModelMixin(models.Model):
 
-    age_helper_cls = AgeHelper
+    eligibility_cls = EnrollmentEligibility
 
     is_eligible = models.BooleanField(default=False)
 
@@ -82,33 +81,14 @@ class EnrollmentModelMixin(models.Model):
             self.age_in_years = age(self.dob, self.report_datetime).years
         # is eligible or collect reasons not eligible, but do not raise an
         # exception
-        loss_reason = []
-        if self.has_identity == NO:
-            loss_reason.append('No valid identity.')
-        if self.household_residency == NO and not self.household_member.cloned:
-            loss_reason.append('Failed household residency requirement')
-        if self.part_time_resident == NO and not self.household_member.cloned:
-            loss_reason.append(
-                'Does not spend 3 or more nights per month in the community.')
-        if self.citizen == NO and self.legal_marriage == NO:
-            loss_reason.append('Not a citizen and not married to a citizen.')
+        eligibility = self.eligibility_cls(
+            cloned=self.household_member.cloned,
+            member_age_in_years=self.household_member.age_in_years,
+            **self.__dict__)
+        if eligibility.non_citizen:
             self.non_citizen = True
-        if (self.citizen == NO and self.legal_marriage == YES and
-                self.marriage_certificate == NO):
-            loss_reason.append(
-                'Not a citizen, married to a citizen but does not '
-                'have a marriage certificate.')
-            self.non_citizen = True
-        if self.literacy == NO:
-            loss_reason.append('Illiterate with no literate witness.')
-        age_helper = self.age_helper_cls(
-            age_in_years=self.household_member.age_in_years)
-        if age_helper.is_minor and self.guardian != YES:
-            loss_reason.append('Minor without guardian available.')
-        if self.confirm_participation == BLOCK_PARTICIPATION:
-            loss_reason.append('Already enrolled.')
-        self.is_eligible = False if loss_reason else True
-        self.loss_reason = '|'.join(loss_reason) if loss_reason else None
+        self.is_eligible = eligibility.is_eligible
+        self.loss_reason = eligibility.loss_reason
         super().save(*args, **kwargs)
 
     class Meta:
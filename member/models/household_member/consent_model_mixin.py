@@ -2,14 +2,17 @@ from django.apps import apps as django_apps
 from django.db import models
 
 from edc_consent.exceptions import ConsentDoesNotExist
-from edc_consent.site_consents import site_consents
+
+from ...consent_helper import (
+    NOT_RESOLVED, consent_period_index, get_consent_generation)
 
 
 class ConsentModelMixin(models.Model):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._consent = None
+        self._consent = NOT_RESOLVED
+        self._consent_generation = None
         self._consent_object = None
 
     @property
@@ -19,40 +22,56 @@ class ConsentModelMixin(models.Model):
     @property
     def consent_object(self):
         if not self._consent_object:
-            if self.anonymous:
-                anonymous_consent_group = django_apps.get_app_config(
-                    'bcpp_consent').anonymous_consent_group
-                try:
-                    self._consent_object = site_consents.get_consent(
-                        report_datetime=self.report_datetime,
-                        consent_group=anonymous_consent_group)
-                except ConsentDoesNotExist:
-                    self._consent_object = None
-            else:
-                default_consent_group = django_apps.get_app_config(
-                    'edc_consent').default_consent_group
-                try:
-                    self._consent_object = site_consents.get_consent(
-                        report_datetime=self.report_datetime,
-                        consent_group=default_consent_group)
-                except ConsentDoesNotExist:
-                    self._consent_object = None
+            self._consent_object = self.get_consent_object(
+                anonymous=self.anonymous)
         return self._consent_object
 
+    def get_consent_object(self, anonymous=None):
+        """Returns the consent object valid for this member's
+        report_datetime from the anonymous or default consent group,
+        or None.
+
+        Uses the process-wide `consent_period_index`.
+        """
+        if anonymous:
+            consent_group = django_apps.get_app_config(
+                'bcpp_consent').anonymous_consent_group
+        else:
+            consent_group = django_apps.get_app_config(
+                'edc_consent').default_consent_group
+        try:
+            consent_object = consent_period_index.get_consent(
+                report_datetime=self.report_datetime,
+                consent_group=consent_group)
+        except ConsentDoesNotExist:
+            consent_object = None
+        return consent_object
+
     @property
     def consent(self):
         """Returns a consent model instance, or None, that is
         valid for the current period (report_datetime).
+
+        The result, including None, is cached on the instance until
+        a consent is saved or deleted. See also
+        `HouseholdMember.objects.with_consents()`.
         """
-        if not self._consent:
-            if self.consent_object and self.eligible_subject:
+        generation = get_consent_generation()
+        if self._consent is NOT_RESOLVED or self._consent_generation != generation:
+            self._consent = None
+            self._consent_generation = generation
+            if self.eligible_subject and self.consent_object:
                 try:
                     self._consent = self.consent_object.model.objects.get(
                         version=self.consent_object.version,
                         subject_identifier=self.subject_identifier)
                 except self.consent_object.model.DoesNotExist:
-                    self._consent = None
+                    pass
         return self._consent
 
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._consent = NOT_RESOLVED
+
     class Meta:
         abstract = True
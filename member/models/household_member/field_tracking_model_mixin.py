@@ -0,0 +1,58 @@
+from django.db import models
+
+
+class FieldTrackingModelMixin(models.Model):
+    """Mixin that tracks field values as loaded or as last saved
+    so that `save` can skip work for fields that did not change.
+
+    Place first in the bases so that values are reset only after
+    all other mixins and the post_save signals have run.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tracked_values = self.tracked_values
+
+    @property
+    def tracked_values(self):
+        """Returns a dictionary of {attname: value} of the loaded
+        concrete fields, excluding deferred fields.
+        """
+        return {field.attname: self.__dict__[field.attname]
+                for field in self._meta.concrete_fields
+                if field.attname in self.__dict__}
+
+    @property
+    def changed_fields(self):
+        """Returns a list of attnames whose value differs from the
+        loaded or last saved value.
+
+        A deferred field loaded on access is added to the snapshot by
+        refresh_from_db, so only a deferred field that was assigned
+        is reported.
+        """
+        return [attname for attname, value in self.tracked_values.items()
+                if attname not in self._tracked_values
+                or value != self._tracked_values.get(attname)]
+
+    def has_changed(self, *attnames):
+        """Returns True if the instance is new or any of the
+        given attnames has changed.
+        """
+        if self._state.adding or not self.pk:
+            return True
+        changed_fields = self.changed_fields
+        return any(attname in changed_fields for attname in attnames)
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._tracked_values.update({
+            attname: value for attname, value in self.tracked_values.items()
+            if not fields or attname in fields})
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._tracked_values = self.tracked_values
+
+    class Meta:
+        abstract = True
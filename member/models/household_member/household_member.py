@@ -14,15 +14,17 @@ from edc_constants.constants import ALIVE, DEAD, YES, NOT_APPLICABLE
 from edc_registration.model_mixins import UpdatesOrCreatesRegistrationModelMixin
 from edc_search.model_mixins import SearchSlugManager
 from household.models import HouseholdStructure
-from plot.utils import get_anonymous_plot
 from survey.model_mixins import SurveyScheduleModelMixin
 
 from member_clone.model_mixins import CloneModelMixin, NextMemberModelMixin
 
+from ...anonymous_plot import get_anonymous_plot_id
 from ...choices import INABILITY_TO_PARTICIPATE_REASON
+from ...constants import AUDIT_FIELDS, HOUSEHOLD_MEMBER_FLAG_FIELDS
 from ...exceptions import MemberValidationError
 from ...managers import HouseholdMemberManager
 from .consent_model_mixin import ConsentModelMixin
+from .field_tracking_model_mixin import FieldTrackingModelMixin
 from .member_eligibility_model_mixin import MemberEligibilityModelMixin
 from .member_identifier_model_mixin import MemberIdentifierModelMixin
 from .member_status_model_mixin import MemberStatusModelMixin
@@ -35,7 +37,8 @@ class Manager(HouseholdMemberManager, SearchSlugManager):
     pass
 
 
-class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
+class HouseholdMember(FieldTrackingModelMixin,
+                      UpdatesOrCreatesRegistrationModelMixin,
                       RepresentativeModelMixin,
                       CloneModelMixin, NextMemberModelMixin, ConsentModelMixin,
                       MemberStatusModelMixin, MemberEligibilityModelMixin,
@@ -45,6 +48,15 @@ class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
     household member.
     """
 
+    flag_fields = HOUSEHOLD_MEMBER_FLAG_FIELDS
+
+    audit_fields = AUDIT_FIELDS
+
+    # fields that, if changed, require RegisteredSubject to be updated
+    registration_tracked_fields = [
+        'subject_identifier', 'internal_identifier', 'first_name',
+        'initials', 'gender', 'age_in_years', 'survival_status']
+
     household_structure = models.ForeignKey(
         HouseholdStructure, on_delete=models.PROTECT)
 
@@ -52,6 +64,20 @@ class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
         max_length=25,
         help_text='updated on save from household')
 
+    plot_identifier = models.CharField(
+        max_length=25,
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text='updated on save from plot')
+
+    map_area = models.CharField(
+        max_length=25,
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text='updated on save from plot')
+
     internal_identifier = models.UUIDField(
         default=uuid4,
         editable=False,
@@ -73,6 +99,7 @@ class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
     initials = models.CharField(
         verbose_name='Initials',
         max_length=3,
+        db_index=True,
         validators=[
             MinLengthValidator(2),
             MaxLengthValidator(3),
@@ -187,13 +214,41 @@ class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
                 f'{self.household_structure.survey_schedule}')
 
     def save(self, *args, **kwargs):
-        self.household_identifier = (
-            self.household_structure.household.household_identifier)
+        if (self.has_changed('household_structure_id')
+                or not self.household_identifier or not self.survey_schedule
+                or not self.plot_identifier or self.map_area is None):
+            household = self.household_structure.household
+            self.household_identifier = household.household_identifier
+            self.plot_identifier = household.plot.plot_identifier
+            self.map_area = household.plot.map_area
+            self.survey_schedule = self.household_structure.survey_schedule
         if not self.id and not self.internal_identifier:
             self.internal_identifier = uuid4()
-        self.survey_schedule = self.household_structure.survey_schedule
+        if not kwargs.get('update_fields') and self.is_flag_only_change:
+            kwargs.update(update_fields=self.changed_fields + [
+                f.attname for f in self._meta.concrete_fields
+                if f.name in self.audit_fields])
         super().save(*args, **kwargs)
 
+    @property
+    def is_flag_only_change(self):
+        """Returns True if this is an existing instance and only
+        fields updated by the member signals have changed.
+        """
+        if self._state.adding or not self.id:
+            return False
+        changed_fields = self.changed_fields
+        return bool(changed_fields) and all(
+            f in self.flag_fields for f in changed_fields)
+
+    def registration_update_or_create(self):
+        """Updates or creates RegisteredSubject only if the instance
+        is new or a field it depends on changed.
+        """
+        if self.has_changed(*self.registration_tracked_fields):
+            return super().registration_update_or_create()
+        return None
+
     def natural_key(self):
         return ((self.internal_identifier,)
                 + self.household_structure.natural_key())
@@ -225,10 +280,8 @@ class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
     def anonymous(self):
         """Returns True if this member resides on the anonymous plot.
         """
-        plot = get_anonymous_plot()
-        if self.household_structure.household.plot == plot:
-            return True
-        return False
+        return (self.household_structure.household.plot_id
+                == get_anonymous_plot_id())
 
     def common_clean(self):
         if self.survival_status == DEAD and self.present_today == YES:
@@ -248,5 +301,8 @@ class HouseholdMember(UpdatesOrCreatesRegistrationModelMixin,
         unique_together = (
             ('internal_identifier', 'household_structure'),
             ('first_name', 'initials', 'household_structure'))
-        index_together = [['internal_identifier',
-                           'subject_identifier', 'created'], ]
+        index_together = [
+            ['internal_identifier', 'subject_identifier', 'created'],
+            ['household_structure', 'relation'],
+            ['subject_identifier', 'survey_schedule'],
+            ['survey_schedule', 'cloned']]
@@ -7,6 +7,10 @@ class MemberEligibilityModelMixin(models.Model):
 
     eligibility_helper_cls = EligibileMemberHelper
 
+    eligibility_fields = [
+        'cloned', 'study_resident', 'survival_status', 'subject_identifier',
+        'inability_to_participate', 'age_in_years']
+
     eligible_member = models.BooleanField(
         default=False,
         help_text='eligible to be screened. based on data on this form')
@@ -26,8 +30,12 @@ class MemberEligibilityModelMixin(models.Model):
         help_text="updated by enrollment loss save method only.")
 
     def save(self, *args, **kwargs):
-        eligibility_helper = self.eligibility_helper_cls(**self.__dict__)
-        self.eligible_member = eligibility_helper.is_eligible_member
+        """Recalculates `eligible_member` for new instances or if
+        any of the eligibility fields have changed.
+        """
+        if self.has_changed(*self.eligibility_fields):
+            eligibility_helper = self.eligibility_helper_cls(**self.__dict__)
+            self.eligible_member = eligibility_helper.is_eligible_member
         super().save(*args, **kwargs)
 
     class Meta:
@@ -2,6 +2,8 @@ from django.db import models
 
 from member.participation_status import ParticipationStatus
 
+from ...constants import AVAILABLE
+
 
 class MemberStatusModelMixin(models.Model):
 
@@ -33,6 +35,21 @@ class MemberStatusModelMixin(models.Model):
         default=False,
         help_text="Updated by the member moved")
 
+    participation = models.CharField(
+        max_length=25,
+        default=AVAILABLE,
+        editable=False,
+        db_index=True,
+        help_text=('updated by the member signals, the persisted value '
+                   'of participation_status'))
+
+    participation_final = models.BooleanField(
+        default=False,
+        editable=False,
+        db_index=True,
+        help_text=('updated by the member signals, the persisted value '
+                   'of participation_status.final'))
+
     @property
     def reported(self):
         return True if (
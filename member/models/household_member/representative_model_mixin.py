@@ -1,11 +1,10 @@
 from django.apps import apps as django_apps
-from django.core.exceptions import MultipleObjectsReturned
 from django.db import models
 
-from plot.utils import get_anonymous_plot
-
+from ...anonymous_plot import get_anonymous_plot_id
 from ...choices import RELATIONS
 from ...constants import HEAD_OF_HOUSEHOLD
+from ...enumeration_state import get_enumeration_state
 from ...exceptions import EnumerationRepresentativeError
 
 
@@ -19,6 +18,7 @@ class RepresentativeModelMixin(models.Model):
         max_length=35,
         choices=RELATIONS,
         null=True,
+        db_index=True,
         help_text="Relation to head of household")
 
     eligible_hoh = models.BooleanField(
@@ -28,46 +28,35 @@ class RepresentativeModelMixin(models.Model):
 
     def common_clean(self):
         # confirm RepresentativeEligibility exists ...
-        plot = get_anonymous_plot()
-        if self.household_structure.household.plot != plot:
-            try:
-                RepresentativeEligibility = django_apps.get_model(
-                    *'member.representativeeligibility'.split('.'))
-                RepresentativeEligibility.objects.get(
-                    household_structure=self.household_structure)
-            except RepresentativeEligibility.DoesNotExist:
+        if self.household_structure.household.plot_id != get_anonymous_plot_id():
+            enumeration_state = get_enumeration_state(self.household_structure_id)
+            if not enumeration_state.representative_eligibility:
                 if not self.cloned:
+                    RepresentativeEligibility = django_apps.get_model(
+                        *'member.representativeeligibility'.split('.'))
                     raise EnumerationRepresentativeError(
                         'Enumeration blocked. Please complete \'{}\' form first.'.format(
                             RepresentativeEligibility._meta.verbose_name))
-            try:
+            # hoh_id is None if there is no HoH or, though this
+            # condition should not occur, more than one
+            if (self.relation == HEAD_OF_HOUSEHOLD and enumeration_state.hoh_id
+                    and self.id != enumeration_state.hoh_id):
                 household_member = self.__class__.objects.get(
-                    household_structure=self.household_structure,
-                    relation=HEAD_OF_HOUSEHOLD)
-                if (self.relation == HEAD_OF_HOUSEHOLD
-                        and self.id != household_member.id):
-                    raise EnumerationRepresentativeError(
-                        '{} is already head of household.'.format(
-                            household_member.first_name), 'relation')
-            except self.__class__.DoesNotExist:
-                household_member = None
-            except MultipleObjectsReturned:
-                # this condition should not occur!
-                household_member = None
+                    pk=enumeration_state.hoh_id)
+                raise EnumerationRepresentativeError(
+                    '{} is already head of household.'.format(
+                        household_member.first_name), 'relation')
             # then expect HouseholdHeadEligibility to be added against
             # the member who has relation=HEAD_OF_HOUSEHOLD...
             # for all new instances
-            if household_member and not self.id:
-                try:
-                    HouseholdHeadEligibility = django_apps.get_model(
-                        *'member.householdheadeligibility'.split('.'))
-                    HouseholdHeadEligibility.objects.get(
-                        household_member=household_member)
-                except HouseholdHeadEligibility.DoesNotExist:
-                    raise EnumerationRepresentativeError(
-                        'Further enumeration blocked. Please complete '
-                        '\'{}\' form first.'.format(
-                            HouseholdHeadEligibility._meta.verbose_name))
+            if (enumeration_state.hoh_id and not self.id
+                    and not enumeration_state.hoh_eligibility):
+                HouseholdHeadEligibility = django_apps.get_model(
+                    *'member.householdheadeligibility'.split('.'))
+                raise EnumerationRepresentativeError(
+                    'Further enumeration blocked. Please complete '
+                    '\'{}\' form first.'.format(
+                        HouseholdHeadEligibility._meta.verbose_name))
         # if all OK, add members as you like ...
         super().common_clean()
 
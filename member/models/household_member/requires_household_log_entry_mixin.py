@@ -3,7 +3,8 @@ from django.db import models
 from edc_base.utils import get_utcnow
 
 from household.exceptions import HouseholdLogRequired
-from household.utils import todays_log_entry_or_raise
+
+from ...todays_log_entry import todays_log_entry_or_raise
 
 
 class RequiresHouseholdLogEntryMixin(models.Model):
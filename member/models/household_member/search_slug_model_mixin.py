@@ -5,12 +5,23 @@ class SearchSlugModelMixin(BaseSearchSlugModelMixin):
 
     def get_search_slug_fields(self):
         return [
-            'household_structure.household.household_identifier',
-            'household_structure.household.plot.plot_identifier',
-            'household_structure.household.plot.map_area',
+            'household_identifier',
+            'plot_identifier',
+            'map_area',
             'subject_identifier',
             'internal_identifier',
             'initials']
 
+    def save(self, *args, **kwargs):
+        """The slug fields are all on the member, so building the slug
+        needs no queries. If saving with update_fields, the slug is
+        written only if one of its fields is.
+        """
+        update_fields = kwargs.get('update_fields')
+        if (update_fields is not None and 'slug' not in update_fields
+                and set(update_fields) & set(self.get_search_slug_fields())):
+            kwargs.update(update_fields=list(update_fields) + ['slug'])
+        super().save(*args, **kwargs)
+
     class Meta:
         abstract = True
@@ -67,3 +67,4 @@ class MemberAppointment(HouseholdMemberModelMixin, BaseUuidModel):
     class Meta(HouseholdMemberModelMixin.Meta):
         app_label = 'member'
         unique_together = (('household_member', 'label'), )
+        index_together = [['label', 'appt_status', 'appt_date']]
@@ -0,0 +1,153 @@
+import json
+import threading
+
+from contextlib import contextmanager
+from uuid import UUID
+
+from django.apps import apps as django_apps
+from django.core import serializers
+from django.core.serializers.python import Deserializer as PythonDeserializer
+
+from .utils import chunks
+
+_local = threading.local()
+
+
+def normalize(natural_key):
+    """Returns the household member natural key, (internal_identifier,
+    survey_schedule, household_identifier, plot_identifier), as a
+    tuple of strings.
+    """
+    internal_identifier, *values = natural_key
+    try:
+        internal_identifier = str(UUID(str(internal_identifier)))
+    except ValueError:
+        internal_identifier = str(internal_identifier)
+    return tuple([internal_identifier] + [str(value) for value in values])
+
+
+def build_natural_key_index(natural_keys, chunk_size=None):
+    """Returns a tuple of ({natural key: pk}, complete) for the
+    household members of a batch of natural keys, with one query
+    per chunk.
+
+    `complete` is the set of internal identifiers whose members
+    were all indexed with their denormalised values set, so a key
+    for one of them that is not in the index does not exist.
+    """
+    HouseholdMember = django_apps.get_model('member', 'householdmember')
+    internal_identifiers = set()
+    for natural_key in natural_keys:
+        try:
+            internal_identifiers.add(UUID(str(natural_key[0])))
+        except ValueError:
+            pass
+    index = {}
+    complete = set(normalize([pk])[0] for pk in internal_identifiers)
+    for chunk in chunks(internal_identifiers, chunk_size or 500):
+        for pk, *natural_key in HouseholdMember.objects.filter(
+                internal_identifier__in=chunk).order_by().values_list(
+                    'pk', 'internal_identifier', 'survey_schedule',
+                    'household_identifier', 'plot_identifier'):
+            natural_key = normalize(natural_key)
+            if 'None' in natural_key[1:]:
+                # not yet backfilled, see reconcile_plot_fields
+                complete.discard(natural_key[0])
+            index[natural_key] = pk
+    return index, complete
+
+
+@contextmanager
+def natural_key_index(natural_keys):
+    """A context manager that resolves the given household member
+    natural keys to pks in one query for this thread, e.g. for a
+    batch of incoming sync transactions.
+
+    Used by the `get_by_natural_key` of HouseholdMember and the
+    member entry models. Keys not in the index are resolved by
+    query as usual unless the index is complete for the member,
+    see `is_indexed`. If already active, the outer index is extended.
+    """
+    previous = getattr(_local, 'index', None), getattr(_local, 'complete', None)
+    index, complete = build_natural_key_index(natural_keys)
+    _local.index = dict(previous[0] or {})
+    _local.index.update(index)
+    _local.complete = set(previous[1] or set()) | complete
+    try:
+        yield _local.index
+    finally:
+        _local.index, _local.complete = previous
+
+
+def get_indexed_pk(natural_key):
+    """Returns the pk of the household member or None if not within
+    `natural_key_index` or the key is not indexed.
+    """
+    index = getattr(_local, 'index', None)
+    if not index:
+        return None
+    return index.get(normalize(natural_key))
+
+
+def is_indexed(natural_key):
+    """Returns True if `natural_key_index` is active and complete for
+    the member of the natural key, in which case `get_indexed_pk`
+    is authoritative and a key not in the index does not exist.
+    """
+    complete = getattr(_local, 'complete', None)
+    if not complete:
+        return False
+    return normalize(natural_key)[0] in complete
+
+
+def index_household_member(household_member):
+    """Adds a saved household member to the active
+    `natural_key_index`, if any, so that a member saved within it
+    is resolved like one that existed when it was built.
+    """
+    index = getattr(_local, 'index', None)
+    if index is None:
+        return
+    natural_key = normalize([
+        household_member.internal_identifier,
+        household_member.survey_schedule,
+        household_member.household_identifier,
+        household_member.plot_identifier])
+    if 'None' in natural_key[1:]:
+        _local.complete.discard(natural_key[0])
+    index[natural_key] = household_member.pk
+
+
+def member_natural_keys(objects, fields=None):
+    """Returns the household member natural keys referenced by a
+    list of serialized objects in the python format.
+    """
+    fields = fields or ['household_member']
+    natural_keys = []
+    for obj in objects:
+        for field in fields:
+            value = obj.get('fields', {}).get(field)
+            if isinstance(value, (list, tuple)) and len(value) == 4:
+                natural_keys.append(value)
+    return natural_keys
+
+
+def deserialize(format, stream_or_string, **options):
+    """Returns a list of deserialized objects like
+    `django.core.serializers.deserialize` but with the household
+    member natural keys of the batch resolved in one query.
+
+    Only the json and python formats are indexed.
+    """
+    if format == 'json':
+        if not isinstance(stream_or_string, (bytes, str)):
+            stream_or_string = stream_or_string.read()
+        if isinstance(stream_or_string, bytes):
+            stream_or_string = stream_or_string.decode()
+        objects = json.loads(stream_or_string)
+    elif format == 'python':
+        objects = list(stream_or_string)
+    else:
+        return list(serializers.deserialize(format, stream_or_string, **options))
+    with natural_key_index(member_natural_keys(objects)):
+        return list(PythonDeserializer(objects, **options))
@@ -1,15 +1,40 @@
+from collections import OrderedDict
+
+from django.apps import apps as django_apps
 from django.core.exceptions import ObjectDoesNotExist
 
 from edc_constants.constants import CONSENTED
 
+from .consent_helper import attach_consents
 from .constants import (
     AVAILABLE, DECEASED, HTC_ELIGIBLE, ABSENT, UNDECIDED, ELIGIBLE,
     INELIGIBLE, REFUSED, REFUSED_HTC, MOVED)
+from .unit_of_work import get_unit_of_work
+from .utils import chunks, modified_options
+
+FINAL_STATUSES = [
+    CONSENTED, REFUSED, DECEASED, REFUSED_HTC, ELIGIBLE, INELIGIBLE]
 
 
 class ParticipationStatus:
 
-    def __init__(self, household_member):
+    chunk_size = 500
+
+    def __init__(self, household_member=None, participation_status=None):
+        if household_member is not None:
+            participation_status = self.get_participation_status(
+                household_member)
+        self.participation_status = participation_status or AVAILABLE
+        self.final = self.participation_status in FINAL_STATUSES
+
+    def get_display(self):
+        return ' '.join(self.participation_status.split('_')).lower().capitalize()
+
+    @staticmethod
+    def get_participation_status(household_member):
+        """Returns the participation status for a single household
+        member by walking its related reports.
+        """
         participation_status = None
         if household_member.is_consented:
             participation_status = CONSENTED
@@ -59,14 +84,133 @@ class ParticipationStatus:
                 if reports:
                     reports.sort(key=lambda x: x[1])
                     participation_status = reports[-1:][0][0]
-        self.participation_status = participation_status or AVAILABLE
-        if self.participation_status in [ABSENT, UNDECIDED, AVAILABLE, HTC_ELIGIBLE, None]:
-            self.final = False
-        elif self.participation_status in [
-                CONSENTED, REFUSED, DECEASED, REFUSED_HTC, ELIGIBLE, INELIGIBLE]:
-            self.final = True
-        else:
-            self.final = False
+        return participation_status
 
-    def get_display(self):
-        return ' '.join(self.participation_status.split('_')).lower().capitalize()
+    @classmethod
+    def for_members(cls, household_members):
+        """Returns an ordered dictionary of {pk: ParticipationStatus}
+        for a queryset or list of household members.
+
+        Resolves the same values as the per-member class but in a
+        constant number of queries (one per related model, chunked),
+        e.g. for all members of a household structure or map area.
+        """
+        if hasattr(household_members, 'select_related'):
+            household_members = household_members.select_related(
+                'household_structure__household')
+        household_members = attach_consents(
+            household_members, chunk_size=cls.chunk_size)
+        pks = [obj.pk for obj in household_members]
+        consented = {obj.pk for obj in household_members if obj.is_consented}
+        checklists = cls._values(
+            'member.enrollmentchecklist', pks, 'is_eligible')
+        deceased = cls._values('member.deceasedmember', pks)
+        htc = cls._values('member.htcmember', pks)
+        moved = cls._values('member.movedmember', pks)
+        refused = cls._values('member.refusedmember', pks)
+        reports = {}
+        for status, model in [(ABSENT, 'member.absentmember'),
+                              (UNDECIDED, 'member.undecidedmember')]:
+            for household_member_id, report_date in cls._values(
+                    model, pks, 'report_date', many=True):
+                reports.setdefault(household_member_id, []).append(
+                    (status, report_date))
+        participation_statuses = OrderedDict()
+        for obj in household_members:
+            participation_status = None
+            if obj.pk in consented:
+                participation_status = CONSENTED
+            elif obj.pk in checklists:
+                participation_status = (
+                    ELIGIBLE if checklists.get(obj.pk) else INELIGIBLE)
+            elif obj.pk in deceased:
+                participation_status = DECEASED
+            elif obj.pk in htc:
+                participation_status = HTC_ELIGIBLE
+            elif obj.pk in moved:
+                participation_status = MOVED
+            elif obj.pk in refused:
+                participation_status = REFUSED
+            elif reports.get(obj.pk):
+                participation_status = sorted(
+                    reports.get(obj.pk), key=lambda x: x[1])[-1][0]
+            participation_statuses[obj.pk] = cls(
+                participation_status=participation_status)
+        return participation_statuses
+
+    @classmethod
+    def _values(cls, model, pks, field=None, many=None):
+        """Returns a dictionary of {household_member_id: field value}
+        or, if `many`, a list of (household_member_id, field value)
+        ordered by the field.
+        """
+        model_cls = django_apps.get_model(*model.split('.'))
+        values = []
+        for chunk in chunks(pks, cls.chunk_size):
+            qs = model_cls.objects.filter(household_member_id__in=chunk)
+            if many:
+                qs = qs.order_by(field)
+            values.extend(qs.values_list(
+                'household_member_id', field or 'household_member_id'))
+        return values if many else dict(values)
+
+
+def update_participation(household_member):
+    """Updates the persisted participation fields of a household
+    member from a fresh ParticipationStatus.
+
+    Uses a queryset update so that history, sync transactions and
+    the post_save signals are not triggered again. Deferred to the
+    flush if within `unit_of_work`.
+    """
+    unit = get_unit_of_work()
+    if unit:
+        unit.defer_participation(household_member)
+        return
+    model_cls = household_member.__class__
+    participation_status = ParticipationStatus.for_members(
+        model_cls.objects.filter(pk=household_member.pk)).get(
+            household_member.pk, ParticipationStatus())
+    model_cls.objects.filter(pk=household_member.pk).exclude(
+        participation=participation_status.participation_status,
+        participation_final=participation_status.final).update(
+            participation=participation_status.participation_status,
+            participation_final=participation_status.final,
+            **modified_options())
+    household_member.participation = participation_status.participation_status
+    household_member.participation_final = participation_status.final
+
+
+def update_participations(household_members, chunk_size=None, dry_run=None):
+    """Updates the persisted participation fields for a queryset
+    of household members and returns a tuple of (checked, updated).
+
+    Statuses are resolved in bulk per chunk and written with one
+    update statement per (status, final) pair.
+    """
+    model_cls = household_members.model
+    chunk_size = chunk_size or ParticipationStatus.chunk_size
+    pks = household_members.order_by('pk').values_list('pk', flat=True)
+    checked = 0
+    updated = 0
+    for chunk in chunks(pks, chunk_size):
+        household_members = model_cls.objects.filter(pk__in=chunk)
+        participation_statuses = ParticipationStatus.for_members(
+            household_members)
+        changes = {}
+        for household_member in household_members:
+            participation_status = participation_statuses.get(household_member.pk)
+            if (household_member.participation != participation_status.participation_status
+                    or household_member.participation_final != participation_status.final):
+                changes.setdefault(
+                    (participation_status.participation_status,
+                     participation_status.final), []).append(household_member.pk)
+        for (participation, participation_final), changed in changes.items():
+            if not dry_run:
+                model_cls.objects.filter(pk__in=changed).update(
+                    participation=participation,
+                    participation_final=participation_final,
+                    **modified_options())
+            updated += len(changed)
+        checked += len(chunk)
+    return checked, updated
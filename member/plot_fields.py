@@ -0,0 +1,43 @@
+from edc_search.search_slug import SearchSlug
+
+from .utils import chunks, modified_options
+
+
+def reconcile_plot_fields(household_members, chunk_size=None, dry_run=None):
+    """Updates the denormalised plot_identifier and map_area of a
+    queryset of household members from their plot and returns a
+    tuple of (checked, updated).
+
+    Written with one update statement per (plot_identifier,
+    map_area) pair and chunk, bumping `modified` for the sync
+    exporter. The search slug is regenerated for members whose
+    values changed rather than were backfilled.
+    """
+    model_cls = household_members.model
+    chunk_size = chunk_size or 500
+    changes = {}
+    moved = []
+    checked = 0
+    for pk, plot_identifier, map_area, *values in household_members.order_by().values_list(
+            'pk', 'plot_identifier', 'map_area',
+            'household_structure__household__plot__plot_identifier',
+            'household_structure__household__plot__map_area').iterator():
+        checked += 1
+        if [plot_identifier, map_area] != values:
+            changes.setdefault(tuple(values), []).append(pk)
+            if plot_identifier is not None or map_area is not None:
+                moved.append(pk)
+    updated = sum(len(pks) for pks in changes.values())
+    if dry_run:
+        return checked, updated
+    for (plot_identifier, map_area), pks in changes.items():
+        for chunk in chunks(pks, chunk_size):
+            model_cls.objects.filter(pk__in=chunk).update(
+                plot_identifier=plot_identifier, map_area=map_area,
+                **modified_options())
+    for chunk in chunks(moved, chunk_size):
+        for obj in model_cls.objects.filter(pk__in=chunk):
+            model_cls.objects.filter(pk=obj.pk).update(
+                slug=SearchSlug(obj=obj, fields=obj.get_search_slug_fields()).slug,
+                **modified_options())
+    return checked, updated
@@ -1,147 +1,204 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from household.models import HouseholdLogEntry
+from plot.models import Plot
+
+from .anonymous_plot import clear_anonymous_plot_cache
+from .consent_helper import clear_consent_cache, get_consent_models
 from .constants import HEAD_OF_HOUSEHOLD
+from .enumeration_state import clear_enumeration_state
+from .natural_key_index import index_household_member
 from .models import (
     AbsentMember, EnrollmentChecklist, EnrollmentLoss,
-    HouseholdHeadEligibility, HouseholdMember,
-    RefusedMember, UndecidedMember, DeceasedMember, MovedMember)
+    HouseholdHeadEligibility, HouseholdMember, HtcMember,
+    RefusedMember, UndecidedMember, DeceasedMember, MovedMember,
+    RepresentativeEligibility)
+from .participation_status import update_participation, update_participations
+from .plot_fields import reconcile_plot_fields
+from .todays_log_entry import clear_todays_log_entry_cache
+from .unit_of_work import save_or_defer
+from .update_household_member import update_household_member
 from member.models.enrollment_checklist_anonymous import EnrollmentChecklistAnonymous
 from edc_constants.constants import NOT_APPLICABLE, NO
 
 
+# member fields that the participation status depends on
+participation_tracked_fields = [
+    'subject_identifier', 'report_datetime', 'household_structure_id',
+    'eligible_member', 'eligible_subject', 'enrollment_checklist_completed']
+
+
 @receiver(post_save, weak=False, sender=HouseholdMember,
           dispatch_uid="household_member_on_post_save")
 def household_member_on_post_save(sender, instance, raw, created, using, **kwargs):
-    """Updates enumerated, eligible_members on household structure.
+    """Updates enumerated, eligible_members on household structure
+    and, if a field it depends on changed, the persisted
+    participation status.
     """
+    clear_enumeration_state(instance.household_structure_id)
+    index_household_member(instance)
     if not raw:
         if created:
             if not instance.household_structure.enumerated:
                 instance.household_structure.enumerated = True
                 instance.household_structure.enumerated_datetime = instance.report_datetime
-                instance.household_structure.save()
+                save_or_defer(
+                    instance.household_structure,
+                    fields=['enumerated', 'enumerated_datetime'])
         if not instance.eligible_member:
             EnrollmentChecklist.objects.filter(
                 household_member=instance).delete()
         if instance.has_moved in [NO, NOT_APPLICABLE]:
             MovedMember.objects.filter(
                 household_member=instance).delete()
+        # update_fields is given for the flag updates of the member signals
+        if (created or kwargs.get('update_fields')
+                or instance.has_changed(*participation_tracked_fields)):
+            update_participation(instance)
 
 
 @receiver(post_delete, weak=False, sender=HouseholdMember,
           dispatch_uid="household_member_on_post_delete")
 def household_member_on_post_delete(sender, instance, using, **kwargs):
+    clear_enumeration_state(instance.household_structure_id)
     if not instance.household_structure.householdmember_set.exclude(
             id=instance.id).exists():
         instance.household_structure.enumerated = False
         instance.household_structure.enumerated_datetime = None
-        instance.household_structure.save()
+        save_or_defer(
+            instance.household_structure,
+            fields=['enumerated', 'enumerated_datetime'])
 
 
 @receiver(post_save, weak=False, sender=HouseholdHeadEligibility,
           dispatch_uid='household_head_eligibility_on_post_save')
 def household_head_eligibility_on_post_save(
         sender, instance, raw, created, using, **kwargs):
+    clear_enumeration_state(instance.household_member.household_structure_id)
     if not raw:
         if instance.household_member.relation == HEAD_OF_HOUSEHOLD:
-            instance.household_member.eligible_hoh = True
-            instance.household_member.save()
+            update_household_member(
+                instance.household_member, eligible_hoh=True)
+
+
+@receiver(post_delete, weak=False, sender=HouseholdHeadEligibility,
+          dispatch_uid='household_head_eligibility_on_post_delete')
+def household_head_eligibility_on_post_delete(sender, instance, using, **kwargs):
+    clear_enumeration_state(instance.household_member.household_structure_id)
+
+
+@receiver(post_save, weak=False, sender=RepresentativeEligibility,
+          dispatch_uid='representative_eligibility_on_post_save')
+def representative_eligibility_on_post_save(
+        sender, instance, raw, created, using, **kwargs):
+    clear_enumeration_state(instance.household_structure_id)
+
+
+@receiver(post_delete, weak=False, sender=RepresentativeEligibility,
+          dispatch_uid='representative_eligibility_on_post_delete')
+def representative_eligibility_on_post_delete(sender, instance, using, **kwargs):
+    clear_enumeration_state(instance.household_structure_id)
 
 
 @receiver(post_save, weak=False, sender=EnrollmentLoss,
           dispatch_uid="enrollment_loss_on_post_save")
 def enrollment_loss_on_post_save(sender, instance, raw, created, using, **kwargs):
     if not raw:
-        instance.household_member.enrollment_loss_completed = True
-        instance.household_member.save()
+        update_household_member(
+            instance.household_member, enrollment_loss_completed=True)
 
 
 @receiver(post_delete, weak=False, sender=EnrollmentLoss,
           dispatch_uid="enrollment_loss_on_post_delete")
 def enrollment_loss_on_post_delete(sender, instance, using, **kwargs):
-    instance.household_member.enrollment_loss_completed = False
-    instance.household_member.save()
+    update_household_member(
+        instance.household_member, enrollment_loss_completed=False)
 
 
 @receiver(post_save, weak=False, sender=AbsentMember,
           dispatch_uid="absent_member_on_post_save")
 def absent_member_on_post_save(sender, instance, raw, created, using, **kwargs):
     if not raw:
-        if created:
-            instance.household_member.visit_attempts += 1
-        instance.household_member.absent = True
-        instance.household_member.save()
+        update_household_member(
+            instance.household_member,
+            visit_attempts=1 if created else None,
+            absent=True)
 
 
 @receiver(post_delete, weak=False, sender=AbsentMember,
           dispatch_uid="absent_member_on_post_delete")
 def absent_member_on_post_delete(sender, instance, using, **kwargs):
-    instance.household_member.visit_attempts -= 1
-    if instance.household_member.visit_attempts < 0:
-        instance.household_member.visit_attempts = 0
-    if instance.household_member.absentmember_set.all().count() == 0:
-        instance.household_member.absent = False
-    instance.household_member.save()
+    flags = {}
+    if not instance.household_member.absentmember_set.exists():
+        flags.update(absent=False)
+    update_household_member(
+        instance.household_member, visit_attempts=-1, **flags)
 
 
 @receiver(post_save, weak=False, sender=UndecidedMember,
           dispatch_uid="undecided_member_on_post_save")
 def undecided_member_on_post_save(sender, instance, raw, created, using, **kwargs):
     if not raw:
-        if created:
-            instance.household_member.visit_attempts += 1
-        instance.household_member.undecided = True
-        instance.household_member.save()
+        update_household_member(
+            instance.household_member,
+            visit_attempts=1 if created else None,
+            undecided=True)
 
 
-@receiver(post_delete, weak=False, sender=AbsentMember,
+@receiver(post_delete, weak=False, sender=UndecidedMember,
           dispatch_uid="undecided_member_on_post_delete")
 def undecided_member_on_post_delete(sender, instance, using, **kwargs):
-    instance.household_member.visit_attempts -= 1
-    if instance.household_member.visit_attempts < 0:
-        instance.household_member.visit_attempts = 0
-    if instance.household_member.undecidedmember_set.all().count() == 0:
-        instance.household_member.undecided = False
-    instance.household_member.save()
+    flags = {}
+    if not instance.household_member.undecidedmember_set.exists():
+        flags.update(undecided=False)
+    update_household_member(
+        instance.household_member, visit_attempts=-1, **flags)
 
 
 @receiver(post_delete, weak=False, sender=RefusedMember,
           dispatch_uid="refused_member_on_post_delete")
 def refused_member_on_post_delete(sender, instance, using, **kwargs):
-    instance.household_member.visit_attempts -= 1
-    if instance.household_member.visit_attempts < 0:
-        instance.household_member.visit_attempts = 0
-    instance.household_member.refused = False
-    instance.household_member.save()
+    update_household_member(
+        instance.household_member, visit_attempts=-1, refused=False)
 
 
 @receiver(post_save, weak=False, sender=RefusedMember,
           dispatch_uid="refused_member_on_post_save")
 def refused_member_on_post_save(sender, instance, raw, created, using, **kwargs):
     if not raw:
-        if created:
-            instance.household_member.visit_attempts += 1
-        instance.household_member.refused = True
-        instance.household_member.save()
+        update_household_member(
+            instance.household_member,
+            visit_attempts=1 if created else None,
+            refused=True)
 
 
 @receiver(post_delete, weak=False, sender=DeceasedMember,
           dispatch_uid="deceased_member_on_post_delete")
 def deceased_member_on_post_delete(sender, instance, using, **kwargs):
-    instance.household_member.visit_attempts -= 1
-    if instance.household_member.visit_attempts < 0:
-        instance.household_member.visit_attempts = 0
-    instance.household_member.save()
+    update_household_member(instance.household_member, visit_attempts=-1)
 
 
 @receiver(post_save, weak=False, sender=DeceasedMember,
           dispatch_uid="deceased_member_on_post_save")
 def deceased_member_on_post_save(sender, instance, raw, created, using, **kwargs):
     if not raw:
-        if created:
-            instance.household_member.visit_attempts += 1
-        instance.household_member.save()
+        update_household_member(
+            instance.household_member,
+            visit_attempts=1 if created else None)
+
+
+@receiver(post_save, weak=False, sender=HtcMember,
+          dispatch_uid="htc_member_on_post_save")
+def htc_member_on_post_save(sender, instance, raw, created, using, **kwargs):
+    if not raw:
+        update_participation(instance.household_member)
+
+
+@receiver(post_delete, weak=False, sender=HtcMember,
+          dispatch_uid="htc_member_on_post_delete")
+def htc_member_on_post_delete(sender, instance, using, **kwargs):
+    update_participation(instance.household_member)
 
 
 @receiver(post_save, weak=False, sender=MovedMember,
@@ -149,19 +206,17 @@ def deceased_member_on_post_save(sender, instance, raw, created, using, **kwargs
 def moved_member_on_post_save(sender, instance, raw, created, using, **kwargs):
     if not raw:
         if created:
-            instance.household_member.visit_attempts += 1
-            instance.household_member.moved = True
-        instance.household_member.save()
+            update_household_member(
+                instance.household_member, visit_attempts=1, moved=True)
+        else:
+            update_household_member(instance.household_member)
 
 
 @receiver(post_delete, weak=False, sender=MovedMember,
           dispatch_uid="moved_member_on_post_delete")
 def moved_member_on_post_delete(sender, instance, using, **kwargs):
-    instance.household_member.visit_attempts -= 1
-    if instance.household_member.visit_attempts < 0:
-        instance.household_member.visit_attempts = 0
-        instance.household_member.moved = False
-    instance.household_member.save()
+    update_household_member(
+        instance.household_member, visit_attempts=-1, moved=False)
 
 
 @receiver(post_save, weak=False, dispatch_uid="enrollment_checklist_on_post_save")
@@ -191,4 +246,66 @@ def enrollment_checklist_on_post_save(
                     household_member=instance.household_member).delete()
                 instance.household_member.eligible_subject = True
             instance.household_member.enrollment_checklist_completed = True
-            instance.household_member.save()
+            if save_or_defer(
+                    instance.household_member,
+                    fields=['eligible_subject', 'enrollment_checklist_completed']):
+                # the deferred save sees no changed fields
+                update_participation(instance.household_member)
+
+
+@receiver(post_delete, weak=False, sender=EnrollmentChecklist,
+          dispatch_uid="enrollment_checklist_on_post_delete")
+def enrollment_checklist_on_post_delete(sender, instance, using, **kwargs):
+    update_participation(instance.household_member)
+
+
+@receiver(post_save, weak=False, sender=Plot,
+          dispatch_uid="plot_on_post_save")
+def plot_on_post_save(sender, instance, raw, created, using, **kwargs):
+    """Reconciles the members' copies of the plot fields, also for
+    raw saves, e.g. sync deserialization, so they do not drift on
+    synced machines.
+    """
+    clear_anonymous_plot_cache()
+    if not created:
+        reconcile_plot_fields(HouseholdMember.objects.filter(
+            household_structure__household__plot=instance))
+
+
+@receiver(post_delete, weak=False, sender=Plot,
+          dispatch_uid="plot_on_post_delete")
+def plot_on_post_delete(sender, instance, using, **kwargs):
+    clear_anonymous_plot_cache()
+
+
+@receiver(post_save, weak=False, sender=HouseholdLogEntry,
+          dispatch_uid="household_log_entry_on_post_save")
+def household_log_entry_on_post_save(sender, instance, raw, created, using, **kwargs):
+    clear_todays_log_entry_cache()
+
+
+@receiver(post_delete, weak=False, sender=HouseholdLogEntry,
+          dispatch_uid="household_log_entry_on_post_delete")
+def household_log_entry_on_post_delete(sender, instance, using, **kwargs):
+    clear_todays_log_entry_cache()
+
+
+@receiver(post_save, weak=False, dispatch_uid="consent_on_post_save")
+def consent_on_post_save(sender, instance, raw, created, using, **kwargs):
+    """Clears the consents resolved on member instances and
+    updates the persisted participation status of the members of
+    a consent saved in the consent app.
+    """
+    if sender in get_consent_models():
+        clear_consent_cache()
+        if not raw:
+            update_participations(HouseholdMember.objects.filter(
+                subject_identifier=instance.subject_identifier))
+
+
+@receiver(post_delete, weak=False, dispatch_uid="consent_on_post_delete")
+def consent_on_post_delete(sender, instance, using, **kwargs):
+    if sender in get_consent_models():
+        clear_consent_cache()
+        update_participations(HouseholdMember.objects.filter(
+            subject_identifier=instance.subject_identifier))
@@ -0,0 +1,199 @@
+import gzip
+import json
+import os
+
+from django.apps import apps as django_apps
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from edc_base.model_mixins import ListModelMixin
+
+from .natural_key_index import deserialize
+
+
+def get_sync_models():
+    """Returns the member models registered for sync, see
+    `sync_models`, ordered so that dependencies come first.
+    """
+    app_config = django_apps.get_app_config('member')
+    models = [model for model in app_config.get_models()
+              if not issubclass(model, ListModelMixin)]
+    return serializers.sort_dependencies([(app_config, models)])
+
+
+def get_map_area_lookup(model_cls):
+    """Returns the lookup that scopes the model to a map area or
+    None.
+    """
+    names = [field.name for field in model_cls._meta.get_fields()]
+    if 'map_area' in names:
+        return 'map_area'
+    elif 'household_member' in names:
+        return 'household_member__map_area'
+    elif 'household_structure' in names:
+        return 'household_structure__household__plot__map_area'
+    return None
+
+
+def get_historical_model(model_cls):
+    """Returns the historical model of the model or None.
+    """
+    try:
+        return model_cls.history.model
+    except AttributeError:
+        return None
+
+
+class MemberSyncExporter:
+    """Exports member model rows changed since a high-water mark
+    in batches, as an alternative to one outgoing transaction per
+    save.
+
+    Rows are read in (modified, pk) order with a keyset cursor per
+    model that advances after each batch, so repeated updates of an
+    instance are exported once, as its current state. If `map_area`
+    is given, only rows of that map area are exported and models
+    that cannot be scoped to a map area are skipped.
+
+    Deletions are exported as the pks of the historical records
+    with history_type '-', with a cursor on (history_date, pk), so
+    rows deleted by a bulk or queryset delete also reach the server.
+    """
+
+    def __init__(self, map_area=None, models=None, batch_size=None, cursors=None):
+        self.map_area = map_area
+        self.models = models or get_sync_models()
+        self.batch_size = batch_size or 500
+        self.cursors = dict(cursors or {})
+        self.exported = 0
+        self.deleted = 0
+
+    def get_queryset(self, model_cls):
+        queryset = model_cls._default_manager.all()
+        if self.map_area:
+            queryset = queryset.filter(**{
+                get_map_area_lookup(model_cls): self.map_area})
+        cursor = self.cursors.get(model_cls._meta.label_lower)
+        if cursor:
+            modified, pk = parse_datetime(cursor[0]), cursor[1]
+            queryset = queryset.filter(
+                Q(modified__gt=modified) | Q(modified=modified, pk__gt=pk))
+        return queryset.order_by('modified', 'pk')
+
+    def batches(self, model_cls):
+        """Yields lists of changed rows of the model, advancing its
+        cursor after each batch.
+        """
+        if self.map_area and not get_map_area_lookup(model_cls):
+            return
+        while True:
+            rows = list(self.get_queryset(model_cls)[:self.batch_size])
+            if not rows:
+                break
+            self.cursors[model_cls._meta.label_lower] = [
+                rows[-1].modified.isoformat(), str(rows[-1].pk)]
+            yield rows
+            if len(rows) < self.batch_size:
+                break
+
+    def deleted_batches(self, model_cls):
+        """Yields lists of the pks of rows of the model deleted since
+        its deletion cursor, advancing the cursor after each batch.
+
+        Not scoped to a map area since the row is gone; deleting a
+        pk the server does not have is a no-op.
+        """
+        historical_model = get_historical_model(model_cls)
+        if not historical_model or (self.map_area and not get_map_area_lookup(model_cls)):
+            return
+        label_lower = f'{model_cls._meta.label_lower}.deleted'
+        pk_attname = model_cls._meta.pk.attname
+        while True:
+            queryset = historical_model._default_manager.filter(history_type='-')
+            cursor = self.cursors.get(label_lower)
+            if cursor:
+                history_date, pk = parse_datetime(cursor[0]), cursor[1]
+                queryset = queryset.filter(
+                    Q(history_date__gt=history_date) | Q(history_date=history_date, pk__gt=pk))
+            rows = list(queryset.order_by('history_date', 'pk').values_list(
+                'history_date', 'pk', pk_attname)[:self.batch_size])
+            if not rows:
+                break
+            self.cursors[label_lower] = [rows[-1][0].isoformat(), str(rows[-1][1])]
+            pks = set(row[2] for row in rows)
+            # deleted and then saved again with the same pk
+            pks -= set(model_cls._default_manager.filter(
+                pk__in=pks).values_list('pk', flat=True))
+            if pks:
+                yield [str(pk) for pk in pks]
+            if len(rows) < self.batch_size:
+                break
+
+    def export_deletions(self):
+        """Yields (label_lower, deleted pks) per batch, dependent
+        models first.
+        """
+        for model_cls in reversed(self.models):
+            for pks in self.deleted_batches(model_cls):
+                self.deleted += len(pks)
+                yield model_cls._meta.label_lower, pks
+
+    def export(self):
+        """Yields (label_lower, serialized objects) per batch in the
+        python format with natural foreign keys.
+        """
+        for model_cls in self.models:
+            for rows in self.batches(model_cls):
+                self.exported += len(rows)
+                yield model_cls._meta.label_lower, serializers.serialize(
+                    'python', rows, use_natural_foreign_keys=True)
+
+    def export_to_file(self, path):
+        """Writes the export to a gzip compressed file, one JSON line
+        per batch, the deletions last, and returns the number of rows
+        exported and deleted.
+        """
+        with gzip.open(path, 'wt') as f:
+            for label_lower, objects in self.export():
+                f.write(json.dumps(
+                    dict(model=label_lower, objects=objects), cls=DjangoJSONEncoder))
+                f.write('\n')
+            for label_lower, pks in self.export_deletions():
+                f.write(json.dumps(dict(model=label_lower, deleted=pks)))
+                f.write('\n')
+        return self.exported + self.deleted
+
+    def read_cursors(self, checkpoint_path):
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                self.cursors.update(json.load(f).get('cursors', {}))
+
+    def write_cursors(self, checkpoint_path):
+        if checkpoint_path:
+            with open(checkpoint_path, 'w') as f:
+                json.dump(dict(map_area=self.map_area, cursors=self.cursors), f)
+
+
+def import_sync_file(path):
+    """Saves and deletes the rows of a file written by
+    `export_to_file`, one transaction per batch, and returns the
+    number of rows saved or deleted.
+    """
+    imported = 0
+    with gzip.open(path, 'rt') as f:
+        for line in f:
+            batch = json.loads(line)
+            with transaction.atomic():
+                if 'deleted' in batch:
+                    model_cls = django_apps.get_model(batch.get('model'))
+                    _, deleted = model_cls._default_manager.filter(
+                        pk__in=batch.get('deleted')).delete()
+                    imported += deleted.get(model_cls._meta.label, 0)
+                else:
+                    for obj in deserialize('python', batch.get('objects')):
+                        obj.save()
+                        imported += 1
+    return imported
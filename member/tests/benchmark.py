@@ -0,0 +1,78 @@
+import json
+import os
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baselines.json')
+
+
+class Benchmark:
+    """Measures the queries and wall time of named operations and
+    compares them to stored baselines.
+
+    A baseline's `queries` is a budget; a measurement regresses if
+    it runs more queries. If the baseline has `seconds`, the
+    measurement also regresses if it takes longer than
+    `time_tolerance` times those seconds (ignored for baselines
+    under `min_seconds`). Measurements without a baseline, e.g.
+    for a non-default community size, are not compared. Set the
+    environment variable MEMBER_BENCHMARK_UPDATE=1 to write the
+    results as the new baselines.
+    """
+
+    time_tolerance = 3.0
+    min_seconds = 0.05
+
+    def __init__(self, baselines_path=None):
+        self.baselines_path = baselines_path or BASELINES_PATH
+        self.results = {}
+        try:
+            with open(self.baselines_path) as f:
+                self.baselines = json.load(f)
+        except FileNotFoundError:
+            self.baselines = {}
+
+    def measure(self, name, func, *args, **kwargs):
+        """Calls func and records (queries, seconds) as `name`.
+        """
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+        self.results[name] = dict(
+            queries=len(context.captured_queries), seconds=round(seconds, 4))
+        return result
+
+    @property
+    def regressions(self):
+        """Returns a list of messages, one per measurement that
+        regressed against its baseline.
+        """
+        regressions = []
+        for name, result in self.results.items():
+            baseline = self.baselines.get(name)
+            if not baseline:
+                continue
+            if result.get('queries') > baseline.get('queries'):
+                regressions.append(
+                    f'{name}: {result.get("queries")} queries, '
+                    f'baseline {baseline.get("queries")}')
+            if (baseline.get('seconds', 0) >= self.min_seconds
+                    and result.get('seconds') > baseline.get('seconds') * self.time_tolerance):
+                regressions.append(
+                    f'{name}: {result.get("seconds")}s, '
+                    f'baseline {baseline.get("seconds")}s')
+        return regressions
+
+    def write_baselines(self):
+        baselines = dict(self.baselines)
+        baselines.update(self.results)
+        with open(self.baselines_path, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+
+    def report(self):
+        return '\n'.join(
+            f'{name}: {result.get("queries")} queries, {result.get("seconds")}s'
+            for name, result in sorted(self.results.items()))
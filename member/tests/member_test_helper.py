@@ -13,6 +13,7 @@ from household.models import HouseholdStructure
 from household.tests import HouseholdTestHelper
 from survey.site_surveys import site_surveys
 
+from ..community_generator import CommunityGenerator
 from ..constants import HEAD_OF_HOUSEHOLD, ABLE_TO_PARTICIPATE
 from ..models import HouseholdMember, EnrollmentChecklist
 
@@ -307,3 +308,26 @@ class MemberTestHelper:
             'member.htcmember',
             household_member=household_member, **options)
         return HouseholdMember.objects.get(pk=household_member.pk)
+
+    def make_community(self, households=None, members_per_household=None,
+                       survey_schedule=None, **options):
+        """Returns a queryset of household structures populated in
+        bulk by the CommunityGenerator.
+
+        Household structures are made one by one by the household
+        test helper since the plot and household apps create them,
+        with their identifiers and logs, in save() and post_save
+        signals (see CommunityGenerator); everything else is bulk
+        created.
+        """
+        report_datetime = options.pop(
+            'report_datetime', site_surveys.get_survey_schedules()[0].start)
+        pks = [self.household_helper.make_household_structure(
+            survey_schedule=survey_schedule, attempts=1,
+            report_datetime=report_datetime).pk for _ in range(households or 1)]
+        household_structures = HouseholdStructure.objects.filter(pk__in=pks)
+        CommunityGenerator(
+            household_structures=household_structures,
+            members_per_household=members_per_household,
+            report_datetime=report_datetime, **options).generate()
+        return household_structures
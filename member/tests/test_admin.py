@@ -0,0 +1,93 @@
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('admin')
+class TestHouseholdMemberAdmin(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        User.objects.create_superuser('erik', 'erik@example.com', 'pass')
+        self.client.login(username='erik', password='pass')
+        self.url = reverse('member_admin:member_householdmember_changelist')
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_changelist_queries_constant(self):
+        self.member_helper.make_community(households=1, members_per_household=2)
+        queries = self.changelist_queries()
+        self.member_helper.make_community(households=3, members_per_household=4)
+        self.assertEqual(self.changelist_queries(), queries)
+
+    def test_changelist_reported(self):
+        household_structure = self.member_helper.make_community(
+            households=1, members_per_household=2, absent_ratio=1).first()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        household_member = household_structure.householdmember_set.get(absent=True)
+        self.assertTrue(response.context['cl'].queryset.get(
+            pk=household_member.pk).is_reported)
+
+    def test_search_by_identifiers(self):
+        household_structure = self.member_helper.make_community(
+            households=2, members_per_household=2).first()
+        household_member = household_structure.householdmember_set.first()
+        household = household_structure.household
+        for term in [household.household_identifier,
+                     household.plot.plot_identifier,
+                     household_member.subject_identifier,
+                     str(household_member.internal_identifier)]:
+            with self.subTest(term=term):
+                response = self.client.get(self.url, {'q': term})
+                self.assertIn(
+                    household_member.pk,
+                    [obj.pk for obj in response.context['cl'].result_list])
+        response = self.client.get(self.url, {'q': household.household_identifier})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_search_ignores_first_name(self):
+        household_structure = self.member_helper.make_community(
+            households=1, members_per_household=1).first()
+        household_member = household_structure.householdmember_set.first()
+        response = self.client.get(self.url, {'q': household_member.first_name})
+        self.assertEqual(response.context['cl'].result_count, 0)
+
+    def test_search_by_initials_relation_and_ids(self):
+        household_structure = self.member_helper.make_community(
+            households=2, members_per_household=2).first()
+        household_member = household_structure.householdmember_set.exclude(
+            relation=None).first()
+        household = household_structure.household
+        for term in [household_member.initials.lower(),
+                     household_member.relation,
+                     str(household_structure.id),
+                     str(household.id),
+                     str(household.plot.id)]:
+            with self.subTest(term=term):
+                response = self.client.get(self.url, {'q': term})
+                self.assertIn(
+                    household_member.pk,
+                    [obj.pk for obj in response.context['cl'].result_list])
+        response = self.client.get(self.url, {'q': str(household_structure.id)})
+        self.assertEqual(response.context['cl'].result_count, 2)
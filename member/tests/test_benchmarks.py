@@ -0,0 +1,209 @@
+import csv
+import os
+import tempfile
+
+from io import StringIO
+
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, tag
+from django.urls.base import reverse
+
+from edc_base.utils import get_utcnow
+from edc_constants.constants import YES
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from .. import signals
+from ..forms import HouseholdMemberForm, RepresentativeEligibilityForm
+from ..management.commands.delete_wrong_members import (
+    bulk_delete_household_members, member_dependent_models)
+from ..management.commands.load_member_data import MemberDataImporter
+from ..management.commands.update_registration_identifier import (
+    get_registration_identifiers, update_registration_identifiers)
+from ..models import (
+    AbsentMember, DeceasedMember, EnrollmentChecklist, HouseholdMember,
+    MovedMember, RefusedMember, UndecidedMember)
+from ..participation_status import ParticipationStatus
+from .benchmark import Benchmark
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+HOUSEHOLDS = int(os.environ.get('MEMBER_BENCHMARK_HOUSEHOLDS', 2))
+# at least 6 members in total, see test_signal_receivers
+MEMBERS = int(os.environ.get('MEMBER_BENCHMARK_MEMBERS', 3))
+
+
+@tag('benchmark')
+class TestBenchmarks(TestCase):
+
+    """Measures queries and wall time against the stored baselines
+    in benchmark_baselines.json, recorded for the default community
+    size, e.g.:
+
+        python manage.py test member.tests.test_benchmarks --tag=benchmark
+
+    The community size is set with the environment variables
+    MEMBER_BENCHMARK_HOUSEHOLDS and MEMBER_BENCHMARK_MEMBERS. Record
+    the baselines, queries and seconds, from a run at the default
+    size with MEMBER_BENCHMARK_UPDATE=1.
+    """
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.benchmark = Benchmark()
+        household_structures = self.member_helper.make_community(
+            households=HOUSEHOLDS, members_per_household=MEMBERS, absent_ratio=0)
+        self.household_members = list(HouseholdMember.objects.filter(
+            household_structure__in=household_structures).order_by('created'))
+        self.household_member = self.household_members[0]
+
+    def tearDown(self):
+        if os.environ.get('MEMBER_BENCHMARK_UPDATE'):
+            self.benchmark.write_baselines()
+
+    def assertNoRegressions(self):
+        self.assertEqual(self.benchmark.regressions, [], self.benchmark.report())
+
+    def measure(self, name, func, *args, **kwargs):
+        return self.benchmark.measure(
+            f'{name}[{HOUSEHOLDS}x{MEMBERS}]', func, *args, **kwargs)
+
+    def test_household_member_save(self):
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        self.measure('household_member.save', household_member.save)
+        household_member.visit_attempts += 1
+        self.measure('household_member.save.flags', household_member.save)
+        self.assertNoRegressions()
+        # the flag-only fast path never runs more queries than a full save
+        self.assertLessEqual(
+            self.benchmark.results[f'household_member.save.flags[{HOUSEHOLDS}x{MEMBERS}]'].get(
+                'queries'),
+            self.benchmark.results[f'household_member.save[{HOUSEHOLDS}x{MEMBERS}]'].get(
+                'queries'))
+
+    def test_signal_receivers(self):
+        absent, undecided, refused, moved, deceased = self.household_members[1:6]
+        self.member_helper.make_absent_member(absent)
+        self.member_helper.make_undecided_member(undecided)
+        self.member_helper.make_refused_member(refused)
+        self.member_helper.make_moved_member(moved)
+        self.member_helper.make_deceased_member(deceased)
+        receivers = [
+            (signals.household_member_on_post_save, self.household_member),
+            (signals.absent_member_on_post_save,
+             AbsentMember.objects.filter(household_member=absent).first()),
+            (signals.undecided_member_on_post_save,
+             UndecidedMember.objects.filter(household_member=undecided).first()),
+            (signals.refused_member_on_post_save,
+             RefusedMember.objects.get(household_member=refused)),
+            (signals.moved_member_on_post_save,
+             MovedMember.objects.get(household_member=moved)),
+            (signals.deceased_member_on_post_save,
+             DeceasedMember.objects.get(household_member=deceased)),
+            (signals.enrollment_checklist_on_post_save,
+             EnrollmentChecklist.objects.get(household_member=self.household_member))]
+        for receiver, instance in receivers:
+            self.measure(
+                f'signals.{receiver.__name__}', receiver,
+                sender=instance.__class__, instance=instance, raw=False,
+                created=False, using='default')
+        self.assertNoRegressions()
+
+    def test_participation_status(self):
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        self.measure(
+            'participation_status.single', ParticipationStatus, household_member)
+        self.measure(
+            'participation_status.for_members', ParticipationStatus.for_members,
+            HouseholdMember.objects.all())
+        self.assertNoRegressions()
+
+    def test_enrollment_checklist_save(self):
+        enrollment_checklist = EnrollmentChecklist.objects.get(
+            household_member=self.household_member)
+        self.measure('enrollment_checklist.save', enrollment_checklist.save)
+        self.assertNoRegressions()
+
+    def test_admin_changelist(self):
+        User.objects.create_superuser('benchmark', 'benchmark@example.com', 'pass')
+        self.client.login(username='benchmark', password='pass')
+        url = reverse('member_admin:member_householdmember_changelist')
+        response = self.measure('admin.householdmember_changelist', self.client.get, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoRegressions()
+
+    def test_admin_change_form(self):
+        User.objects.create_superuser('benchmark', 'benchmark@example.com', 'pass')
+        self.client.login(username='benchmark', password='pass')
+        url = reverse(
+            'member_admin:member_householdmember_change',
+            args=(self.household_member.pk, ))
+        response = self.measure('admin.householdmember_change', self.client.get, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoRegressions()
+
+    def test_forms(self):
+        household_structure = self.household_member.household_structure
+        form = RepresentativeEligibilityForm(data={
+            'household_structure': household_structure.pk,
+            'report_datetime': get_utcnow(),
+            'aged_over_18': YES,
+            'household_residency': YES,
+            'verbal_script': YES})
+        self.measure('form.representative_eligibility', form.is_valid)
+        form = HouseholdMemberForm(
+            data={'household_structure': household_structure.pk},
+            instance=HouseholdMember.objects.get(pk=self.household_member.pk))
+        self.measure('form.household_member', form.is_valid)
+        self.assertNoRegressions()
+
+    def test_natural_key(self):
+        natural_key = self.household_member.natural_key()
+        self.measure(
+            'natural_key.householdmember',
+            HouseholdMember.objects.get_by_natural_key, *natural_key)
+        self.assertNoRegressions()
+
+    def test_management_commands(self):
+        """Measures the commands, or the functions they call where
+        the command needs data or apps the tests do not have.
+        """
+        for command in ['update_participation_status', 'evaluate_enrollment_checklists']:
+            self.measure(
+                f'command.{command}', call_command, command, stdout=StringIO())
+        self.measure(
+            'command.update_registration_identifier', update_registration_identifiers,
+            get_registration_identifiers(
+                map_area=self.household_member.map_area,
+                plot_identifiers=[obj.plot_identifier for obj in self.household_members]))
+        tmpdir = tempfile.mkdtemp()
+        file_path = os.path.join(tmpdir, 'moved.csv')
+        with open(file_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ['', 'id', 'user_created', 'subject_identifier', 'time_point',
+                 'new_community'])
+            for i, household_member in enumerate(self.household_members):
+                writer.writerow(
+                    [i, i, 'benchmark', household_member.subject_identifier, 'T1',
+                     'Digawana, Ranaka'])
+        importer = MemberDataImporter(model_cls=MovedMember)
+        importer.survey_schedules = {
+            'T1': self.household_member.survey_schedule_object.short_name}
+        self.measure('command.load_member_data', importer.import_file, file_path)
+        os.remove(file_path)
+        os.rmdir(tmpdir)
+        self.measure(
+            'command.delete_wrong_members', bulk_delete_household_members,
+            [obj.pk for obj in self.household_members],
+            dependent_models=member_dependent_models)
+        self.assertNoRegressions()
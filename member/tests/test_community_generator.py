@@ -0,0 +1,82 @@
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from household.models import HouseholdStructure
+from survey.site_surveys import site_surveys
+from survey.tests import SurveyTestHelper
+
+from ..community_generator import CommunityGenerator
+from ..constants import ELIGIBLE, HEAD_OF_HOUSEHOLD, ABSENT
+from ..models import (
+    AbsentMember, EnrollmentChecklist, HouseholdHeadEligibility, HouseholdMember)
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+class SameNameCommunityGenerator(CommunityGenerator):
+
+    def new_first_name(self, gender):
+        return 'ANNA'
+
+
+@tag('community_generator')
+class TestCommunityGenerator(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+
+    def test_make_community(self):
+        household_structures = self.member_helper.make_community(
+            households=2, members_per_household=4, absent_ratio=0)
+        household_members = HouseholdMember.objects.filter(
+            household_structure__in=household_structures)
+        self.assertEqual(household_members.count(), 8)
+        self.assertEqual(
+            household_members.filter(relation=HEAD_OF_HOUSEHOLD).count(), 2)
+        self.assertEqual(HouseholdHeadEligibility.objects.count(), 2)
+        self.assertEqual(EnrollmentChecklist.objects.count(), 8)
+        for household_member in household_members:
+            self.assertTrue(household_member.eligible_member)
+            self.assertTrue(household_member.eligible_subject)
+            self.assertTrue(household_member.slug)
+            self.assertEqual(household_member.participation, ELIGIBLE)
+        for household_structure in household_structures:
+            self.assertTrue(household_structure.enumerated)
+
+    def test_make_community_with_absent_members(self):
+        household_structures = self.member_helper.make_community(
+            households=1, members_per_household=4, absent_ratio=1)
+        absent = HouseholdMember.objects.filter(
+            household_structure__in=household_structures, absent=True)
+        self.assertEqual(absent.count(), 3)
+        self.assertEqual(AbsentMember.objects.count(), 3)
+        for household_member in absent:
+            self.assertEqual(household_member.visit_attempts, 1)
+            self.assertEqual(household_member.participation, ABSENT)
+
+    def test_can_enumerate_generated_household(self):
+        household_structure = self.member_helper.make_community(
+            households=1, members_per_household=2).first()
+        self.member_helper.add_household_member(household_structure)
+
+    def test_generated_names_unique_per_household(self):
+        report_datetime = site_surveys.get_survey_schedules()[0].start
+        household_structure = self.member_helper.household_helper.make_household_structure(
+            attempts=1, report_datetime=report_datetime)
+        household_structures = HouseholdStructure.objects.filter(pk=household_structure.pk)
+        SameNameCommunityGenerator(
+            household_structures=household_structures, members_per_household=30,
+            report_datetime=report_datetime, seed=1).generate()
+        household_members = HouseholdMember.objects.filter(
+            household_structure=household_structure)
+        self.assertEqual(household_members.count(), 30)
+        self.assertEqual(
+            len(set(household_members.values_list('first_name', 'initials'))), 30)
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from django.test import TestCase, tag
+
+from edc_consent.exceptions import ConsentDoesNotExist
+
+from ..consent_helper import ConsentPeriodIndex
+
+
+class Consent:
+
+    def __init__(self, group, version, start, end):
+        self.group = group
+        self.version = version
+        self.start = start
+        self.end = end
+
+
+class SiteConsents:
+
+    def __init__(self, consents):
+        self.registry = {f'{c.group}-{c.version}': c for c in consents}
+
+    def get_consent(self, report_datetime=None, consent_group=None):
+        consents = [c for c in self.registry.values()
+                    if c.group == consent_group and c.start <= report_datetime <= c.end]
+        if not consents:
+            raise ConsentDoesNotExist()
+        return consents[0]
+
+
+@tag('consent_helper')
+class TestConsentPeriodIndex(TestCase):
+
+    def setUp(self):
+        self.v1 = Consent('bcpp', '1', datetime(2013, 10, 1), datetime(2016, 9, 30))
+        self.v2 = Consent('bcpp', '2', datetime(2016, 10, 1), datetime(2018, 12, 31))
+        self.site_consents = SiteConsents([self.v2, self.v1])
+        self.index = ConsentPeriodIndex(site_consents=self.site_consents)
+
+    def test_get_consent(self):
+        self.assertEqual(
+            self.index.get_consent(datetime(2014, 1, 1), 'bcpp'), self.v1)
+        self.assertEqual(
+            self.index.get_consent(datetime(2016, 10, 1), 'bcpp'), self.v2)
+        self.assertEqual(self.index.hits, 2)
+        self.assertEqual(self.index.misses, 0)
+
+    def test_get_consent_outside_periods(self):
+        self.assertRaises(
+            ConsentDoesNotExist,
+            self.index.get_consent, datetime(2012, 1, 1), 'bcpp')
+        self.assertRaises(
+            ConsentDoesNotExist,
+            self.index.get_consent, datetime(2014, 1, 1), 'anonymous')
+        self.assertEqual(self.index.misses, 2)
+
+    def test_rebuilt_if_registry_changes(self):
+        self.assertEqual(
+            self.index.get_consent(datetime(2014, 1, 1), 'bcpp'), self.v1)
+        anonymous = Consent(
+            'anonymous', '1', datetime(2013, 10, 1), datetime(2018, 12, 31))
+        self.site_consents.registry['anonymous-1'] = anonymous
+        self.assertEqual(
+            self.index.get_consent(datetime(2014, 1, 1), 'anonymous'), anonymous)
+        self.assertEqual(self.index.hits, 2)
+
+    def test_overlapping_periods_not_indexed(self):
+        self.site_consents.registry['bcpp-3'] = Consent(
+            'bcpp', '3', datetime(2018, 1, 1), datetime(2019, 12, 31))
+        self.index.get_consent(datetime(2014, 1, 1), 'bcpp')
+        self.assertEqual(self.index.misses, 1)
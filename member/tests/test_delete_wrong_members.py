@@ -0,0 +1,79 @@
+from io import StringIO
+from model_mommy import mommy
+
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from edc_constants.constants import NO
+from survey.tests import SurveyTestHelper
+
+from ..management.commands.delete_wrong_members import (
+    bulk_delete_household_members, member_dependent_models)
+from ..models import (
+    AbsentMember, EnrollmentChecklist, EnrollmentLoss, HouseholdMember,
+    MemberAppointment)
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('delete_wrong_members')
+class TestDeleteWrongMembers(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        self.household_members = [
+            self.member_helper.add_household_member(household_structure)
+            for _ in range(3)]
+        self.member_helper.make_absent_member(self.household_members[0])
+        self.member_helper.add_enrollment_checklist(
+            self.household_members[1], literacy=NO)
+        self.pks = [obj.pk for obj in self.household_members]
+
+    def test_bulk_delete(self):
+        deleted, failed = bulk_delete_household_members(
+            self.pks, chunk_size=2, dependent_models=member_dependent_models)
+        self.assertEqual((deleted, failed), (3, []))
+        self.assertFalse(HouseholdMember.objects.filter(pk__in=self.pks).exists())
+        self.assertFalse(AbsentMember.objects.filter(
+            household_member_id__in=self.pks).exists())
+        self.assertFalse(EnrollmentChecklist.objects.filter(
+            household_member_id__in=self.pks).exists())
+        self.assertFalse(EnrollmentLoss.objects.filter(
+            household_member_id__in=self.pks).exists())
+
+    def test_bulk_delete_dry_run(self):
+        stdout = StringIO()
+        deleted, failed = bulk_delete_household_members(
+            self.pks, dry_run=True, stdout=stdout,
+            dependent_models=member_dependent_models)
+        self.assertEqual((deleted, failed), (0, []))
+        self.assertIn('to delete: 3.', stdout.getvalue())
+        self.assertEqual(HouseholdMember.objects.filter(pk__in=self.pks).count(), 3)
+        self.assertTrue(AbsentMember.objects.filter(
+            household_member=self.household_members[0]).exists())
+
+    def test_bulk_delete_skips_failed_member(self):
+        household_member = self.household_members[2]
+        mommy.make(
+            MemberAppointment,
+            household_member=household_member,
+            label='T1 prep',
+            appt_date=household_member.report_datetime.date())
+        stdout = StringIO()
+        deleted, failed = bulk_delete_household_members(
+            self.pks, stdout=stdout, dependent_models=member_dependent_models)
+        self.assertEqual((deleted, failed), (2, [household_member.pk]))
+        self.assertEqual(
+            list(HouseholdMember.objects.filter(pk__in=self.pks).values_list(
+                'pk', flat=True)),
+            [household_member.pk])
+        self.assertIn(f'Failed to delete {household_member.pk}', stdout.getvalue())
@@ -4,13 +4,16 @@ from model_mommy import mommy
 
 from django.test import TestCase, tag
 
-from edc_constants.constants import NO, FEMALE, MALE, YES
+from edc_constants.constants import NO, FEMALE, MALE, NOT_APPLICABLE, YES
 from edc_map.site_mappers import site_mappers
 from survey.tests import SurveyTestHelper
 
 from ..constants import BLOCK_PARTICIPATION
+from ..enrollment_eligibility import EnrollmentChecklistEvaluator
 from ..exceptions import MemberEnrollmentError
-from ..models import HouseholdMember, EnrollmentLoss, EnrollmentChecklist
+from ..models import (
+    HouseholdMember, EnrollmentLoss, EnrollmentChecklist,
+    EnrollmentChecklistAnonymous)
 from .member_test_helper import MemberTestHelper
 from .mappers import TestMapper
 
@@ -385,3 +388,91 @@ class TestMembers(TestCase):
         self.assertTrue(household_member.enrollment_checklist_completed)
         self.assertFalse(household_member.enrollment_loss_completed)
         self.assertTrue(household_member.eligible_subject)
+
+    def test_evaluator_applies_eligibility_in_bulk(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure)
+        household_member = self.member_helper.add_enrollment_checklist(
+            household_member)
+        self.assertTrue(household_member.eligible_subject)
+        EnrollmentChecklist.objects.filter(
+            household_member=household_member).update(literacy=NO)
+        evaluator = EnrollmentChecklistEvaluator(
+            EnrollmentChecklist.objects.all()).run()
+        self.assertEqual(evaluator.ineligible, 1)
+        self.assertEqual(evaluator.changed, 1)
+        enrollment_checklist = EnrollmentChecklist.objects.get(
+            household_member=household_member)
+        self.assertFalse(enrollment_checklist.is_eligible)
+        self.assertEqual(
+            enrollment_checklist.loss_reason,
+            'Illiterate with no literate witness.')
+        enrollment_loss = EnrollmentLoss.objects.get(
+            household_member=household_member)
+        self.assertEqual(enrollment_loss.reason, enrollment_checklist.loss_reason)
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertFalse(household_member.eligible_subject)
+        self.assertTrue(household_member.enrollment_loss_completed)
+
+    def test_evaluator_sets_modified(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure)
+        household_member = self.member_helper.add_enrollment_checklist(
+            household_member)
+        enrollment_checklist = EnrollmentChecklist.objects.get(
+            household_member=household_member)
+        EnrollmentChecklist.objects.filter(
+            household_member=household_member).update(literacy=NO)
+        EnrollmentChecklistEvaluator(EnrollmentChecklist.objects.all()).run()
+        self.assertGreater(
+            EnrollmentChecklist.objects.get(pk=enrollment_checklist.pk).modified,
+            enrollment_checklist.modified)
+        self.assertGreater(
+            HouseholdMember.objects.get(pk=household_member.pk).modified,
+            household_member.modified)
+
+    def test_evaluator_deletes_loss_for_eligible(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure)
+        self.member_helper.add_enrollment_checklist(
+            household_member, literacy=NO)
+        self.assertTrue(EnrollmentLoss.objects.filter(
+            household_member=household_member).exists())
+        EnrollmentChecklist.objects.filter(
+            household_member=household_member).update(literacy=YES)
+        evaluator = EnrollmentChecklistEvaluator(
+            EnrollmentChecklist.objects.all()).run()
+        self.assertEqual(evaluator.eligible, 1)
+        self.assertFalse(EnrollmentLoss.objects.filter(
+            household_member=household_member).exists())
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertTrue(household_member.eligible_subject)
+        self.assertFalse(household_member.enrollment_loss_completed)
+
+    def test_evaluator_evaluates_anonymous_checklists(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure)
+        mommy.make(
+            EnrollmentChecklistAnonymous,
+            household_member=household_member,
+            report_datetime=household_structure.report_datetime,
+            age_in_years=household_member.age_in_years,
+            gender=household_member.gender,
+            guardian=NOT_APPLICABLE,
+            part_time_resident=YES,
+            literacy=NO)
+        evaluator = EnrollmentChecklistEvaluator(
+            EnrollmentChecklistAnonymous.objects.all()).run()
+        self.assertEqual(evaluator.ineligible, 1)
+        self.assertFalse(EnrollmentChecklistAnonymous.objects.get(
+            household_member=household_member).is_eligible)
+        self.assertEqual(
+            EnrollmentLoss.objects.get(household_member=household_member).reason,
+            'Illiterate with no literate witness.')
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertFalse(household_member.eligible_subject)
+        self.assertTrue(household_member.enrollment_checklist_completed)
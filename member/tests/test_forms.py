@@ -2,8 +2,10 @@ from django.apps import apps as django_apps
 from django.test import TestCase, tag
 
 from edc_base.utils import get_utcnow
+from edc_constants.constants import YES
 from edc_map.site_mappers import site_mappers
 from household.constants import REFUSED_ENUMERATION, NO_HOUSEHOLD_INFORMANT
+from household.constants import ELIGIBLE_REPRESENTATIVE_PRESENT
 from household.tests import HouseholdTestHelper
 from survey.tests import SurveyTestHelper
 
@@ -68,3 +70,25 @@ class TestHouseholdMemberFormValidator(TestCase):
             'household_structure': household_structure.id}
         form = HouseholdMemberForm(data=options)
         self.assertFalse(form.is_valid())
+
+    def test_representative_eligibility_form_queries(self):
+        household_structure = self.household_helper.make_household_structure()
+        self.household_helper.add_enumeration_attempt(
+            household_structure,
+            report_datetime=get_utcnow(),
+            household_status=ELIGIBLE_REPRESENTATIVE_PRESENT)
+        options = {
+            'household_structure': household_structure.id,
+            'report_datetime': get_utcnow(),
+            'aged_over_18': YES,
+            'household_residency': YES,
+            'verbal_script': YES}
+        form = RepresentativeEligibilityForm(data=options)
+        # the household structure choice, the log entries and the
+        # unique check on household_structure
+        with self.assertNumQueries(3) as context:
+            form.is_valid()
+        log_entry_queries = [
+            q for q in context.captured_queries
+            if 'household_householdlogentry' in q.get('sql')]
+        self.assertEqual(len(log_entry_queries), 1)
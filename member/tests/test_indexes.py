@@ -0,0 +1,122 @@
+from django.apps import apps as django_apps
+from django.db import connection
+from django.test import TestCase, tag
+
+from edc_base.utils import get_utcnow
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from ..constants import HEAD_OF_HOUSEHOLD
+from ..models import AbsentMember, HouseholdMember, MemberAppointment
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('indexes')
+class TestIndexes(TestCase):
+
+    """Asserts the hot lookup paths are index backed by reading the
+    query plan on sqlite and PostgreSQL.
+    """
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        if connection.vendor not in ['sqlite', 'postgresql']:
+            self.skipTest(f'Query plans not checked on {connection.vendor}.')
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_community(
+            households=1, members_per_household=2).first()
+        self.household_member = self.household_structure.householdmember_set.first()
+
+    def indexes(self, model_cls):
+        """Returns {index name: columns} for the model's table.
+        """
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, model_cls._meta.db_table)
+        return {name: constraint['columns'] for name, constraint in constraints.items()
+                if constraint['index'] or constraint['unique']}
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            else:
+                # the test tables are too small for the planner to prefer an index
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}', params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+    def assertIndexed(self, queryset, columns):
+        """Asserts an index leading with `columns` exists and is
+        the one named in the query plan.
+        """
+        model_cls = queryset.model
+        names = [name for name, cols in self.indexes(model_cls).items()
+                 if cols[:len(columns)] == columns]
+        self.assertTrue(
+            names, msg=f'No index on {model_cls._meta.db_table} {columns}.')
+        plan = self.query_plan(queryset)
+        self.assertTrue(
+            [name for name in names if name in plan],
+            msg=(f'Expected an index scan on {model_cls._meta.db_table} '
+                 f'using one of {names}. Got {plan}'))
+
+    def test_household_member_by_relation(self):
+        self.assertIndexed(
+            HouseholdMember.objects.filter(
+                household_structure=self.household_structure,
+                relation=HEAD_OF_HOUSEHOLD),
+            ['household_structure_id', 'relation'])
+
+    def test_household_member_by_subject_identifier(self):
+        self.assertIndexed(
+            HouseholdMember.objects.filter(
+                subject_identifier=self.household_member.subject_identifier,
+                survey_schedule=self.household_member.survey_schedule),
+            ['subject_identifier', 'survey_schedule'])
+
+    def test_household_member_by_initials(self):
+        self.assertIndexed(
+            HouseholdMember.objects.filter(initials=self.household_member.initials),
+            ['initials'])
+
+    def test_household_member_by_relation_only(self):
+        self.assertIndexed(
+            HouseholdMember.objects.filter(relation=HEAD_OF_HOUSEHOLD),
+            ['relation'])
+
+    def test_household_member_by_slug_prefix(self):
+        if connection.vendor != 'postgresql':
+            self.skipTest('sqlite does not use an index for LIKE.')
+        self.assertIndexed(
+            HouseholdMember.objects.filter(
+                slug__startswith=self.household_member.slug[:8]),
+            ['slug'])
+
+    def test_household_member_cloned(self):
+        self.assertIndexed(
+            HouseholdMember.objects.filter(
+                survey_schedule=self.household_member.survey_schedule,
+                cloned=True),
+            ['survey_schedule', 'cloned'])
+
+    def test_member_entry_by_report_date(self):
+        self.assertIndexed(
+            AbsentMember.objects.filter(
+                household_member=self.household_member,
+                report_date=get_utcnow().date()),
+            ['household_member_id', 'report_date'])
+
+    def test_member_appointment_by_label(self):
+        self.assertIndexed(
+            MemberAppointment.objects.filter(
+                label='T1 prep', appt_status='new').order_by('appt_date'),
+            ['label', 'appt_status', 'appt_date'])
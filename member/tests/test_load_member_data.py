@@ -0,0 +1,134 @@
+import csv
+import json
+import os
+import tempfile
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from ..constants import MOVED
+from ..management.commands.load_member_data import (
+    MemberDataImporter, read_rows)
+from ..models import HouseholdMember, MovedMember
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+class TestLoadMemberData(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmpdir, 'moved.csv')
+        self.checkpoint_path = os.path.join(self.tmpdir, 'checkpoint.json')
+        with open(self.file_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ['', 'id', 'user_created', 'subject_identifier',
+                 'time_point', 'new_community', 'created', 'revision'])
+            for i in range(5):
+                writer.writerow(
+                    [i, i, 'erik', f'066-1111111{i}', 'T2',
+                     'Digawana, Ranaka', '', ''])
+
+    def tearDown(self):
+        for filename in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, filename))
+        os.rmdir(self.tmpdir)
+
+    def test_read_rows(self):
+        rows = list(read_rows(file_path=self.file_path))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0].get('subject_identifier'), '066-11111110')
+        self.assertEqual(rows[0].get('new_community'), 'Digawana, Ranaka')
+
+    def test_read_rows_skip(self):
+        rows = list(read_rows(file_path=self.file_path, skip=3))
+        self.assertEqual(
+            [row.get('subject_identifier') for row in rows],
+            ['066-11111113', '066-11111114'])
+
+    def test_importer_checkpoint(self):
+        importer = MemberDataImporter(
+            model_cls=MovedMember, batch_size=2,
+            checkpoint_path=self.checkpoint_path)
+        importer.import_file(self.file_path)
+        self.assertEqual(importer.processed, 5)
+        with open(self.checkpoint_path) as f:
+            self.assertEqual(json.load(f).get('processed'), 5)
+
+    def test_importer_resumes_from_checkpoint(self):
+        with open(self.checkpoint_path, 'w') as f:
+            json.dump(dict(
+                file_path=os.path.abspath(self.file_path), processed=4), f)
+        importer = MemberDataImporter(
+            model_cls=MovedMember, batch_size=2,
+            checkpoint_path=self.checkpoint_path)
+        with self.assertNumQueries(2):
+            importer.import_file(self.file_path)
+        self.assertEqual(importer.processed, 5)
+
+
+class TestLoadMemberDataImport(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        self.household_members = [
+            self.member_helper.add_household_member(household_structure)
+            for _ in range(2)]
+        self.tmpdir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmpdir, 'moved.csv')
+        with open(self.file_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            # report_datetime and survey_schedule are also set by the importer
+            writer.writerow(
+                ['', 'id', 'user_created', 'subject_identifier', 'time_point',
+                 'new_community', 'report_datetime', 'survey_schedule'])
+            for i, household_member in enumerate(self.household_members):
+                writer.writerow(
+                    [i, i, 'erik', household_member.subject_identifier, 'T2',
+                     'Digawana, Ranaka', '2016-01-01 00:00', 'bcpp-survey'])
+
+    def tearDown(self):
+        os.remove(self.file_path)
+        os.rmdir(self.tmpdir)
+
+    def get_importer(self, **options):
+        importer = MemberDataImporter(model_cls=MovedMember, **options)
+        importer.survey_schedules = {
+            'T2': self.household_members[0].survey_schedule_object.short_name}
+        return importer
+
+    def assert_imported(self):
+        for household_member in self.household_members:
+            moved_member = MovedMember.objects.get(household_member=household_member)
+            self.assertEqual(moved_member.new_community, 'Digawana, Ranaka')
+            self.assertEqual(
+                moved_member.survey_schedule, household_member.survey_schedule)
+            self.assertGreater(moved_member.report_datetime.year, 2016)
+            updated = HouseholdMember.objects.get(pk=household_member.pk)
+            self.assertTrue(updated.moved)
+            self.assertEqual(
+                updated.visit_attempts, household_member.visit_attempts + 1)
+            self.assertEqual(updated.participation, MOVED)
+
+    def test_import_bulk_create(self):
+        importer = self.get_importer()
+        self.assertTrue(importer.use_bulk_create)
+        self.assertEqual(importer.import_file(self.file_path), 2)
+        self.assert_imported()
+
+    def test_import_create(self):
+        importer = self.get_importer(use_bulk_create=False)
+        self.assertEqual(importer.import_file(self.file_path), 2)
+        self.assert_imported()
@@ -12,6 +12,7 @@ from household.tests import HouseholdTestHelper
 from survey.tests import SurveyTestHelper
 
 from ..models import AbsentMember, UndecidedMember, RefusedMember
+from ..todays_log_entry import todays_log_entry_cache, todays_log_entry_or_raise
 
 from .member_test_helper import MemberTestHelper
 from .mappers import TestMapper
@@ -199,3 +200,27 @@ class TestLogEntry(TestCase):
         self.assertRaises(
             HouseholdLogRequired,
             self.member_helper.add_household_member, household_structure)
+
+    def test_todays_log_entry_cache(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        report_datetime = HouseholdLogEntry.objects.filter(
+            household_log__household_structure=household_structure).last().report_datetime
+        with todays_log_entry_cache():
+            household_log_entry = todays_log_entry_or_raise(
+                household_structure=household_structure,
+                report_datetime=report_datetime)
+            with self.assertNumQueries(0):
+                self.assertEqual(todays_log_entry_or_raise(
+                    household_structure=household_structure,
+                    report_datetime=report_datetime), household_log_entry)
+            tomorrow = report_datetime + relativedelta(days=1)
+            self.assertRaises(
+                HouseholdLogRequired, todays_log_entry_or_raise,
+                household_structure=household_structure,
+                report_datetime=tomorrow)
+            with self.assertNumQueries(0):
+                self.assertRaises(
+                    HouseholdLogRequired, todays_log_entry_or_raise,
+                    household_structure=household_structure,
+                    report_datetime=tomorrow)
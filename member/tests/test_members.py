@@ -1,12 +1,16 @@
 from dateutil.relativedelta import relativedelta
 from model_mommy import mommy
 
+from datetime import datetime
+
 from django.apps import apps as django_apps
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
 from django.test import TestCase
 
 from edc_constants.constants import NO, DEAD, YES, UUID_PATTERN, ALIVE, FEMALE,\
     NOT_APPLICABLE
+from edc_consent.site_consents import site_consents
 from edc_map.site_mappers import site_mappers
 
 from household.constants import ELIGIBLE_REPRESENTATIVE_PRESENT
@@ -16,11 +20,45 @@ from household.models import HouseholdStructure
 from survey.tests import SurveyTestHelper
 from survey.site_surveys import site_surveys
 
+from .. import anonymous_plot
+from ..anonymous_plot import get_anonymous_plot_id
 from ..constants import MENTAL_INCAPACITY, HEAD_OF_HOUSEHOLD, ABLE_TO_PARTICIPATE
+from ..eligibile_member_helper import (
+    EligibileMemberHelper, previously_consented_cache)
+from ..enumeration_state import enumeration_state_cache, get_enumeration_state
 from ..exceptions import EnumerationRepresentativeError
-from ..models import HouseholdMember, MovedMember
+from ..update_household_member import update_household_member
+from ..models import HouseholdMember, MovedMember, AbsentMember, UndecidedMember
 from .member_test_helper import MemberTestHelper
 from .mappers import TestMapper
+from .test_consent_helper import Consent
+
+
+class ConsentModelManager:
+
+    def __init__(self):
+        self.consents = []
+
+    def get(self, version=None, subject_identifier=None):
+        for consent in self.consents:
+            if (consent.version, consent.subject_identifier) == (
+                    version, subject_identifier):
+                return consent
+        raise ConsentModel.DoesNotExist()
+
+
+class ConsentModel:
+    """A stand-in for a consent model of the consent app.
+    """
+
+    class DoesNotExist(Exception):
+        pass
+
+    objects = ConsentModelManager()
+
+    def __init__(self, subject_identifier=None, version=None):
+        self.subject_identifier = subject_identifier
+        self.version = version
 
 
 class TestMembers(TestCase):
@@ -206,6 +244,39 @@ class TestMembers(TestCase):
             report_datetime=report_datetime)
         self.assertEqual(household_member.visit_attempts, 4)
 
+    def test_member_visit_attempts_on_delete(self):
+        report_datetime = self.household_structure.survey_schedule_object.start
+        household_member = self.member_helper.add_household_member(
+            household_structure=self.household_structure,
+            report_datetime=report_datetime)
+        household_member = self.member_helper.make_absent_member(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        household_member = self.member_helper.make_undecided_member(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        self.assertEqual(household_member.visit_attempts, 2)
+        self.assertTrue(household_member.absent)
+        AbsentMember.objects.filter(household_member=household_member).delete()
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(household_member.visit_attempts, 1)
+        self.assertFalse(household_member.absent)
+        self.assertTrue(household_member.undecided)
+        HouseholdMember.objects.filter(pk=household_member.pk).update(
+            visit_attempts=0)
+        UndecidedMember.objects.filter(household_member=household_member).delete()
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(household_member.visit_attempts, 0)
+        self.assertFalse(household_member.undecided)
+
+    def test_member_flag_update_sets_modified(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(household_structure)
+        modified = HouseholdMember.objects.get(pk=household_member.pk).modified
+        self.member_helper.make_absent_member(household_member)
+        self.assertGreater(
+            HouseholdMember.objects.get(pk=household_member.pk).modified, modified)
+
     def test_plot_eligible_members_increments(self):
         household_structure = self.member_helper.make_household_ready_for_enumeration(
             make_hoh=False)
@@ -247,6 +318,31 @@ class TestMembers(TestCase):
             self.assertEqual(
                 household_structure.survey_schedule, survey_schedule.field_value)
 
+    def test_enumeration_state_cached_and_cleared(self):
+        with enumeration_state_cache():
+            state = get_enumeration_state(self.household_structure.pk)
+            self.assertTrue(state.representative_eligibility)
+            self.assertIsNone(state.hoh_id)
+            with self.assertNumQueries(0):
+                self.assertIs(
+                    get_enumeration_state(self.household_structure.pk), state)
+            household_member = self.member_helper.add_household_member(
+                self.household_structure, relation=HEAD_OF_HOUSEHOLD)
+            state = get_enumeration_state(self.household_structure.pk)
+            self.assertEqual(state.hoh_id, household_member.pk)
+            self.assertFalse(state.hoh_eligibility)
+
+    def test_enumeration_state_cache_uses_outer_cache(self):
+        with enumeration_state_cache():
+            state = get_enumeration_state(self.household_structure.pk)
+            with enumeration_state_cache():
+                with self.assertNumQueries(0):
+                    self.assertIs(
+                        get_enumeration_state(self.household_structure.pk), state)
+            with self.assertNumQueries(0):
+                self.assertIs(
+                    get_enumeration_state(self.household_structure.pk), state)
+
 
 class TestMembers2(TestCase):
 
@@ -341,3 +437,128 @@ class TestMembers3(TestCase):
         household_member = HouseholdMember.objects.get(pk=household_member.pk)
         self.assertEqual(internal_identifier,
                          household_member.internal_identifier)
+
+    def test_eligible_member_updated_if_eligibility_field_changes(self):
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        self.assertTrue(household_member.eligible_member)
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        household_member.age_in_years = 10
+        household_member.save()
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertFalse(household_member.eligible_member)
+
+    def test_eligibility_helper_uses_previously_consented_cache(self):
+        options = dict(
+            subject_identifier='111111111',
+            age_in_years=70,
+            survival_status=ALIVE,
+            study_resident=YES,
+            inability_to_participate=ABLE_TO_PARTICIPATE)
+        with previously_consented_cache(subject_identifiers=['111111111']):
+            with self.assertNumQueries(0):
+                self.assertFalse(
+                    EligibileMemberHelper(**options).is_eligible_member)
+        with self.assertNumQueries(0):
+            self.assertTrue(EligibileMemberHelper(
+                previously_consented=True, **options).is_eligible_member)
+
+    def test_changed_fields_tracked(self):
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(household_member.changed_fields, [])
+        household_member.visit_attempts += 1
+        household_member.absent = True
+        self.assertEqual(
+            sorted(household_member.changed_fields), ['absent', 'visit_attempts'])
+        self.assertTrue(household_member.is_flag_only_change)
+        household_member.save()
+        self.assertEqual(household_member.changed_fields, [])
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(household_member.visit_attempts, 1)
+        self.assertTrue(household_member.absent)
+        household_member.initials = 'NB'
+        self.assertFalse(household_member.is_flag_only_change)
+        self.assertTrue(household_member.has_changed('initials'))
+
+    def test_changed_fields_ignores_deferred_fields(self):
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        household_member = HouseholdMember.objects.defer(
+            'study_resident', 'initials').get(pk=household_member.pk)
+        self.assertEqual(household_member.study_resident, YES)
+        self.assertEqual(household_member.changed_fields, [])
+        household_member.initials = 'NB'
+        self.assertEqual(household_member.changed_fields, ['initials'])
+
+    def test_slug_written_with_update_fields(self):
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        household_member.initials = 'NB'
+        household_member.save(update_fields=['initials'])
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertTrue(household_member.slug.endswith('|nb'))
+        household_member.visit_attempts += 1
+        household_member.slug = 'not-written'
+        household_member.save(update_fields=['visit_attempts'])
+        self.assertNotEqual(
+            HouseholdMember.objects.get(pk=household_member.pk).slug, 'not-written')
+
+    def test_update_household_member_rejects_unknown_flags(self):
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        self.assertRaises(
+            TypeError, update_household_member, household_member, first_name='ERIK')
+
+    def test_anonymous_uses_cached_anonymous_plot(self):
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        household_member = HouseholdMember.objects.select_related(
+            'household_structure__household').get(pk=household_member.pk)
+        self.assertFalse(household_member.anonymous)
+        with self.assertNumQueries(0):
+            self.assertFalse(household_member.anonymous)
+
+    def test_anonymous_plot_cache_cleared_on_plot_save(self):
+        get_anonymous_plot_id()
+        self.household_structure.household.plot.save()
+        self.assertNotIn('pk', anonymous_plot._cache)
+
+    def get_consented_member(self):
+        """Returns an eligible member whose consent object is the
+        stand-in consent model's.
+        """
+        consent_object = Consent('test', '1', datetime(2013, 10, 1), datetime(2013, 10, 2))
+        consent_object.model = ConsentModel
+        ConsentModel.objects = ConsentModelManager()
+        site_consents.registry['test-1'] = consent_object
+        self.addCleanup(site_consents.registry.pop, 'test-1')
+        household_member = HouseholdMember.objects.create(**self.defaults)
+        household_member.eligible_subject = True
+        household_member._consent_object = consent_object
+        return household_member
+
+    def test_consent_exists(self):
+        household_member = self.get_consented_member()
+        consent = ConsentModel(
+            subject_identifier=household_member.subject_identifier, version='1')
+        ConsentModel.objects.consents.append(consent)
+        self.assertEqual(household_member.consent, consent)
+        self.assertTrue(household_member.is_consented)
+
+    def test_consent_created_after_first_access(self):
+        household_member = self.get_consented_member()
+        self.assertIsNone(household_member.consent)
+        consent = ConsentModel(
+            subject_identifier=household_member.subject_identifier, version='1')
+        ConsentModel.objects.consents.append(consent)
+        self.assertIsNone(household_member.consent)
+        post_save.send(
+            sender=ConsentModel, instance=consent, raw=False, created=True,
+            using='default')
+        self.assertEqual(household_member.consent, consent)
+        self.assertTrue(household_member.is_consented)
+
+    def test_with_consents_caches_consent(self):
+        HouseholdMember.objects.create(**self.defaults)
+        household_members = list(HouseholdMember.objects.filter(
+            household_structure=self.household_structure).with_consents())
+        with self.assertNumQueries(0):
+            for household_member in household_members:
+                self.assertIsNone(household_member.consent)
+                self.assertFalse(household_member.is_consented)
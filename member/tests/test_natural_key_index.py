@@ -0,0 +1,108 @@
+from django.apps import apps as django_apps
+from django.core import serializers
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from ..models import AbsentMember, HouseholdMember
+from ..natural_key_index import deserialize, natural_key_index
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('natural_key_index')
+class TestNaturalKeyIndex(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.member_helper.make_community(
+            households=2, members_per_household=3, absent_ratio=1)
+        self.household_members = list(HouseholdMember.objects.all())
+
+    def test_get_by_natural_key(self):
+        natural_keys = [obj.natural_key() for obj in self.household_members]
+        with natural_key_index(natural_keys):
+            for household_member in self.household_members:
+                with self.assertNumQueries(1):
+                    self.assertEqual(
+                        HouseholdMember.objects.get_by_natural_key(
+                            *household_member.natural_key()),
+                        household_member)
+
+    def test_member_entry_get_by_natural_key(self):
+        absent_member = AbsentMember.objects.first()
+        with natural_key_index([absent_member.household_member.natural_key()]):
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(
+                    AbsentMember.objects.get_by_natural_key(*absent_member.natural_key()),
+                    absent_member)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('member_householdmember', context.captured_queries[0]['sql'])
+
+    def test_not_indexed_falls_back(self):
+        household_member = self.household_members[0]
+        with natural_key_index([]):
+            self.assertEqual(
+                HouseholdMember.objects.get_by_natural_key(
+                    *household_member.natural_key()),
+                household_member)
+
+    def test_indexed_miss_not_queried(self):
+        household_member = self.household_members[0]
+        internal_identifier, *values = household_member.natural_key()
+        natural_key = [internal_identifier, 'not_a_survey_schedule', *values[1:]]
+        absent_member = AbsentMember.objects.first()
+        with natural_key_index([household_member.natural_key()]):
+            with self.assertNumQueries(0):
+                self.assertRaises(
+                    HouseholdMember.DoesNotExist,
+                    HouseholdMember.objects.get_by_natural_key, *natural_key)
+                self.assertRaises(
+                    AbsentMember.DoesNotExist,
+                    AbsentMember.objects.get_by_natural_key,
+                    absent_member.report_datetime, *natural_key)
+
+    def test_not_backfilled_falls_back(self):
+        household_member = self.household_members[0]
+        natural_key = household_member.natural_key()
+        HouseholdMember.objects.update(plot_identifier=None)
+        with natural_key_index([natural_key]):
+            self.assertEqual(
+                HouseholdMember.objects.get_by_natural_key(*natural_key),
+                household_member)
+
+    def test_member_saved_within_index(self):
+        household_structure = self.household_members[0].household_structure
+        with natural_key_index([]):
+            household_member = self.member_helper.add_household_member(
+                household_structure)
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    HouseholdMember.objects.get_by_natural_key(
+                        household_member.internal_identifier,
+                        household_member.survey_schedule,
+                        household_member.household_identifier,
+                        household_member.plot_identifier),
+                    household_member)
+
+    def test_deserialize(self):
+        absent_members = AbsentMember.objects.all()
+        data = serializers.serialize(
+            'json', absent_members, use_natural_foreign_keys=True)
+        with CaptureQueriesContext(connection) as context:
+            objects = deserialize('json', data)
+        self.assertEqual(
+            sorted(obj.object.household_member_id for obj in objects),
+            sorted(obj.household_member_id for obj in absent_members))
+        self.assertFalse(
+            [query for query in context.captured_queries if 'plot_plot' in query['sql']])
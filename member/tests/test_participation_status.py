@@ -1,18 +1,36 @@
+from datetime import datetime
+
 from django.apps import apps as django_apps
+from django.db import connection
+from django.db.models.signals import post_save
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from edc_constants.constants import REFUSED, NO
+from edc_consent.site_consents import site_consents
 from edc_map.site_mappers import site_mappers
 from survey.tests import SurveyTestHelper
 
 from ..constants import (
-    ABSENT, UNDECIDED, DECEASED, HTC_ELIGIBLE, ELIGIBLE, INELIGIBLE, MOVED)
+    ABSENT, UNDECIDED, DECEASED, HTC_ELIGIBLE, ELIGIBLE, INELIGIBLE, MOVED,
+    AVAILABLE)
+from ..management.commands.update_participation_status import (
+    update_participation_status)
 from ..participation_status import ParticipationStatus
-from ..models import HouseholdMember
+from ..models import HouseholdMember, AbsentMember
 from .mappers import TestMapper
+from .test_consent_helper import Consent
 from .member_test_helper import MemberTestHelper
 
 
+class ConsentModel:
+    """A stand-in for a consent model of the consent app.
+    """
+
+    def __init__(self, subject_identifier=None):
+        self.subject_identifier = subject_identifier
+
+
 class TestMembers(TestCase):
 
     member_helper = MemberTestHelper()
@@ -161,3 +179,122 @@ class TestMembers(TestCase):
             legal_marriage=NO)
         participation_status = ParticipationStatus(household_member)
         self.assertEqual(participation_status.participation_status, INELIGIBLE)
+
+    def test_for_members_matches_per_member(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        report_datetime = household_structure.householdlog.householdlogentry_set.all().order_by(
+            'report_datetime').last().report_datetime
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+        self.member_helper.make_absent_member(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+        self.member_helper.make_refused_member(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+        self.member_helper.add_enrollment_checklist(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        household_members = HouseholdMember.objects.filter(
+            household_structure=household_structure)
+        participation_statuses = ParticipationStatus.for_members(
+            household_members)
+        self.assertEqual(len(participation_statuses), 4)
+        for household_member in household_members:
+            participation_status = ParticipationStatus(household_member)
+            self.assertEqual(
+                participation_statuses[household_member.pk].participation_status,
+                participation_status.participation_status)
+            self.assertEqual(
+                participation_statuses[household_member.pk].final,
+                participation_status.final)
+
+    def test_for_members_query_count_constant(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_members = HouseholdMember.objects.filter(
+            household_structure=household_structure)
+        with CaptureQueriesContext(connection) as context:
+            ParticipationStatus.for_members(household_members)
+        query_count = len(context.captured_queries)
+        for _ in range(5):
+            household_member = self.member_helper.add_household_member(
+                household_structure=household_structure)
+            self.member_helper.make_absent_member(
+                household_member=household_member)
+        with CaptureQueriesContext(connection) as context:
+            ParticipationStatus.for_members(household_members)
+        self.assertEqual(len(context.captured_queries), query_count)
+
+    def test_participation_persisted_by_signals(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        report_datetime = household_structure.householdlog.householdlogentry_set.all().order_by(
+            'report_datetime').last().report_datetime
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+        self.assertEqual(household_member.participation, AVAILABLE)
+        household_member = self.member_helper.make_absent_member(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        self.assertEqual(household_member.participation, ABSENT)
+        self.assertFalse(household_member.participation_final)
+        self.assertEqual(
+            HouseholdMember.objects.filter(participation=ABSENT).count(), 1)
+        AbsentMember.objects.get(household_member=household_member).delete()
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(household_member.participation, AVAILABLE)
+
+    def test_update_participation_status_reconciles(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        report_datetime = household_structure.householdlog.householdlogentry_set.all().order_by(
+            'report_datetime').last().report_datetime
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+        household_member = self.member_helper.make_refused_member(
+            household_member=household_member,
+            report_datetime=report_datetime)
+        HouseholdMember.objects.filter(pk=household_member.pk).update(
+            participation=AVAILABLE, participation_final=False)
+        checked, updated = update_participation_status()
+        self.assertEqual(updated, 1)
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(household_member.participation, REFUSED)
+        self.assertTrue(household_member.participation_final)
+
+    def make_stale_refused_member(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(
+            household_structure=household_structure)
+        household_member = self.member_helper.make_refused_member(
+            household_member=household_member)
+        HouseholdMember.objects.filter(pk=household_member.pk).update(
+            participation=AVAILABLE, participation_final=False)
+        return HouseholdMember.objects.get(pk=household_member.pk)
+
+    def test_unchanged_member_save_skips_participation(self):
+        household_member = self.make_stale_refused_member()
+        household_member.save()
+        self.assertEqual(
+            HouseholdMember.objects.get(pk=household_member.pk).participation, AVAILABLE)
+
+    def test_participation_updated_on_consent_save(self):
+        household_member = self.make_stale_refused_member()
+        consent = Consent('test', '1', datetime(2013, 10, 1), datetime(2013, 10, 2))
+        consent.model = ConsentModel
+        site_consents.registry['test-1'] = consent
+        self.addCleanup(site_consents.registry.pop, 'test-1')
+        post_save.send(
+            sender=ConsentModel,
+            instance=ConsentModel(subject_identifier=household_member.subject_identifier),
+            raw=False, created=True, using='default')
+        updated = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertEqual(updated.participation, REFUSED)
+        self.assertGreater(updated.modified, household_member.modified)
@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from ..models import HouseholdMember
+from ..plot_fields import reconcile_plot_fields
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('plot_fields')
+class TestPlotFields(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration()
+        self.household_member = self.member_helper.add_household_member(
+            self.household_structure)
+        self.plot = self.household_structure.household.plot
+
+    def test_set_on_save(self):
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        self.assertEqual(household_member.plot_identifier, self.plot.plot_identifier)
+        self.assertEqual(household_member.map_area, self.plot.map_area)
+        self.assertIn(self.plot.plot_identifier.lower(), household_member.slug)
+
+    def test_backfilled_on_save(self):
+        HouseholdMember.objects.update(plot_identifier=None, map_area=None)
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        household_member.save()
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        self.assertEqual(household_member.plot_identifier, self.plot.plot_identifier)
+        self.assertEqual(household_member.map_area, self.plot.map_area)
+
+    def test_reconcile(self):
+        HouseholdMember.objects.update(plot_identifier=None, map_area=None)
+        self.assertEqual(
+            reconcile_plot_fields(HouseholdMember.objects.all(), dry_run=True),
+            (HouseholdMember.objects.count(), HouseholdMember.objects.count()))
+        self.assertEqual(
+            HouseholdMember.objects.filter(plot_identifier__isnull=True).count(),
+            HouseholdMember.objects.count())
+        out = StringIO()
+        call_command('reconcile_plot_fields', stdout=out)
+        self.assertIn(f'Updated {HouseholdMember.objects.count()}', out.getvalue())
+        self.assertEqual(
+            HouseholdMember.objects.filter(
+                plot_identifier=self.plot.plot_identifier,
+                map_area=self.plot.map_area).count(),
+            HouseholdMember.objects.count())
+        self.assertEqual(
+            reconcile_plot_fields(HouseholdMember.objects.all()),
+            (HouseholdMember.objects.count(), 0))
+
+    def test_reconcile_sets_modified(self):
+        modified = HouseholdMember.objects.get(pk=self.household_member.pk).modified
+        HouseholdMember.objects.update(plot_identifier='9999999-99')
+        reconcile_plot_fields(HouseholdMember.objects.all())
+        self.assertGreater(
+            HouseholdMember.objects.get(pk=self.household_member.pk).modified,
+            modified)
+
+    def test_reconciled_on_raw_plot_save(self):
+        plot = self.plot.__class__.objects.get(pk=self.plot.pk)
+        HouseholdMember.objects.update(plot_identifier='9999999-99', map_area='old')
+        plot.save_base(raw=True)
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        self.assertEqual(household_member.plot_identifier, plot.plot_identifier)
+        self.assertEqual(household_member.map_area, plot.map_area)
+
+    def test_reconcile_regenerates_slug(self):
+        HouseholdMember.objects.update(plot_identifier='9999999-99', slug='old')
+        reconcile_plot_fields(HouseholdMember.objects.all())
+        household_member = HouseholdMember.objects.get(pk=self.household_member.pk)
+        self.assertIn(self.plot.plot_identifier.lower(), household_member.slug)
+
+    def test_get_by_natural_key_before_backfill(self):
+        natural_key = self.household_member.natural_key()
+        HouseholdMember.objects.update(plot_identifier=None, map_area=None)
+        self.assertEqual(
+            HouseholdMember.objects.get_by_natural_key(*natural_key),
+            self.household_member)
+
+    def test_get_by_natural_key_after_backfill_not_joined(self):
+        natural_key = self.household_member.natural_key()
+        HouseholdMember.objects.update(plot_identifier='9999999-99')
+        self.assertRaises(
+            HouseholdMember.DoesNotExist,
+            HouseholdMember.objects.get_by_natural_key, *natural_key)
@@ -0,0 +1,109 @@
+import os
+import tempfile
+
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from survey.tests import SurveyTestHelper
+
+from ..models import AbsentMember, HouseholdMember
+from ..update_household_member import update_household_member
+from ..sync_exporter import MemberSyncExporter, import_sync_file
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('sync_exporter')
+class TestSyncExporter(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structures = self.member_helper.make_community(
+            households=2, members_per_household=3, absent_ratio=1)
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'members.json.gz')
+        self.checkpoint_path = os.path.join(self.tmpdir, 'checkpoint.json')
+
+    def tearDown(self):
+        for filename in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, filename))
+        os.rmdir(self.tmpdir)
+
+    def exported(self, exporter, model_cls):
+        return [obj.get('pk') for label_lower, objects in exporter.export()
+                for obj in objects if label_lower == model_cls._meta.label_lower]
+
+    def test_exports_in_batches(self):
+        exporter = MemberSyncExporter(models=[HouseholdMember], batch_size=4)
+        batches = list(exporter.export())
+        self.assertEqual([len(objects) for _, objects in batches], [4, 2])
+
+    def test_exports_changed_rows_since_cursor(self):
+        exporter = MemberSyncExporter(models=[HouseholdMember], batch_size=4)
+        self.assertEqual(len(self.exported(exporter, HouseholdMember)), 6)
+        self.assertEqual(self.exported(exporter, HouseholdMember), [])
+        household_member = HouseholdMember.objects.first()
+        household_member.save()
+        household_member.save()
+        self.assertEqual(
+            self.exported(exporter, HouseholdMember), [str(household_member.pk)])
+
+    def test_exports_flag_update(self):
+        exporter = MemberSyncExporter(models=[HouseholdMember])
+        self.exported(exporter, HouseholdMember)
+        household_member = HouseholdMember.objects.filter(refused=False).first()
+        update_household_member(household_member, refused=True)
+        self.assertEqual(
+            self.exported(exporter, HouseholdMember), [str(household_member.pk)])
+
+    def test_exports_deletions(self):
+        exporter = MemberSyncExporter(models=[AbsentMember])
+        self.assertEqual(list(exporter.export_deletions()), [])
+        absent_member = AbsentMember.objects.first()
+        AbsentMember.objects.filter(pk=absent_member.pk).delete()
+        self.assertEqual(
+            list(exporter.export_deletions()),
+            [(AbsentMember._meta.label_lower, [str(absent_member.pk)])])
+        self.assertEqual(list(exporter.export_deletions()), [])
+
+    def test_map_area(self):
+        map_area = HouseholdMember.objects.first().map_area
+        exporter = MemberSyncExporter(models=[HouseholdMember], map_area=map_area)
+        self.assertEqual(len(self.exported(exporter, HouseholdMember)), 6)
+        exporter = MemberSyncExporter(models=[HouseholdMember], map_area='blahblah')
+        self.assertEqual(self.exported(exporter, HouseholdMember), [])
+
+    def test_cursors_checkpoint(self):
+        exporter = MemberSyncExporter(models=[HouseholdMember])
+        exporter.export_to_file(self.path)
+        exporter.write_cursors(self.checkpoint_path)
+        exporter = MemberSyncExporter(models=[HouseholdMember])
+        exporter.read_cursors(self.checkpoint_path)
+        self.assertEqual(exporter.export_to_file(self.path), 0)
+
+    def test_file_round_trip(self):
+        exporter = MemberSyncExporter()
+        self.assertGreater(exporter.export_to_file(self.path), 0)
+        absent_member = AbsentMember.objects.first()
+        AbsentMember.objects.filter(pk=absent_member.pk).delete()
+        import_sync_file(self.path)
+        self.assertTrue(AbsentMember.objects.filter(pk=absent_member.pk).exists())
+
+    def test_file_round_trip_deletions(self):
+        MemberSyncExporter().export_to_file(self.path)
+        absent_member = AbsentMember.objects.first()
+        AbsentMember.objects.filter(pk=absent_member.pk).delete()
+        deletions_path = os.path.join(self.tmpdir, 'deletions.json.gz')
+        MemberSyncExporter(models=[AbsentMember]).export_to_file(deletions_path)
+        import_sync_file(self.path)
+        self.assertTrue(AbsentMember.objects.filter(pk=absent_member.pk).exists())
+        import_sync_file(deletions_path)
+        self.assertFalse(AbsentMember.objects.filter(pk=absent_member.pk).exists())
@@ -0,0 +1,100 @@
+from django.apps import apps as django_apps
+from django.db.models.signals import post_save
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from household.models import HouseholdStructure
+from survey.tests import SurveyTestHelper
+
+from ..constants import ABSENT
+from ..models import HouseholdMember
+from ..unit_of_work import unit_of_work
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+@tag('unit_of_work')
+class TestUnitOfWork(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.saved = []
+        post_save.connect(self.on_post_save, weak=False, dispatch_uid='test_unit_of_work')
+        self.addCleanup(post_save.disconnect, dispatch_uid='test_unit_of_work')
+
+    def on_post_save(self, sender, instance, **kwargs):
+        self.saved.append((sender, instance.pk))
+
+    def saves(self, model_cls, pk):
+        return self.saved.count((model_cls, pk))
+
+    def test_member_saved_once(self):
+        app_config = django_apps.get_app_config('member')
+        app_config.emit_household_member_updates = True
+        self.addCleanup(setattr, app_config, 'emit_household_member_updates', False)
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(household_structure)
+        self.saved = []
+        with unit_of_work():
+            self.member_helper.make_absent_member(household_member)
+            self.member_helper.make_undecided_member(household_member)
+            household_member = HouseholdMember.objects.get(pk=household_member.pk)
+            self.assertEqual(household_member.visit_attempts, 2)
+            self.assertEqual(self.saves(HouseholdMember, household_member.pk), 0)
+        self.assertEqual(self.saves(HouseholdMember, household_member.pk), 1)
+        household_member = HouseholdMember.objects.get(pk=household_member.pk)
+        self.assertTrue(household_member.absent)
+        self.assertTrue(household_member.undecided)
+
+    def test_participation_updated_on_flush(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration()
+        household_member = self.member_helper.add_household_member(household_structure)
+        participation = household_member.participation
+        with unit_of_work():
+            self.member_helper.make_absent_member(household_member)
+            self.assertEqual(
+                HouseholdMember.objects.get(pk=household_member.pk).participation,
+                participation)
+        self.assertEqual(
+            HouseholdMember.objects.get(pk=household_member.pk).participation, ABSENT)
+
+    def test_household_structure_saved_once(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        with unit_of_work():
+            self.member_helper.add_household_member(household_structure)
+            self.assertTrue(
+                HouseholdStructure.objects.get(pk=household_structure.pk).enumerated)
+            self.member_helper.add_household_member(household_structure)
+            self.assertEqual(self.saves(HouseholdStructure, household_structure.pk), 0)
+        self.assertEqual(self.saves(HouseholdStructure, household_structure.pk), 1)
+
+    def test_deferred_update_sets_modified(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        modified = HouseholdStructure.objects.get(pk=household_structure.pk).modified
+        with unit_of_work():
+            self.member_helper.add_household_member(household_structure)
+            self.assertGreater(
+                HouseholdStructure.objects.get(pk=household_structure.pk).modified,
+                modified)
+
+    def test_rolled_back_on_error(self):
+        household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        with self.assertRaises(ValueError):
+            with unit_of_work():
+                self.member_helper.add_household_member(household_structure)
+                raise ValueError()
+        self.assertFalse(HouseholdMember.objects.filter(
+            household_structure=household_structure).exists())
+        self.assertFalse(
+            HouseholdStructure.objects.get(pk=household_structure.pk).enumerated)
+        self.assertEqual(self.saves(HouseholdStructure, household_structure.pk), 0)
@@ -0,0 +1,114 @@
+from model_mommy import mommy
+
+from django.apps import apps as django_apps
+from django.test import TestCase, tag
+
+from edc_map.site_mappers import site_mappers
+from household.models import HouseholdStructure, HouseholdWorkList
+from survey.site_surveys import site_surveys
+from survey.tests import SurveyTestHelper
+
+from ..models import MemberAppointment
+from ..update_household_work_list import (
+    HouseholdWorkListUpdater, get_previous_survey_schedules)
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+class WorkListUpdater(HouseholdWorkListUpdater):
+
+    """bcpp_subject is not installed for these tests.
+    """
+
+    def get_hic_counts(self, household_pks, survey_schedules=None):
+        return {}
+
+    def get_bhs_counts(self, household_pks):
+        return {}
+
+
+@tag('work_list')
+class TestUpdateHouseholdWorkList(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        self.household_structure = self.member_helper.make_household_ready_for_enumeration()
+        self.household_member = self.member_helper.add_household_member(
+            self.household_structure)
+        mommy.make(
+            MemberAppointment,
+            household_member=self.household_member,
+            label='T1 prep',
+            appt_date=self.household_structure.report_datetime.date())
+
+    def household_structures(self):
+        return HouseholdStructure.objects.filter(pk=self.household_structure.pk)
+
+    def test_creates_work_list(self):
+        created, updated = WorkListUpdater(
+            label='T1 prep', household_structures=self.household_structures()).update()
+        self.assertEqual((created, updated), (1, 0))
+        household_work_list = HouseholdWorkList.objects.get(
+            household_structure=self.household_structure, label='T1 prep')
+        self.assertEqual(
+            household_work_list.survey_schedule,
+            self.household_structure.survey_schedule)
+        self.assertEqual(household_work_list.members, 1)
+        self.assertEqual(household_work_list.appt_count, 1)
+        self.assertEqual(household_work_list.status, 'scheduled')
+        self.assertEqual(
+            household_work_list.visit_date,
+            self.household_structure.report_datetime.date())
+        self.assertEqual(household_work_list.enrolled_type, 'bhs')
+        self.assertGreater(household_work_list.log_attempts, 0)
+
+    def test_updates_changed_work_list(self):
+        WorkListUpdater(
+            label='T1 prep', household_structures=self.household_structures()).update()
+        modified = HouseholdWorkList.objects.get(
+            household_structure=self.household_structure).modified
+        self.member_helper.add_household_member(self.household_structure)
+        created, updated = WorkListUpdater(
+            label='T1 prep', household_structures=self.household_structures()).update()
+        self.assertEqual((created, updated), (0, 1))
+        household_work_list = HouseholdWorkList.objects.get(
+            household_structure=self.household_structure)
+        self.assertEqual(household_work_list.members, 2)
+        self.assertEqual(household_work_list.appt_count, 1)
+        self.assertGreater(household_work_list.modified, modified)
+
+    def test_unchanged_work_list_not_written(self):
+        WorkListUpdater(
+            label='T1 prep', household_structures=self.household_structures()).update()
+        modified = HouseholdWorkList.objects.get(
+            household_structure=self.household_structure).modified
+        WorkListUpdater(
+            label='T1 prep', household_structures=self.household_structures()).update()
+        self.assertEqual(
+            HouseholdWorkList.objects.get(
+                household_structure=self.household_structure).modified,
+            modified)
+
+    def test_progress_callback(self):
+        progress = []
+        WorkListUpdater(
+            label='T1 prep', household_structures=self.household_structures(),
+            progress_callback=lambda done, total: progress.append((done, total))).update()
+        self.assertEqual(progress, [(1, 1)])
+
+    def test_previous_survey_schedules(self):
+        survey_schedules = site_surveys.get_survey_schedules(group_name='test_survey')
+        self.assertEqual(get_previous_survey_schedules(survey_schedules[0]), [])
+        self.assertIn(
+            survey_schedules[0].field_value,
+            get_previous_survey_schedules(survey_schedules[1]))
+        self.assertNotIn(
+            survey_schedules[1].field_value,
+            get_previous_survey_schedules(survey_schedules[1]))
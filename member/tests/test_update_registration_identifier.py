@@ -0,0 +1,59 @@
+from django.apps import apps as django_apps
+from django.test import TestCase
+
+from edc_map.site_mappers import site_mappers
+from edc_registration.models import RegisteredSubject
+from survey.tests import SurveyTestHelper
+
+from ..constants import HEAD_OF_HOUSEHOLD
+from ..management.commands.update_registration_identifier import (
+    update_registration_identifiers)
+from .mappers import TestMapper
+from .member_test_helper import MemberTestHelper
+
+
+class TestUpdateRegistrationIdentifier(TestCase):
+
+    member_helper = MemberTestHelper()
+    survey_helper = SurveyTestHelper()
+
+    def setUp(self):
+        self.survey_helper.load_test_surveys()
+        django_apps.app_configs['edc_device'].device_id = '99'
+        site_mappers.registry = {}
+        site_mappers.loaded = False
+        site_mappers.register(TestMapper)
+        household_structure = self.member_helper.make_household_ready_for_enumeration(
+            make_hoh=False)
+        self.household_member = self.member_helper.add_household_member(
+            household_structure, relation=HEAD_OF_HOUSEHOLD)
+        RegisteredSubject.objects.filter(
+            subject_identifier=self.household_member.subject_identifier).update(
+                registration_identifier=None)
+
+    def test_updates_missing_registration_identifier(self):
+        count = update_registration_identifiers({
+            self.household_member.subject_identifier:
+            self.household_member.internal_identifier.hex})
+        self.assertEqual(count, 1)
+        registered_subject = RegisteredSubject.objects.get(
+            subject_identifier=self.household_member.subject_identifier)
+        self.assertEqual(
+            registered_subject.registration_identifier,
+            self.household_member.internal_identifier.hex)
+
+    def test_does_not_update_existing_registration_identifier(self):
+        registration_identifiers = {
+            self.household_member.subject_identifier:
+            self.household_member.internal_identifier.hex}
+        update_registration_identifiers(registration_identifiers)
+        self.assertEqual(update_registration_identifiers(registration_identifiers), 0)
+
+    def test_updates_across_chunks(self):
+        registration_identifiers = {
+            f'subject-{i}': f'registration-{i}' for i in range(10)}
+        registration_identifiers.update({
+            self.household_member.subject_identifier:
+            self.household_member.internal_identifier.hex})
+        self.assertEqual(update_registration_identifiers(
+            registration_identifiers, chunk_size=3), 1)
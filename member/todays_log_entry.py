@@ -0,0 +1,62 @@
+import threading
+
+from contextlib import contextmanager
+
+import arrow
+
+from household.exceptions import HouseholdLogRequired
+from household.utils import todays_log_entry_or_raise as _todays_log_entry_or_raise
+
+_local = threading.local()
+
+
+@contextmanager
+def todays_log_entry_cache():
+    """A context manager that memoises `todays_log_entry_or_raise`
+    by (household_structure_id, UTC date) in this thread, e.g. for
+    a form submission or a batch of member entries.
+
+    If already active, the outer cache is used. The cache is
+    cleared when a HouseholdLogEntry is saved or deleted.
+    """
+    if getattr(_local, 'cache', None) is not None:
+        yield _local.cache
+    else:
+        _local.cache = {}
+        try:
+            yield _local.cache
+        finally:
+            _local.cache = None
+
+
+def todays_log_entry_or_raise(household_structure=None, report_datetime=None):
+    """Returns today's household log entry or raises HouseholdLogRequired,
+    see `household.utils.todays_log_entry_or_raise`.
+
+    Memoised if within `todays_log_entry_cache`.
+    """
+    cache = getattr(_local, 'cache', None)
+    if cache is None or not household_structure or not report_datetime:
+        return _todays_log_entry_or_raise(
+            household_structure=household_structure,
+            report_datetime=report_datetime)
+    key = (household_structure.pk,
+           arrow.Arrow.fromdatetime(
+               report_datetime, report_datetime.tzinfo).to('UTC').date())
+    if key not in cache:
+        try:
+            cache[key] = (_todays_log_entry_or_raise(
+                household_structure=household_structure,
+                report_datetime=report_datetime), None)
+        except HouseholdLogRequired as e:
+            cache[key] = (None, e)
+    household_log_entry, exception = cache[key]
+    if exception:
+        raise exception
+    return household_log_entry
+
+
+def clear_todays_log_entry_cache():
+    cache = getattr(_local, 'cache', None)
+    if cache:
+        cache.clear()
@@ -0,0 +1,105 @@
+import threading
+
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from .utils import modified_options
+
+_local = threading.local()
+
+
+class UnitOfWork:
+    """Collects the saves cascaded by the member signals and flushes
+    each touched instance once.
+
+    Field values are written immediately with a queryset update, so
+    reads within the unit see them. Only the save that creates
+    history and sync transactions, and the participation status
+    update, are deferred.
+    """
+
+    def __init__(self):
+        self.saves = {}
+        self.participations = {}
+
+    def defer_save(self, instance, update_fields=None):
+        """Defers saving the instance, merging update_fields with
+        any already deferred. None means a full save.
+        """
+        key = (instance.__class__, instance.pk)
+        if key in self.saves:
+            deferred = self.saves[key]
+            update_fields = (
+                None if deferred is None or update_fields is None
+                else deferred | set(update_fields))
+        elif update_fields is not None:
+            update_fields = set(update_fields)
+        self.saves[key] = update_fields
+
+    def defer_participation(self, household_member):
+        self.participations.setdefault(household_member.__class__, set()).add(
+            household_member.pk)
+
+    def flush(self):
+        """Saves each deferred instance once, from a fresh copy of the
+        row, then updates the deferred participation statuses.
+
+        Saves cascaded by the flush are deferred and flushed in turn.
+        """
+        from .participation_status import update_participations
+        while self.saves or self.participations:
+            saves, self.saves = self.saves, {}
+            for (model_cls, pk), update_fields in saves.items():
+                try:
+                    obj = model_cls.objects.get(pk=pk)
+                except model_cls.DoesNotExist:
+                    continue
+                obj.save(update_fields=update_fields)
+            if not self.saves:
+                participations, self.participations = self.participations, {}
+                for model_cls, pks in participations.items():
+                    update_participations(model_cls.objects.filter(pk__in=pks))
+
+
+@contextmanager
+def unit_of_work():
+    """A context manager, or decorator, that runs the block in a
+    transaction and coalesces the saves cascaded by the member
+    signals, flushing them once at the end of the block, e.g. for
+    a form submission, an admin view or a management command batch.
+
+    If already active, the outer unit of work is used.
+    """
+    if getattr(_local, 'unit', None) is not None:
+        yield _local.unit
+    else:
+        with transaction.atomic():
+            _local.unit = UnitOfWork()
+            try:
+                yield _local.unit
+                _local.unit.flush()
+            finally:
+                _local.unit = None
+
+
+def get_unit_of_work():
+    """Returns the active UnitOfWork or None.
+    """
+    return getattr(_local, 'unit', None)
+
+
+def save_or_defer(instance, fields=None):
+    """Saves the instance or, within `unit_of_work`, updates the
+    given fields and `modified` now, defers a full save and returns
+    True.
+    """
+    unit = get_unit_of_work()
+    if unit is None or not instance.pk:
+        instance.save()
+        return False
+    instance.__class__.objects.filter(pk=instance.pk).update(
+        **{field: getattr(instance, field) for field in fields or []},
+        **modified_options())
+    unit.defer_save(instance)
+    return True
@@ -0,0 +1,48 @@
+from django.apps import apps as django_apps
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .constants import AUDIT_FIELDS, HOUSEHOLD_MEMBER_FLAG_FIELDS
+from .participation_status import update_participation
+from .unit_of_work import get_unit_of_work
+from .utils import modified_options
+
+
+def update_household_member(household_member, visit_attempts=None, **flags):
+    """Updates a household member's `visit_attempts` by the given
+    increment (never below 0) and any given flags in a single
+    UPDATE statement, which also sets `modified` so that the change
+    is exported.
+
+    Used by the member signals instead of a full save(), so that
+    concurrent updates to the same member do not overwrite each
+    other. If the member app config `emit_household_member_updates`
+    is True, the member is then saved with update_fields so that
+    history and sync transactions are still created, once per
+    member if within `unit_of_work`.
+    """
+    unexpected = set(flags) - set(HOUSEHOLD_MEMBER_FLAG_FIELDS)
+    if unexpected:
+        raise TypeError(
+            f'Expected flags in HOUSEHOLD_MEMBER_FLAG_FIELDS. Got {sorted(unexpected)}.')
+    options = dict(flags)
+    if visit_attempts:
+        options.update(visit_attempts=Greatest(
+            F('visit_attempts') + visit_attempts, 0))
+    if options:
+        audit_options = modified_options()
+        household_member.__class__.objects.filter(
+            pk=household_member.pk).update(**options, **audit_options)
+        household_member.refresh_from_db(fields=list(options) + list(audit_options))
+        app_config = django_apps.get_app_config('member')
+        if app_config.emit_household_member_updates:
+            update_fields = list(options) + [
+                f.attname for f in household_member._meta.concrete_fields
+                if f.name in AUDIT_FIELDS]
+            unit = get_unit_of_work()
+            if unit:
+                unit.defer_save(household_member, update_fields=update_fields)
+            else:
+                household_member.save(update_fields=update_fields)
+            return
+    update_participation(household_member)
@@ -1,12 +1,25 @@
 from datetime import date
 
 from django.apps import apps as django_apps
+from django.db.models import Case, Count, Min, Value, When
 
 from edc_constants.constants import DONE
+from survey.site_surveys import site_surveys
 
 from household.models import HouseholdStructure, HouseholdWorkList, HouseholdLogEntry
 
 from .models import MemberAppointment, HouseholdMember, IN_PROGRESS_APPT
+from .utils import chunks, modified_options
+
+
+def get_previous_survey_schedules(survey_schedule_object):
+    """Returns the field values of the survey schedules of the
+    same group that start before the given survey schedule.
+    """
+    return [
+        obj.field_value for obj in site_surveys.get_survey_schedules(
+            group_name=survey_schedule_object.group_name)
+        if obj.start < survey_schedule_object.start]
 
 
 def update_household_work_list(label=None, household_structure=None):
@@ -17,15 +30,16 @@ def update_household_work_list(label=None, household_structure=None):
     # and because of "survey", does not work
     HicEnrollment = django_apps.get_model('bcpp_subject', 'HicEnrollment')
     SubjectConsent = django_apps.get_model('bcpp_subject', 'SubjectConsent')
-    current_survey = household_structure.survey_schedule_object
-    survey_datetime_start = current_survey.datetime_start
     created = 0
     updated = 0
     if household_structure:
         household_structures = [household_structure]
     else:
+        current_survey_schedule = django_apps.get_app_config(
+            'survey').current_survey_schedule
         household_structures = HouseholdStructure.objects.filter(
-            survey=current_survey, enrolled=True, progress='Not Started')
+            survey_schedule=current_survey_schedule, enrolled=True,
+            progress='Not Started')
     for household_structure in household_structures:
         try:
             appt_count = MemberAppointment.objects.filter(
@@ -44,9 +58,8 @@ def update_household_work_list(label=None, household_structure=None):
         options = {
             'subject_visit__household_member__household_structure__household':
             household_structure.household,
-            'subject_visit__household_member__household_structure'
-            '__survey__datetime_start__lt':
-            survey_datetime_start
+            'subject_visit__household_member__survey_schedule__in':
+            get_previous_survey_schedules(household_structure.survey_schedule_object)
         }
         hic_enrollment = HicEnrollment.objects.filter(**options).count()
         if hic_enrollment > 0:
@@ -91,7 +104,7 @@ def update_household_work_list(label=None, household_structure=None):
         except HouseholdWorkList.DoesNotExist:
             HouseholdWorkList.objects.create(
                 household_structure=household_structure,
-                survey=household_structure.survey,
+                survey_schedule=household_structure.survey_schedule,
                 label=label,  # TODO:
                 visit_date=appt_date,
                 status=status,
@@ -105,3 +118,165 @@ def update_household_work_list(label=None, household_structure=None):
                 bhs=bhs_count)
             created += 1
     return created, updated
+
+
+class HouseholdWorkListUpdater:
+    """Set-based version of `update_household_work_list` for a
+    queryset of household structures.
+
+    Computes the per-structure aggregates with one grouped query per
+    related model for each chunk of structures, then bulk creates
+    missing HouseholdWorkList rows and updates the changed ones in
+    one statement.
+
+        updater = HouseholdWorkListUpdater(
+            label='T1 prep', household_structures=qs,
+            progress_callback=lambda done, total: print(done, total))
+        created, updated = updater.update()
+    """
+
+    chunk_size = 500
+    hic_enrollment_model = 'bcpp_subject.hicenrollment'
+    subject_consent_model = 'bcpp_subject.subjectconsent'
+
+    def __init__(self, label=None, household_structures=None,
+                 progress_callback=None):
+        self.label = label
+        self.household_structures = household_structures
+        self.progress_callback = progress_callback
+
+    def update(self):
+        """Returns a tuple of (created, updated).
+        """
+        created = 0
+        updated = 0
+        household_structures = list(self.household_structures)
+        total = len(household_structures)
+        done = 0
+        for chunk in chunks(household_structures, self.chunk_size):
+            values = self.get_values(chunk)
+            chunk_created, chunk_updated = self.write(chunk, values)
+            created += chunk_created
+            updated += chunk_updated
+            done += len(chunk)
+            if self.progress_callback:
+                self.progress_callback(done, total)
+        return created, updated
+
+    def get_hic_counts(self, household_pks, survey_schedules=None):
+        """Returns a dictionary of {household_id: count} of HIC
+        enrollments, optionally only for members of the given
+        survey schedules.
+        """
+        HicEnrollment = django_apps.get_model(self.hic_enrollment_model)
+        household_attr = 'subject_visit__household_member__household_structure__household_id'
+        options = {f'{household_attr}__in': household_pks}
+        if survey_schedules is not None:
+            options.update(
+                subject_visit__household_member__survey_schedule__in=survey_schedules)
+        return dict(HicEnrollment.objects.filter(**options).order_by().values_list(
+            household_attr).annotate(Count('id')))
+
+    def get_bhs_counts(self, household_pks):
+        """Returns a dictionary of {household_id: count} of subject
+        consents.
+        """
+        SubjectConsent = django_apps.get_model(self.subject_consent_model)
+        consent_attr = 'household_member__household_structure__household_id'
+        return dict(SubjectConsent.objects.filter(
+            **{f'{consent_attr}__in': household_pks}).order_by().values_list(
+                consent_attr).annotate(Count('id')))
+
+    def get_values(self, household_structures):
+        """Returns a dictionary of {household_structure.pk: values}
+        where values are the HouseholdWorkList field values.
+        """
+        pks = [obj.pk for obj in household_structures]
+        household_pks = [obj.household_id for obj in household_structures]
+        appointments = MemberAppointment.objects.filter(
+            household_member__household_structure_id__in=pks, label=self.label)
+        appt_counts = dict(appointments.order_by().values_list(
+            'household_member__household_structure_id').annotate(Count('id')))
+        appt_dates = dict(appointments.exclude(
+            appt_status__in=[DONE, IN_PROGRESS_APPT]).order_by().values_list(
+                'household_member__household_structure_id').annotate(Min('appt_date')))
+        log_entries = {}
+        for pk, report_datetime, household_status in HouseholdLogEntry.objects.filter(
+                household_log__household_structure_id__in=pks).order_by(
+                    'report_datetime').values_list(
+                        'household_log__household_structure_id', 'report_datetime',
+                        'household_status'):
+            log_entries.setdefault(pk, []).append((report_datetime, household_status))
+        member_counts = dict(HouseholdMember.objects.filter(
+            household_structure_id__in=pks).order_by().values_list(
+                'household_structure_id').annotate(Count('id')))
+        hic_counts = self.get_hic_counts(household_pks)
+        previous_hic_counts = {}
+        for survey_schedule in set(obj.survey_schedule for obj in household_structures):
+            survey_schedule_object = site_surveys.get_survey_schedule_from_field_value(
+                survey_schedule)
+            previous_hic_counts[survey_schedule] = self.get_hic_counts(
+                household_pks,
+                survey_schedules=get_previous_survey_schedules(survey_schedule_object))
+        bhs_counts = self.get_bhs_counts(household_pks)
+        values = {}
+        for obj in household_structures:
+            appt_date = appt_dates.get(obj.pk)
+            log_date, log_status = (log_entries.get(obj.pk) or [(None, None)])[-1]
+            previous_hic_count = previous_hic_counts.get(
+                obj.survey_schedule).get(obj.household_id, 0)
+            values[obj.pk] = dict(
+                visit_date=appt_date or date.today(),
+                status='scheduled' if appt_date else 'unscheduled',
+                appt_count=appt_counts.get(obj.pk, 0),
+                enrolled_type='hic' if previous_hic_count > 0 else 'bhs',
+                log_date=log_date,
+                log_status=log_status,
+                log_attempts=len(log_entries.get(obj.pk, [])),
+                members=member_counts.get(obj.pk, 0),
+                hic=hic_counts.get(obj.household_id, 0),
+                bhs=bhs_counts.get(obj.household_id, 0))
+        return values
+
+    def write(self, household_structures, values):
+        """Bulk creates missing and updates changed work lists and
+        returns a tuple of (created, updated).
+        """
+        fields = list(list(values.values())[0]) if values else []
+        existing = {
+            obj.get('household_structure_id'): obj
+            for obj in HouseholdWorkList.objects.filter(
+                household_structure_id__in=list(values), label=self.label).values(
+                    'id', 'household_structure_id', *fields)}
+        household_work_lists = []
+        changed = {}
+        updated = 0
+        for obj in household_structures:
+            current = existing.get(obj.pk)
+            if not current:
+                household_work_lists.append(HouseholdWorkList(
+                    household_structure=obj,
+                    survey_schedule=obj.survey_schedule,
+                    label=self.label,
+                    **values.get(obj.pk)))
+            else:
+                if any(current.get(k) != v for k, v in values.get(obj.pk).items()):
+                    changed[current.get('id')] = values.get(obj.pk)
+                updated += 1
+        HouseholdWorkList.objects.bulk_create(household_work_lists)
+        self.update_changed(changed, fields)
+        return len(household_work_lists), updated
+
+    def update_changed(self, changed, fields):
+        """Updates the changed work lists, {pk: values}, in one
+        statement with a CASE per field since Django 1.11 has no
+        bulk_update.
+        """
+        if changed:
+            HouseholdWorkList.objects.filter(pk__in=list(changed)).update(
+                **{field: Case(
+                    *[When(pk=pk, then=Value(values.get(field)))
+                      for pk, values in changed.items()],
+                    output_field=HouseholdWorkList._meta.get_field(field))
+                   for field in fields},
+                **modified_options())
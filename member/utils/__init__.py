@@ -0,0 +1,19 @@
+import socket
+
+from edc_base.utils import get_utcnow
+
+
+def modified_options():
+    """Returns the audit field values that save() would set, for a
+    queryset update, so that the row is picked up as modified, e.g.
+    by the sync exporter.
+    """
+    return dict(modified=get_utcnow(), hostname_modified=socket.gethostname()[:50])
+
+
+def chunks(items, size):
+    """Yields successive lists of at most `size` items from `items`.
+    """
+    items = list(items)
+    for index in range(0, len(items), size):
+        yield items[index:index + size]